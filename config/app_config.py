@@ -125,6 +125,153 @@ class AppConfig:
         ],
         "auth_types": ["None", "Basic Auth", "Bearer Token"],
         "http_methods": ["GET", "POST", "PUT", "DELETE"],
+        # Pooled connections per host and seconds before an unused host session is closed
+        "http_pool": {
+            "pool_maxsize": 16,
+            "idle_timeout": 90
+        },
+        # Defaults for test cases that don't set their own timeouts and retries
+        "execution_policy": {
+            "connect_timeout": 5,
+            "read_timeout": 30,
+            "retries": 2,
+            "backoff_base": 0.5,
+            "backoff_max": 8,
+            "breaker_failures": 5,
+            "breaker_reset": 30,
+            "suite_deadline": 600
+        },
+        # Workflows tab: steps in flight at once, and the definition a new workflow starts from
+        "workflows": {
+            "concurrency": 8,
+            "example": {
+                "name": "Fund Transfer",
+                "variables": {"accountNumber": "1234567890", "beneficiaryAccount": "9876543210"},
+                "steps": [
+                    {
+                        "name": "details",
+                        "method": "POST",
+                        "url": "http://127.0.0.1:7200/account-details",
+                        "body": {"transactionType": "AccountDetails", "accountNumber": "{{accountNumber}}"},
+                        "extract": {"accountStatus": "$.status"}
+                    },
+                    {
+                        "name": "balance",
+                        "method": "POST",
+                        "url": "http://127.0.0.1:7200/balance-inquiry",
+                        "body": {"transactionType": "InquirySaldo", "accountNumber": "{{accountNumber}}"},
+                        "extract": {"balance": "$.balance"}
+                    },
+                    {
+                        "name": "transfer",
+                        "depends_on": ["details", "balance"],
+                        "method": "POST",
+                        "url": "http://127.0.0.1:7200/fund-transfer",
+                        "body": {
+                            "transactionType": "Transfer",
+                            "accountNumber": "{{accountNumber}}",
+                            "beneficiaryAccount": "{{beneficiaryAccount}}",
+                            "amount": "100000"
+                        },
+                        "extract": {"referenceNumber": "$.referenceNumber"}
+                    },
+                    {
+                        "name": "status",
+                        "depends_on": ["transfer"],
+                        "method": "POST",
+                        "url": "http://127.0.0.1:7200/check-status",
+                        "body": {"transactionType": "CheckStatus", "referenceNumber": "{{referenceNumber}}"},
+                        "extract": {"transactionStatus": "$.transactionStatus"}
+                    }
+                ]
+            }
+        },
+        # Saved test cases per page in the Manage tab
+        "manage_list": {
+            "page_size": 50
+        },
+        # Environments tab: the same test cases sent to every base URL at once and lined up.
+        # An environment is a latency regression when latency_ratio times as slow as the
+        # reference and at least latency_floor_ms slower
+        "environment_compare": {
+            "environments": {
+                "Development": "http://127.0.0.1:7200",
+                "Staging": "http://staging.aljazari:7200",
+                "Production": "http://aljazari:7200"
+            },
+            "reference": "Production",
+            "latency_ratio": 1.5,
+            "latency_floor_ms": 50,
+            "max_differences": 200
+        },
+        # Responses are compared with the baseline of their test case, skipping the ignored paths
+        "baseline": {
+            "ignore": ["$..timestamp", "$..referenceNumber"],
+            "max_differences": 500
+        },
+        # Statistics charts are redrawn at most once per interval
+        "statistics": {
+            "redraw_interval_ms": 250
+        },
+        # Run All: requests in flight overall and against a single host
+        "suite_runner": {
+            "concurrency": 32,
+            "per_host_limit": 16
+        },
+        # Defaults shown in the Load Test tab
+        "load_test": {
+            "virtual_users": 10,
+            "target_rps": 0,
+            "ramp_up_s": 5,
+            "duration_s": 30,
+            "processes": 1,
+            # Comma separated host:port of load agents (python -m services.load_agent)
+            "agents": ""
+        },
+        # Local stub of the banking routes (python -m services.mock_server)
+        "mock_server": {
+            "host": "127.0.0.1",
+            "port": 7200,
+            "seed": None,
+            # fixed, uniform, normal, lognormal or exponential
+            "latency": {"distribution": "lognormal", "mean_ms": 40, "stddev_ms": 15},
+            "error_rate": 0.0,
+            "error_status": 500,
+            "payload_bytes": 0,
+            # Extra or replaced routes: {"method", "path", "status", "body", "latency", "error_rate", ...}
+            "routes": []
+        },
+        # Large responses: chunks shown per scroll step, log preview, and raw bodies saved to disk
+        "response_view": {
+            "chunk_chars": 65536,
+            "log_preview_chars": 4000,
+            "spool_dir": "responses",
+            "spool_threshold": 1048576,
+            "spool_keep": 20
+        },
+        # Log tab keeps the newest capacity entries; all of them go to rotated JSON Lines files
+        "request_log": {
+            "directory": "logs",
+            "capacity": 1000,
+            "render_entries": 200,
+            "max_bytes": 10485760,
+            "backups": 5
+        },
+        # Compressed response bodies: bodies over threshold bytes go to content-addressed files
+        "blob_store": {
+            "directory": "blobs/api_test",
+            "threshold": 32768,
+            "level": 3,
+            # Characters of the body kept in the row for list views
+            "preview_chars": 2000
+        },
+        # Serves the responses recorded in saved test cases (python -m services.replay_server)
+        "replay_server": {
+            "host": "127.0.0.1",
+            "port": 7300,
+            # Answer 404 rather than the route's latest recording when no request body matches
+            "match_body": False
+        },
         "table_columns": [
             "Actions", "No.", "TestCaseID", "Feature", "Description",
             "TestSteps", "Expected", "Actual", "Status", "Environment",
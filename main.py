@@ -1,3 +1,4 @@
+import multiprocessing
 import customtkinter as ctk
 from controllers.app_controller import AppController
 from config.app_config import AppConfig
@@ -21,4 +22,6 @@ def main():
     app.mainloop()
 
 if __name__ == "__main__":
+    # Needed for load test worker processes in the frozen executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,11 @@
+from .base_record import Record
+from .manual_test_case import ManualTestCase
+from .api_test_case import ApiTestCase
+from .job_application import JobApplication
+
+__all__ = [
+    'Record',
+    'ManualTestCase',
+    'ApiTestCase',
+    'JobApplication'
+]
@@ -0,0 +1,46 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .base_record import Record
+
+
+def _load_config(value: Optional[str]) -> Dict[str, Any]:
+    return json.loads(value) if value else {}
+
+
+@dataclass(slots=True)
+class ApiTestCase(Record):
+    """Row of the API test_cases table"""
+
+    TABLE = "test_cases"
+    KEY = "id"
+    LAZY_FIELDS = ("response_headers", "response_body", "timings", "response_blob", "baseline_blob")
+    CONVERTERS = {"config": _load_config, "timings": _load_config}
+
+    id: Optional[int] = None
+    name: Optional[str] = None
+    method: Optional[str] = None
+    url: Optional[str] = None
+    headers: Optional[str] = field(default=None, repr=False, compare=False)
+    body: Optional[str] = field(default=None, repr=False, compare=False)
+    auth_type: Optional[str] = None
+    auth_value: Optional[str] = field(default=None, repr=False)
+    config: Dict[str, Any] = field(default_factory=dict)
+    status: Optional[str] = None
+    # HTTP status code of the saved response; status holds the outcome
+    response_status: Optional[int] = None
+    response_time: Optional[str] = None
+    response_headers: Optional[str] = field(default=None, repr=False, compare=False)
+    # Preview of the body; the full text is in the BlobStore under response_hash
+    response_body: Optional[str] = field(default=None, repr=False, compare=False)
+    api_name: Optional[str] = None
+    # Phase breakdown of the saved response, see RequestTimings.to_dict()
+    timings: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    response_hash: Optional[str] = None
+    response_size: Optional[int] = None
+    # Compressed body when small enough to stay in the row
+    response_blob: Optional[bytes] = field(default=None, repr=False, compare=False)
+    # Golden response new ones are compared with, stored like the response body
+    baseline_hash: Optional[str] = None
+    baseline_blob: Optional[bytes] = field(default=None, repr=False, compare=False)
@@ -0,0 +1,121 @@
+import sqlite3
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Tuple
+
+# Column names per model class, resolved once from the dataclass fields
+_COLUMNS: Dict[type, Tuple[str, ...]] = {}
+
+
+@dataclass(slots=True)
+class Record:
+    """Base for compact __slots__ models filled from sqlite rows by column name.
+
+    The row factory only sets the columns a query actually selected. Any
+    other column stays an empty slot and is fetched from the database the
+    first time it is read, so list queries can skip large text columns.
+    """
+
+    TABLE: ClassVar[str] = ""
+    KEY: ClassVar[str] = "id"
+    # Large text columns left out of list queries and loaded on first access
+    LAZY_FIELDS: ClassVar[Tuple[str, ...]] = ()
+    # Per-column conversion applied to values read from the database
+    CONVERTERS: ClassVar[Dict[str, Callable[[Any], Any]]] = {}
+
+    _db_path: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def columns(cls) -> Tuple[str, ...]:
+        """Get the database column names backing this model"""
+        if cls not in _COLUMNS:
+            _COLUMNS[cls] = tuple(f.name for f in fields(cls) if not f.name.startswith('_'))
+        return _COLUMNS[cls]
+
+    @classmethod
+    def list_columns(cls) -> str:
+        """Get a SELECT column list without the lazily loaded text columns"""
+        return ", ".join(c for c in cls.columns() if c not in cls.LAZY_FIELDS)
+
+    @classmethod
+    def row_factory(cls, db_path: Optional[str] = None) -> Callable[[sqlite3.Cursor, Sequence[Any]], "Record"]:
+        """Create a sqlite row factory producing instances of this model"""
+        known = set(cls.columns())
+        converters = cls.CONVERTERS
+        layouts: Dict[Tuple, List[Tuple[int, str, Optional[Callable]]]] = {}
+
+        def factory(cursor: sqlite3.Cursor, row: Sequence[Any]) -> "Record":
+            description = cursor.description
+            layout = layouts.get(description)
+            if layout is None:
+                # Map result positions to model fields once per query shape
+                layout = [
+                    (i, col[0], converters.get(col[0]))
+                    for i, col in enumerate(description) if col[0] in known
+                ]
+                layouts[description] = layout
+
+            record = cls.__new__(cls)
+            for i, name, convert in layout:
+                value = row[i]
+                setattr(record, name, convert(value) if convert else value)
+            record._db_path = db_path
+            return record
+
+        return factory
+
+    @classmethod
+    def query(cls, conn: sqlite3.Connection, sql: str, params: Sequence[Any] = (),
+              db_path: Optional[str] = None) -> List["Record"]:
+        """Run a query and return its rows as model instances"""
+        cursor = conn.cursor()
+        cursor.row_factory = cls.row_factory(db_path)
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+    @classmethod
+    def query_one(cls, conn: sqlite3.Connection, sql: str, params: Sequence[Any] = (),
+                  db_path: Optional[str] = None) -> Optional["Record"]:
+        """Run a query and return its first row as a model instance"""
+        cursor = conn.cursor()
+        cursor.row_factory = cls.row_factory(db_path)
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a column value is present without loading it"""
+        try:
+            object.__getattribute__(self, name)
+            return True
+        except AttributeError:
+            return False
+
+    def load_missing(self) -> None:
+        """Fetch every column that the original query did not select"""
+        missing = [c for c in self.columns() if not self.is_loaded(c)]
+        if not missing:
+            return
+        db_path = getattr(self, '_db_path', None)
+        if not db_path or not self.is_loaded(self.KEY):
+            raise AttributeError(f"{type(self).__name__} has no loader for {', '.join(missing)}")
+
+        conn = sqlite3.connect(db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {', '.join(missing)} FROM {self.TABLE} WHERE {self.KEY} = ?",
+                (getattr(self, self.KEY),)
+            )
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        for name, value in zip(missing, row or [None] * len(missing)):
+            convert = self.CONVERTERS.get(name)
+            setattr(self, name, convert(value) if convert else value)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for empty slots, i.e. columns the query did not select
+        if name in self.columns():
+            self.load_missing()
+            return object.__getattribute__(self, name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
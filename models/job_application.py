@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .base_record import Record
+
+
+@dataclass(slots=True)
+class JobApplication(Record):
+    """Row of the job_applications table"""
+
+    TABLE = "job_applications"
+    KEY = "id"
+    LAZY_FIELDS = ("notes",)
+
+    id: Optional[int] = None
+    company: Optional[str] = None
+    position: Optional[str] = None
+    location: Optional[str] = None
+    salary: Optional[str] = None
+    apply_date: Optional[str] = None
+    job_link: Optional[str] = None
+    current_stage: Optional[str] = None
+    stage_status: Optional[str] = None
+    notes: Optional[str] = field(default=None, repr=False, compare=False)
+    last_update: Optional[str] = None
@@ -0,0 +1,35 @@
+import json
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .base_record import Record
+
+
+@dataclass(slots=True)
+class ManualTestCase(Record):
+    """Row of the manual test_cases table"""
+
+    TABLE = "test_cases"
+    KEY = "id"
+    LAZY_FIELDS = ("description", "test_steps", "expected_result", "actual_result", "notes")
+
+    id: Optional[int] = None
+    hostname: Optional[str] = None
+    environment: Optional[str] = None
+    browser: Optional[str] = None
+    feature: Optional[str] = None
+    test_case_id: Optional[str] = None
+    description: Optional[str] = field(default=None, repr=False, compare=False)
+    test_steps: Optional[str] = field(default=None, repr=False, compare=False)
+    expected_result: Optional[str] = field(default=None, repr=False, compare=False)
+    actual_result: Optional[str] = field(default=None, repr=False, compare=False)
+    status: Optional[str] = None
+    notes: Optional[str] = field(default=None, repr=False, compare=False)
+    evidence_paths: Optional[str] = None
+    created_date: Optional[str] = None
+    row_version: Optional[int] = None
+
+    @property
+    def evidence_files(self) -> List[str]:
+        """Get the evidence file paths stored as JSON"""
+        return json.loads(self.evidence_paths) if self.evidence_paths else []
@@ -0,0 +1,259 @@
+import json
+import operator
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from services.json_path import JsonPath
+
+try:
+    import fastjsonschema
+except ImportError:  # jsonschema is tried instead
+    fastjsonschema = None
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+# check(result) -> failure message, or None when the assertion holds
+Check = Callable[[Any], Optional[str]]
+
+_MISSING = object()
+
+
+def _contains(actual: Any, expected: Any) -> bool:
+    return actual is not None and expected in actual
+
+
+def _within(actual: Any, expected: Any) -> bool:
+    return actual in expected
+
+
+# op -> (compare(actual, expected), wording for failure messages)
+_OPERATORS: Dict[str, Tuple[Callable[[Any, Any], bool], str]] = {
+    "==": (operator.eq, "equal"),
+    "!=": (operator.ne, "differ from"),
+    "<": (operator.lt, "be below"),
+    "<=": (operator.le, "be at most"),
+    ">": (operator.gt, "be above"),
+    ">=": (operator.ge, "be at least"),
+    "in": (_within, "be one of"),
+    "contains": (_contains, "contain"),
+}
+
+
+def _compile_comparison(definition: Dict[str, Any]) -> Tuple[Callable[[Any], bool], str]:
+    op = definition.get("op", "==")
+    expected = definition.get("value")
+    if op == "exists":
+        # "value": false asserts that the header or path is absent
+        present = expected is None or bool(expected)
+        return (lambda actual: (actual is not _MISSING) == present), "exist" if present else "not exist"
+    if op == "matches":
+        try:
+            pattern = re.compile(str(expected))
+        except re.error as e:
+            raise ValueError(f"invalid pattern {expected!r}: {e}") from None
+        return (lambda actual: actual is not _MISSING and pattern.search(str(actual)) is not None), \
+            f"match {expected!r}"
+    if op not in _OPERATORS:
+        raise ValueError(f"unknown op {op!r}, use one of {', '.join(list(_OPERATORS) + ['matches', 'exists'])}")
+    compare, wording = _OPERATORS[op]
+
+    def test(actual: Any) -> bool:
+        if actual is _MISSING:
+            return False
+        try:
+            return bool(compare(actual, expected))
+        except TypeError:
+            # e.g. "<" between a string and a number
+            return False
+    return test, f"{wording} {expected!r}"
+
+
+def _status_check(definition: Dict[str, Any]) -> Tuple[str, Check]:
+    test, wording = _compile_comparison(definition)
+    description = f"status should {wording}"
+
+    def check(result: Any) -> Optional[str]:
+        return None if test(result.status_code) else f"{description}, got {result.status_code}"
+    return description, check
+
+
+def _header_check(definition: Dict[str, Any]) -> Tuple[str, Check]:
+    name = str(definition["name"])
+    lowered = name.lower()
+    test, wording = _compile_comparison(definition)
+    description = f"header {name} should {wording}"
+
+    def check(result: Any) -> Optional[str]:
+        actual = result.headers.get(name, _MISSING)
+        if actual is _MISSING:
+            # The recorded headers are a plain dict, so look up the name ignoring case
+            actual = next((v for k, v in result.headers.items() if k.lower() == lowered), _MISSING)
+        if test(actual):
+            return None
+        return f"{description}, got {'nothing' if actual is _MISSING else repr(actual)}"
+    return description, check
+
+
+def _json_path_check(definition: Dict[str, Any]) -> Tuple[str, Check]:
+    path = JsonPath(str(definition["path"]))
+    test, wording = _compile_comparison(definition)
+    description = f"{path.path} should {wording}"
+
+    def check(result: Any) -> Optional[str]:
+        try:
+            actual = path.get(result.json_body)
+        except KeyError:
+            actual = _MISSING
+        if test(actual):
+            return None
+        return f"{description}, got {'nothing' if actual is _MISSING else repr(actual)}"
+    return description, check
+
+
+def _schema_check(definition: Dict[str, Any]) -> Tuple[str, Check]:
+    schema = definition["schema"]
+    description = str(definition.get("description") or "body should match the JSON Schema")
+    if fastjsonschema is not None:
+        # Generates and compiles Python code for the schema once
+        try:
+            validate = fastjsonschema.compile(schema)
+        except fastjsonschema.JsonSchemaDefinitionException as e:
+            raise ValueError(f"invalid JSON Schema: {e}") from None
+
+        def check(result: Any) -> Optional[str]:
+            try:
+                validate(result.json_body)
+            except fastjsonschema.JsonSchemaException as e:
+                return f"{description}: {e.message}"
+            return None
+        return description, check
+
+    if jsonschema is not None:
+        validator_class = jsonschema.validators.validator_for(schema)
+        try:
+            validator_class.check_schema(schema)
+        except jsonschema.exceptions.SchemaError as e:
+            raise ValueError(f"invalid JSON Schema: {e.message}") from None
+        validator = validator_class(schema)
+
+        def check(result: Any) -> Optional[str]:
+            error = next(iter(validator.iter_errors(result.json_body)), None)
+            return None if error is None else f"{description}: {error.message}"
+        return description, check
+
+    raise ValueError("it needs the fastjsonschema or jsonschema package")
+
+
+def _latency_check(definition: Dict[str, Any]) -> Tuple[str, Check]:
+    max_ms = float(definition["max_ms"])
+    description = f"response time should be at most {max_ms:g}ms"
+
+    def check(result: Any) -> Optional[str]:
+        return None if result.elapsed_ms <= max_ms else f"{description}, took {result.elapsed_ms:.1f}ms"
+    return description, check
+
+
+_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Tuple[str, Check]]] = {
+    "status": _status_check,
+    "header": _header_check,
+    "json_path": _json_path_check,
+    "schema": _schema_check,
+    "latency": _latency_check,
+}
+
+
+@dataclass(slots=True)
+class AssertionSet:
+    """Compiled assertions of one test case; evaluate() runs every check against a result"""
+    checks: List[Tuple[str, Check]] = field(default_factory=list)
+    # A status assertion replaces the 2xx rule, so negative tests can expect e.g. a 404
+    checks_status: bool = False
+
+    @property
+    def descriptions(self) -> List[str]:
+        return [description for description, _ in self.checks]
+
+    def evaluate(self, result: Any) -> List[Tuple[str, str]]:
+        """Get (description, failure message) of every assertion that does not hold"""
+        failures = []
+        for description, check in self.checks:
+            message = check(result)
+            if message is not None:
+                failures.append((description, message))
+        return failures
+
+
+def compile_assertions(definitions: Sequence[Dict[str, Any]]) -> AssertionSet:
+    """Compile assertion definitions such as
+
+        [{"type": "status", "op": "in", "value": [200, 201]},
+         {"type": "header", "name": "Content-Type", "op": "contains", "value": "json"},
+         {"type": "json_path", "path": "$.responseCode", "value": "00"},
+         {"type": "schema", "schema": {"type": "object", "required": ["balance"]}},
+         {"type": "latency", "max_ms": 500}]
+
+    op is one of ==, !=, <, <=, >, >=, in, contains, matches (a regular
+    expression) and exists, and defaults to ==. Raises ValueError for an
+    invalid definition.
+    """
+    checks = []
+    checks_status = False
+    for definition in definitions:
+        try:
+            kind = definition["type"]
+            builder = _BUILDERS[kind]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"Assertion {json.dumps(definition, default=str)} needs a type of {', '.join(_BUILDERS)}"
+            ) from None
+        try:
+            checks.append(builder(definition))
+            checks_status = checks_status or kind == "status"
+        except KeyError as e:
+            raise ValueError(f"{kind} assertion is missing {e.args[0]!r}") from None
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid {kind} assertion: {e}") from None
+    return AssertionSet(checks, checks_status)
+
+
+class _CompiledCache:
+    """Compiled assertion sets, looked up by the identity of the definitions list.
+
+    Every request built from a test case shares its definitions list, so a
+    load test compiles each case once and then only pays for a dict lookup.
+    The list itself is kept in the entry, so a recycled id() cannot match.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Sequence[Dict[str, Any]], AssertionSet]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, definitions: Sequence[Dict[str, Any]]) -> AssertionSet:
+        key = id(definitions)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is definitions:
+                self._entries.move_to_end(key)
+                return entry[1]
+        compiled = compile_assertions(definitions)
+        with self._lock:
+            self._entries[key] = (definitions, compiled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+
+_cache = _CompiledCache()
+
+
+def compiled_assertions(definitions: Sequence[Dict[str, Any]]) -> AssertionSet:
+    """Get the compiled form of definitions, compiling them on first use"""
+    return _cache.get(definitions)
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import tempfile
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # zlib from the standard library is used instead
+    zstandard = None
+
+# First byte of every stored payload names its codec
+_ZSTD = b"Z"
+_ZLIB = b"z"
+
+
+@dataclass(slots=True)
+class StoredBody:
+    """Reference to a compressed text, as kept in a database row"""
+    digest: str
+    size: int
+    # Compressed bytes kept in the row itself; None when the text lives in the blob directory
+    inline: Optional[bytes] = None
+
+
+class BlobStore:
+    """Compresses texts and keeps the large ones as content-addressed files.
+
+    Texts are compressed with zstd when the zstandard package is installed
+    and zlib otherwise. Those of more than threshold bytes are written once
+    to directory/<first two hex digits>/<sha256>, so repeated responses share
+    a file; smaller ones are returned for storing inline.
+    """
+
+    def __init__(self, directory: str, threshold: int = 32 * 1024, level: int = 3) -> None:
+        self.directory = directory
+        self.threshold = threshold
+        self.level = level
+
+    def put(self, text: Optional[str]) -> StoredBody:
+        data = (text or "").encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if len(data) <= self.threshold:
+            return StoredBody(digest, len(data), self._compress(data))
+
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write under a temporary name so readers never see half a file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(self._compress(data))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        return StoredBody(digest, len(data))
+
+    def get(self, digest: str, inline: Optional[bytes] = None) -> str:
+        """Get the text stored under digest, from inline bytes or the blob directory"""
+        if inline is None:
+            with open(self._path(digest), "rb") as f:
+                inline = f.read()
+        return self._decompress(inline).decode("utf-8")
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    @staticmethod
+    def preview(text: Optional[str], limit: int) -> str:
+        """Get the start of text for list views, marked when cut off"""
+        text = text or ""
+        return text if len(text) <= limit else text[:limit] + "\n..."
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _compress(self, data: bytes) -> bytes:
+        if zstandard is not None:
+            return _ZSTD + zstandard.ZstdCompressor(level=self.level).compress(data)
+        return _ZLIB + zlib.compress(data, min(self.level * 2, 9))
+
+    @staticmethod
+    def _decompress(payload: bytes) -> bytes:
+        codec, data = payload[:1], payload[1:]
+        if codec == _ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Response stored with zstd; install the zstandard package to read it")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if codec == _ZLIB:
+            return zlib.decompress(data)
+        raise ValueError(f"Unknown blob codec {codec!r}")
@@ -0,0 +1,49 @@
+import threading
+from typing import Callable, Dict, List
+
+# Topics follow the AppConfig.DB_PATHS keys, one per database the views write to
+MANUAL_TEST = "manual_test"
+API_TEST = "api_test"
+JOB_APPLICATIONS = "job_applications"
+
+_lock = threading.Lock()
+_subscribers: Dict[str, List[Callable[[str, int], None]]] = {}
+_versions: Dict[str, int] = {}
+
+
+def subscribe(topic: str, callback: Callable[[str, int], None]) -> Callable[[], None]:
+    """Call callback(topic, version) after every change published on topic.
+
+    Returns a function that removes the subscription again.
+    """
+    with _lock:
+        _subscribers.setdefault(topic, []).append(callback)
+
+    def unsubscribe() -> None:
+        with _lock:
+            callbacks = _subscribers.get(topic, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    return unsubscribe
+
+
+def publish(topic: str) -> int:
+    """Announce that data behind topic changed and return its new version"""
+    with _lock:
+        version = _versions.get(topic, 0) + 1
+        _versions[topic] = version
+        callbacks = list(_subscribers.get(topic, []))
+
+    for callback in callbacks:
+        try:
+            callback(topic, version)
+        except Exception as e:
+            print(f"Error in data change subscriber for {topic}: {e}")
+    return version
+
+
+def get_version(topic: str) -> int:
+    """Get the number of changes published on topic so far"""
+    with _lock:
+        return _versions.get(topic, 0)
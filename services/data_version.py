@@ -0,0 +1,87 @@
+import sqlite3
+
+# Table holding one change counter per tracked table
+VERSION_TABLE = "data_versions"
+
+
+def install_version_tracking(conn: sqlite3.Connection, table: str) -> None:
+    """Create the change counter for table and the triggers that bump it on every write.
+
+    PRAGMA data_version only changes for commits made by *other* connections,
+    so the views (which open a fresh connection per operation) would never see
+    it move. A trigger-maintained counter is bumped by every INSERT, UPDATE and
+    DELETE regardless of which connection made it, and each written row is
+    stamped with the counter value in its row_version column. Deletes bump
+    the counter but leave no row behind, so they never show up in a delta.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute(
+        f'INSERT OR IGNORE INTO {VERSION_TABLE} (table_name, version) VALUES (?, 0)',
+        (table,)
+    )
+
+    # Add row_version column if it doesn't exist
+    cursor.execute(f"PRAGMA table_info({table})")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'row_version' not in columns:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN row_version INTEGER DEFAULT 0')
+
+    # Rows written before tracking was installed are stamped with a version of their own,
+    # so the first delta report (row_version > 0) still includes them
+    cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {table} WHERE IFNULL(row_version, 0) = 0)')
+    if cursor.fetchone()[0]:
+        cursor.execute(f'UPDATE {VERSION_TABLE} SET version = version + 1 WHERE table_name = ?', (table,))
+        cursor.execute(
+            f'UPDATE {table} SET row_version = '
+            f'(SELECT version FROM {VERSION_TABLE} WHERE table_name = ?) '
+            f'WHERE IFNULL(row_version, 0) = 0',
+            (table,)
+        )
+
+    bump = f"UPDATE {VERSION_TABLE} SET version = version + 1 WHERE table_name = '{table}';"
+    stamp = (
+        f"UPDATE {table} SET row_version = "
+        f"(SELECT version FROM {VERSION_TABLE} WHERE table_name = '{table}') "
+        f"WHERE rowid = NEW.rowid;"
+    )
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_version_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            {bump}
+            {stamp}
+        END
+    ''')
+    # The WHEN clause skips the trigger's own row_version stamp
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_version_update
+        AFTER UPDATE ON {table}
+        WHEN NEW.row_version IS OLD.row_version
+        BEGIN
+            {bump}
+            {stamp}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_version_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            {bump}
+        END
+    ''')
+    conn.commit()
+
+
+def get_data_version(conn: sqlite3.Connection, table: str) -> int:
+    """Get the current change counter of a tracked table"""
+    cursor = conn.cursor()
+    cursor.execute(f'SELECT version FROM {VERSION_TABLE} WHERE table_name = ?', (table,))
+    row = cursor.fetchone()
+    return row[0] if row else 0
@@ -0,0 +1,228 @@
+import csv
+import dataclasses
+import json
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote
+
+from services.histogram import LatencyHistogram
+from services.request_engine import RequestResult, RequestSpec
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([^{}\s]+)\s*\}\}")
+
+# Characters of a URL template that are left alone when a column value is put in
+_URL_SAFE = "-._~"
+
+
+def iter_dataset(path: str, chunk_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+    """Stream the rows of a CSV, JSON Lines or JSON array file as dicts.
+
+    Rows are read as they are consumed, so a dataset of any size costs the
+    memory of one chunk rather than the whole file.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        # utf-8-sig drops the byte order mark spreadsheet exports start with
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+    elif extension in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield _check_row(json.loads(line), f"{path}:{line_number}")
+    elif extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            for index, row in enumerate(_iter_json_array(f, chunk_size)):
+                yield _check_row(row, f"{path}[{index}]")
+    else:
+        raise ValueError(f"Unsupported dataset type '{extension}', use .csv, .json or .jsonl")
+
+
+def _check_row(row: Any, where: str) -> Dict[str, Any]:
+    if not isinstance(row, dict):
+        raise ValueError(f"Dataset row {where} is not an object")
+    return row
+
+
+def _iter_json_array(f, chunk_size: int) -> Iterator[Any]:
+    """Decode the elements of a top-level JSON array one at a time"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    # Whether the next element needs a ',' in front of it, and whether one was just read
+    after_element = False
+    after_comma = False
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("JSON dataset must be an array of objects")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == ",":
+                if not after_element:
+                    raise ValueError("JSON dataset has a ',' without an element before it")
+                after_element = False
+                after_comma = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                if after_comma:
+                    raise ValueError("JSON dataset has a ',' before the closing ']'")
+                return
+            if after_element:
+                raise ValueError("JSON dataset is missing a ',' between elements")
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                # The element runs past the end of the buffer
+                if eof:
+                    raise
+            else:
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(buffer) or eof:
+                    yield value
+                    position = end
+                    after_element = True
+                    after_comma = False
+                    continue
+        elif eof:
+            raise ValueError("JSON dataset ended before the closing ']'")
+
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+class TextTemplate:
+    """Text with {{column}} placeholders, split into parts once and filled per row"""
+
+    __slots__ = ("source", "parts", "fields", "escape")
+
+    def __init__(self, source: str, escape=str) -> None:
+        self.source = source
+        self.escape = escape
+        # Even positions are literal text, odd positions column names
+        self.parts: List[str] = _PLACEHOLDER.split(source)
+        self.fields: Set[str] = set(self.parts[1::2])
+
+    def render(self, row: Dict[str, Any]) -> str:
+        if not self.fields:
+            return self.source
+        parts = self.parts[:]
+        for i in range(1, len(parts), 2):
+            value = row.get(parts[i])
+            parts[i] = "" if value is None else self.escape(value if isinstance(value, str) else _text(value))
+        return "".join(parts)
+
+
+def _text(value: Any) -> str:
+    # Non-string JSON values keep their JSON spelling, e.g. true rather than True
+    return json.dumps(value) if isinstance(value, (bool, dict, list)) else str(value)
+
+
+def _json_escape(value: str) -> str:
+    return json.dumps(value)[1:-1]
+
+
+def _url_escape(value: str) -> str:
+    return quote(value, safe=_URL_SAFE)
+
+
+class RequestTemplate:
+    """A RequestSpec whose URL, header values and body contain {{column}} placeholders.
+
+    Placeholders are parsed once; render(row) then builds the request for one
+    dataset row. Values are percent-encoded in the URL and JSON-escaped in
+    the body, so "{{name}}" inside a JSON string stays valid and a bare
+    {{amount}} becomes a number.
+    """
+
+    def __init__(self, spec: RequestSpec) -> None:
+        self.spec = spec
+        self.url = TextTemplate(spec.url, _url_escape)
+        self.headers: List[Tuple[TextTemplate, TextTemplate]] = [
+            (TextTemplate(str(name)), TextTemplate(str(value))) for name, value in spec.headers.items()
+        ]
+        self.body: Optional[TextTemplate] = None
+        if spec.body is not None:
+            source = spec.body if isinstance(spec.body, str) else json.dumps(spec.body)
+            self.body = TextTemplate(source, _json_escape)
+
+    @property
+    def fields(self) -> Set[str]:
+        """Column names the template refers to"""
+        fields = set(self.url.fields)
+        for name, value in self.headers:
+            fields |= name.fields | value.fields
+        if self.body is not None:
+            fields |= self.body.fields
+        return fields
+
+    def render(self, row: Dict[str, Any]) -> RequestSpec:
+        body: Union[Dict[str, Any], str, None] = None
+        if self.body is not None:
+            text = self.body.render(row)
+            try:
+                body = json.loads(text)
+            except ValueError:
+                body = text
+        return dataclasses.replace(
+            self.spec,
+            url=self.url.render(row),
+            headers={name.render(row): value.render(row) for name, value in self.headers},
+            body=body
+        )
+
+
+def check_columns(template: RequestTemplate, row: Dict[str, Any], path: str) -> None:
+    """Fail early when the dataset lacks a column the template needs"""
+    missing = sorted(template.fields - set(row))
+    if missing:
+        raise ValueError(f"Dataset {path} has no column {', '.join(missing)}")
+
+
+@dataclass(slots=True)
+class DatasetSummary:
+    """Aggregated outcome of the iterations of one data-driven test case"""
+    name: str
+    iterations: int = 0
+    passed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    status_counts: Counter = field(default_factory=Counter)
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # (iteration, row, status or error) of the first failures, to show which data broke
+    failures: List[Tuple[int, Dict[str, Any], str]] = field(default_factory=list)
+    max_failures: int = 20
+
+    def add(self, iteration: int, row: Dict[str, Any], result: RequestResult) -> None:
+        self.iterations += 1
+        if result.cancelled:
+            self.cancelled += 1
+            return
+        if result.ok:
+            self.passed += 1
+        else:
+            self.failed += 1
+            if len(self.failures) < self.max_failures:
+                self.failures.append((iteration, row, result.failure))
+        self.status_counts[result.status_code if result.error is None else "error"] += 1
+        self.histogram.record_ms(result.elapsed_ms)
+
+    def describe(self) -> str:
+        statuses = ", ".join(f"{status}: {count}" for status, count in self.status_counts.most_common())
+        return (
+            f"{self.iterations} iterations, {self.passed} passed, {self.failed} failed, "
+            f"{self.cancelled} cancelled; p50 {self.histogram.percentile_ms(50):.1f}ms, "
+            f"p99 {self.histogram.percentile_ms(99):.1f}ms ({statuses or 'no responses'})"
+        )
@@ -0,0 +1,205 @@
+import dataclasses
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from services.json_diff import IgnoreRules, JsonDiff, diff_json
+from services.request_engine import RequestEngine, RequestResult
+from services.suite_runner import SuiteCase, SuiteRunner, SuiteSummary
+
+
+def rebase_url(url: str, base_url: str) -> str:
+    """Point url at another environment, keeping its path and query.
+
+    The scheme and host come from base_url; a path in base_url, such as
+    https://staging.example.com/api, is put in front of url's path.
+    """
+    parts = urlsplit(url)
+    base = urlsplit(base_url if "://" in base_url else f"http://{base_url}")
+    return urlunsplit((base.scheme, base.netloc, base.path.rstrip("/") + parts.path, parts.query, ""))
+
+
+@dataclass(slots=True)
+class ComparisonRow:
+    """The responses of one test case in every environment, lined up"""
+    record: Any
+    results: Dict[str, RequestResult] = field(default_factory=dict)
+    # Body differences of each environment from the reference environment
+    diffs: Dict[str, JsonDiff] = field(default_factory=dict)
+    # Environment -> why its response diverges from the reference: status, outcome or body
+    divergent: Dict[str, str] = field(default_factory=dict)
+    # Environments slower than the reference by more than the regression threshold
+    slower: List[str] = field(default_factory=list)
+    cancelled: bool = False
+
+
+@dataclass(slots=True)
+class ComparisonSummary:
+    environments: Tuple[str, ...] = ()
+    reference: str = ""
+    rows: int = 0
+    # Test cases with a diverging environment, and with a latency regression
+    divergent: int = 0
+    regressions: int = 0
+    cancelled: int = 0
+    elapsed_s: float = 0.0
+    # Why the test cases stopped coming, e.g. one could not be built
+    error: Optional[str] = None
+
+
+class EnvironmentComparison:
+    """Sends the same test cases to several environments at once and lines up the results.
+
+    Every test case becomes one suite case per environment, interleaved so
+    that all environments progress together through a single SuiteRunner:
+    requests to different environments run in parallel rather than as one
+    pass after another, while each host keeps its own pooled session and
+    per-host limit. Order groups stay sequential within each environment.
+
+    Once a test case has a result from every environment, the others are
+    compared with the reference environment: status, outcome (assertions
+    included), body as a structural JSON diff skipping ignore_for(record)
+    paths, and latency. An environment is a latency regression when it took
+    latency_ratio times as long as the reference and at least
+    latency_floor_ms more. on_row(row) is called from the worker thread
+    that completed the row and on_done(summary) once the run is over. Rows
+    not complete by then, because the run was cancelled, count as cancelled
+    and are never passed to on_row.
+    """
+
+    def __init__(self, engine: RequestEngine, environments: Dict[str, str], reference: Optional[str] = None,
+                 concurrency: int = 32, per_host_limit: int = 16, deadline_seconds: Optional[float] = None,
+                 latency_ratio: float = 1.5, latency_floor_ms: float = 50.0, max_differences: int = 200,
+                 ignore_for: Optional[Callable[[Any], Sequence[str]]] = None) -> None:
+        if len(environments) < 2:
+            raise ValueError("A comparison needs at least two environments")
+        self.environments = dict(environments)
+        self.reference = reference if reference in self.environments else next(iter(self.environments))
+        self.latency_ratio = latency_ratio
+        self.latency_floor_ms = latency_floor_ms
+        self.max_differences = max_differences
+        self.ignore_for = ignore_for
+        self.runner = SuiteRunner(engine, concurrency, per_host_limit, deadline_seconds)
+        # Parsed ignore paths, shared by the rows of a test case's ignore list
+        self._rules: Dict[Tuple[str, ...], IgnoreRules] = {}
+        # Rows taken from the cases so far
+        self._expanded = 0
+        self._lock = threading.Lock()
+
+    def start(self, cases: Iterable[SuiteCase], on_row: Callable[[ComparisonRow], None],
+              on_done: Callable[[ComparisonSummary], None]) -> threading.Thread:
+        """Compare cases, each as built for its original URL, on a background thread"""
+        thread = threading.Thread(
+            target=self.run, args=(cases, on_row, on_done), name="environment-comparison", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def cancel(self) -> None:
+        self.runner.cancel()
+
+    def run(self, cases: Iterable[SuiteCase], on_row: Callable[[ComparisonRow], None],
+            on_done: Callable[[ComparisonSummary], None]) -> ComparisonSummary:
+        start_time = time.perf_counter()
+        summary = ComparisonSummary(tuple(self.environments), self.reference)
+        self._expanded = 0
+        closed = False
+
+        def finished(case: SuiteCase, result: RequestResult) -> None:
+            row = case.record
+            with self._lock:
+                if closed:
+                    return
+                row.results[case.environment] = result
+                if len(row.results) < len(self.environments):
+                    return
+            # The last environment of the row to answer compares it, outside the lock
+            self._compare(row)
+            with self._lock:
+                summary.rows += 1
+                summary.cancelled += row.cancelled
+                summary.divergent += bool(row.divergent)
+                summary.regressions += bool(row.slower)
+            try:
+                on_row(row)
+            except Exception as e:
+                print(f"Error handling comparison row: {e}")
+
+        def done(suite_summary: SuiteSummary) -> None:
+            nonlocal closed
+            with self._lock:
+                closed = True
+                # Rows still missing an environment's answer when the run was cancelled
+                unfinished = self._expanded - summary.rows
+                summary.rows += unfinished
+                summary.cancelled += unfinished
+            summary.error = suite_summary.error
+            summary.elapsed_s = time.perf_counter() - start_time
+            try:
+                on_done(summary)
+            except Exception as e:
+                print(f"Error finishing comparison: {e}")
+
+        self.runner.run(self._expand(cases), finished, done)
+        return summary
+
+    def _expand(self, cases: Iterable[SuiteCase]) -> Iterator[SuiteCase]:
+        """Yield every case once per environment, its row shared as the record"""
+        for case in cases:
+            row = ComparisonRow(case.record)
+            self._expanded += 1
+            for environment, base_url in self.environments.items():
+                yield SuiteCase(
+                    row,
+                    dataclasses.replace(case.spec, url=rebase_url(case.spec.url, base_url)),
+                    f"{environment}\x00{case.order_group}" if case.order_group else None,
+                    environment=environment
+                )
+
+    def _ignore_rules(self, record: Any) -> IgnoreRules:
+        paths = tuple(self.ignore_for(record)) if self.ignore_for is not None else ()
+        rules = self._rules.get(paths)
+        if rules is None:
+            rules = self._rules.setdefault(paths, IgnoreRules(paths))
+        return rules
+
+    def _compare(self, row: ComparisonRow) -> None:
+        # Results arrive in whatever order the environments answered
+        row.results = {environment: row.results[environment] for environment in self.environments}
+        if any(result.cancelled for result in row.results.values()):
+            row.cancelled = True
+            return
+        reference = row.results[self.reference]
+        try:
+            rules = self._ignore_rules(row.record)
+        except ValueError as e:
+            # Compare the whole body rather than not at all
+            print(f"Ignoring invalid ignore paths: {e}")
+            rules = IgnoreRules()
+        for environment, result in row.results.items():
+            if environment == self.reference:
+                continue
+            if (result.error is None) != (reference.error is None):
+                row.divergent[environment] = result.error or f"answered, {self.reference} failed: {reference.error}"
+                continue
+            if result.error is not None:
+                # Both failed; nothing to compare
+                continue
+            if result.status_code != reference.status_code:
+                row.divergent[environment] = f"HTTP {result.status_code}, {self.reference} {reference.status_code}"
+            elif result.ok != reference.ok:
+                row.divergent[environment] = result.failure if not result.ok else f"{self.reference}: {reference.failure}"
+            diff = diff_json(_document(reference), _document(result), rules, self.max_differences)
+            row.diffs[environment] = diff
+            if not diff.identical and environment not in row.divergent:
+                row.divergent[environment] = f"body {diff.summary()}"
+            if (result.elapsed_ms >= reference.elapsed_ms * self.latency_ratio
+                    and result.elapsed_ms - reference.elapsed_ms >= self.latency_floor_ms):
+                row.slower.append(environment)
+
+
+def _document(result: RequestResult) -> Any:
+    # Bodies that aren't JSON are compared as text
+    return result.json_body if result.json_body is not None else result.body_text
@@ -0,0 +1,150 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, FrozenSet, Optional, Tuple
+
+
+@dataclass(slots=True)
+class ExecutionPolicy:
+    """How one test case is sent: timeouts and retry behaviour"""
+
+    IDEMPOTENT_METHODS: ClassVar[FrozenSet[str]] = frozenset(
+        {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"}
+    )
+
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    # Gateway errors usually mean a transient upstream problem worth retrying
+    retry_statuses: Tuple[int, ...] = (502, 503, 504)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], defaults: Optional[Dict[str, Any]] = None) -> "ExecutionPolicy":
+        """Build a policy from a test case config, falling back to defaults.
+
+        Older test cases only carry a single "timeout", which is used as the
+        read timeout and as an upper bound for the connect timeout.
+        """
+        values = dict(defaults or {})
+        values.update(config or {})
+        policy = cls()
+        policy.connect_timeout = float(values.get("connect_timeout", policy.connect_timeout))
+        policy.read_timeout = float(values.get("read_timeout", policy.read_timeout))
+        policy.retries = int(values.get("retries", policy.retries))
+        policy.backoff_base = float(values.get("backoff_base", policy.backoff_base))
+        policy.backoff_max = float(values.get("backoff_max", policy.backoff_max))
+        if "read_timeout" not in (config or {}) and "timeout" in (config or {}):
+            policy.read_timeout = float(config["timeout"])
+            policy.connect_timeout = min(policy.connect_timeout, policy.read_timeout)
+        return policy
+
+    def to_config(self) -> Dict[str, Any]:
+        """Get the values stored in a test case config"""
+        return {
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+            "retries": self.retries,
+        }
+
+    def can_retry(self, method: str) -> bool:
+        """Only idempotent requests are safe to send more than once"""
+        return self.retries > 0 and method.upper() in self.IDEMPOTENT_METHODS
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number attempt (1-based), exponential with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def timeouts(self, deadline: Optional["Deadline"] = None) -> Tuple[float, float]:
+        """Get (connect, read) timeouts, shortened to what is left of the deadline"""
+        if deadline is None or deadline.seconds is None:
+            return self.connect_timeout, self.read_timeout
+        remaining = max(deadline.remaining(), 0.001)
+        return min(self.connect_timeout, remaining), min(self.read_timeout, remaining)
+
+
+class Deadline:
+    """Point in time after which no further requests are started"""
+
+    def __init__(self, seconds: Optional[float] = None) -> None:
+        self.seconds = seconds
+        self._end = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self) -> float:
+        if self._end is None:
+            return float("inf")
+        return self._end - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """Fails fast for a host after failure_threshold consecutive errors.
+
+    After reset_timeout seconds one trial request is let through (half-open);
+    its success closes the circuit again, its failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def release(self) -> None:
+        """Give back an allowed request that ended without an outcome, e.g. cancelled"""
+        with self._lock:
+            self._trial_running = False
+
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per host"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[Any, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: Any) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Optional
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies in microseconds.
+
+    Values below 2**sub_bucket_bits are counted exactly. Above that every
+    power of two is split into 2**(sub_bucket_bits - 1) equal buckets, so any
+    recorded value is reported within 1 / 2**(sub_bucket_bits - 1) of its
+    true value (under 1.6% with the default of 7 bits) while the whole range
+    up to hours fits in a few thousand counters. Histograms with the same
+    precision can be merged by adding their counts.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7) -> None:
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_count = 1 << sub_bucket_bits
+        self._half_count = self._sub_count >> 1
+        self.counts: List[int] = []
+        self.total = 0
+        self.min_value: Optional[int] = None
+        self.max_value = 0
+        self.sum = 0
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self._sub_count + (shift - 1) * self._half_count + ((value >> shift) - self._half_count)
+
+    def _bucket_range(self, index: int):
+        """Get the (lowest, highest) value counted in bucket index"""
+        if index < self._sub_count:
+            return index, index
+        offset = index - self._sub_count
+        shift = offset // self._half_count + 1
+        mantissa = offset % self._half_count + self._half_count
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us: int, count: int = 1) -> None:
+        value_us = max(0, int(value_us))
+        index = self._index(value_us)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += count
+        self.total += count
+        self.sum += value_us * count
+        self.max_value = max(self.max_value, value_us)
+        self.min_value = value_us if self.min_value is None else min(self.min_value, value_us)
+
+    def record_ms(self, value_ms: float) -> None:
+        self.record(int(value_ms * 1000))
+
+    def percentile(self, percent: float) -> int:
+        """Get the value (µs) at or below which percent of the recordings fall"""
+        if not self.total:
+            return 0
+        target = max(1, int(round(self.total * percent / 100.0 + 0.4999999)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                # The bucket's upper edge, but never more than the largest value seen
+                return min(self._bucket_range(index)[1], self.max_value)
+        return self.max_value
+
+    def percentile_ms(self, percent: float) -> float:
+        return self.percentile(percent) / 1000.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum / self.total / 1000.0 if self.total else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the recordings of another histogram with the same precision"""
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        self.max_value = max(self.max_value, other.max_value)
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+
+    def copy(self) -> "LatencyHistogram":
+        clone = LatencyHistogram(self.sub_bucket_bits)
+        clone.merge(self)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a compact JSON-serializable form holding only the non-empty buckets"""
+        return {
+            "bits": self.sub_bucket_bits,
+            "counts": {str(i): c for i, c in enumerate(self.counts) if c},
+            "total": self.total,
+            "sum": self.sum,
+            "min": self.min_value,
+            "max": self.max_value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data.get("bits", 7))
+        counts = {int(i): c for i, c in data.get("counts", {}).items()}
+        if counts:
+            histogram.counts = [0] * (max(counts) + 1)
+            for index, count in counts.items():
+                histogram.counts[index] = count
+        histogram.total = data.get("total", sum(counts.values()))
+        histogram.sum = data.get("sum", 0)
+        histogram.min_value = data.get("min")
+        histogram.max_value = data.get("max", 0)
+        return histogram
@@ -0,0 +1,253 @@
+import base64
+import html
+import json
+import os
+import zlib
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+
+# Base64 only encodes whole 3-byte groups, so flush compressed data in multiples of 3
+_BASE64_CHUNK = 3 * 16384
+
+_PAGE_TEMPLATE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 20px; background: #F0F0F0; color: #2B2B2B; }}
+h1 {{ margin-bottom: 4px; }}
+.meta {{ color: #666; margin-bottom: 16px; }}
+.summary span {{ display: inline-block; padding: 4px 10px; margin-right: 6px; border-radius: 4px; color: white; }}
+.controls {{ margin: 12px 0; }}
+.controls input, .controls select {{ padding: 4px; margin-right: 8px; }}
+table {{ border-collapse: collapse; width: 100%; background: white; }}
+th, td {{ border: 1px solid #CCC; padding: 6px; vertical-align: top; text-align: left; font-size: 13px; }}
+th {{ background: #4F81BD; color: white; cursor: pointer; user-select: none; }}
+td.text {{ white-space: pre-wrap; max-width: 320px; }}
+td img {{ max-width: 160px; display: block; margin-bottom: 4px; border: 1px solid #CCC; }}
+.status-Pass {{ background: #E6FFE6; }}
+.status-Fail {{ background: #FFE6E6; }}
+.status-Not-Executed {{ background: #F0F0F0; }}
+.pager button {{ padding: 4px 10px; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div class="meta">{subtitle}</div>
+<div class="summary" id="summary"></div>
+<div class="controls">
+<input id="search" type="search" placeholder="Filter test cases...">
+<select id="status-filter"><option value="">All statuses</option></select>
+<select id="feature-filter"><option value="">All features</option></select>
+<select id="page-size"><option>25</option><option selected>50</option><option>100</option><option>500</option></select>
+</div>
+<table><thead><tr id="header"></tr></thead><tbody id="rows"><tr><td>Loading report data...</td></tr></tbody></table>
+<div class="pager"><button id="prev">Previous</button> <span id="page-info"></span> <button id="next">Next</button></div>
+<script id="report-data" type="application/octet-stream">"""
+
+_PAGE_TEMPLATE_TAIL = """</script>
+<script>
+const COLUMNS = %(columns)s;
+const STATUS_COLORS = %(status_colors)s;
+(async function () {
+  // Report rows are embedded as gzip-compressed JSON in base64
+  const raw = document.getElementById('report-data').textContent.trim();
+  const bin = atob(raw);
+  const bytes = new Uint8Array(bin.length);
+  for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+  const rows = await new Response(stream).json();
+
+  const state = { filtered: rows, sortKey: null, sortDir: 1, page: 0 };
+  const $ = (id) => document.getElementById(id);
+
+  // Summary badges and filter options
+  const counts = {};
+  const features = new Set();
+  rows.forEach((r) => { counts[r.status] = (counts[r.status] || 0) + 1; features.add(r.feature); });
+  $('summary').innerHTML = '';
+  const total = document.createElement('span');
+  total.style.background = '#4F81BD';
+  total.textContent = 'Total: ' + rows.length;
+  $('summary').appendChild(total);
+  Object.keys(counts).sort().forEach((status) => {
+    const badge = document.createElement('span');
+    badge.style.background = STATUS_COLORS[status] || '#0000FF';
+    badge.textContent = status + ': ' + counts[status];
+    $('summary').appendChild(badge);
+    $('status-filter').add(new Option(status, status));
+  });
+  Array.from(features).sort().forEach((f) => $('feature-filter').add(new Option(f, f)));
+
+  COLUMNS.forEach(([key, label]) => {
+    const th = document.createElement('th');
+    th.textContent = label;
+    if (key !== 'evidence') {
+      th.onclick = () => {
+        state.sortDir = state.sortKey === key ? -state.sortDir : 1;
+        state.sortKey = key;
+        applyFilters();
+      };
+    }
+    $('header').appendChild(th);
+  });
+
+  function applyFilters() {
+    const needle = $('search').value.toLowerCase();
+    const status = $('status-filter').value;
+    const feature = $('feature-filter').value;
+    state.filtered = rows.filter((r) =>
+      (!status || r.status === status) &&
+      (!feature || r.feature === feature) &&
+      (!needle || COLUMNS.some(([key]) => key !== 'evidence' && String(r[key] || '').toLowerCase().includes(needle))));
+    if (state.sortKey) {
+      const key = state.sortKey;
+      state.filtered.sort((a, b) => String(a[key] || '').localeCompare(String(b[key] || '')) * state.sortDir);
+    }
+    state.page = 0;
+    render();
+  }
+
+  function render() {
+    const size = parseInt($('page-size').value, 10);
+    const pages = Math.max(1, Math.ceil(state.filtered.length / size));
+    state.page = Math.min(state.page, pages - 1);
+    const body = document.createDocumentFragment();
+    state.filtered.slice(state.page * size, (state.page + 1) * size).forEach((r) => {
+      const tr = document.createElement('tr');
+      COLUMNS.forEach(([key]) => {
+        const td = document.createElement('td');
+        if (key === 'evidence') {
+          (r.evidence || []).forEach((ev) => {
+            if (ev.thumbnail) {
+              const img = document.createElement('img');
+              img.src = ev.thumbnail;
+              img.loading = 'lazy';
+              img.title = ev.name;
+              td.appendChild(img);
+            }
+            td.appendChild(document.createTextNode(ev.name));
+            td.appendChild(document.createElement('br'));
+          });
+        } else {
+          td.textContent = r[key] == null ? '' : r[key];
+          td.className = 'text';
+          if (key === 'status') td.className += ' status-' + String(r[key]).replace(/ /g, '-');
+        }
+        tr.appendChild(td);
+      });
+      body.appendChild(tr);
+    });
+    $('rows').replaceChildren(body);
+    $('page-info').textContent = 'Page ' + (state.page + 1) + ' of ' + pages + ' (' + state.filtered.length + ' test cases)';
+    $('prev').disabled = state.page === 0;
+    $('next').disabled = state.page >= pages - 1;
+  }
+
+  $('search').oninput = applyFilters;
+  $('status-filter').onchange = applyFilters;
+  $('feature-filter').onchange = applyFilters;
+  $('page-size').onchange = render;
+  $('prev').onclick = () => { state.page -= 1; render(); };
+  $('next').onclick = () => { state.page += 1; render(); };
+  applyFilters();
+})();
+</script>
+</body>
+</html>
+"""
+
+
+class HtmlReportWriter:
+    """Streams test cases into a single self-contained HTML report.
+
+    Rows are serialized one at a time into a gzip stream that is base64
+    encoded straight into the output file, so memory stays flat no matter
+    how many test cases are written. The browser decompresses the embedded
+    data and handles pagination, filtering and sorting client-side.
+    """
+
+    def __init__(self, filename: str, title: str, columns: List[Tuple[str, str]],
+                 subtitle: str = "", status_colors: Optional[Dict[str, str]] = None,
+                 thumbnail_size: Tuple[int, int] = (160, 120)) -> None:
+        self.filename = filename
+        self.title = title
+        self.subtitle = subtitle
+        self.columns = columns
+        self.status_colors = status_colors or {}
+        self.thumbnail_size = thumbnail_size
+        self.row_count = 0
+        self._file = None
+        self._compressor = None
+        self._pending = bytearray()
+        self._thumbnails: Dict[Tuple[str, float], Optional[str]] = {}
+
+    def __enter__(self) -> "HtmlReportWriter":
+        self._file = open(self.filename, 'w', encoding='utf-8')
+        self._file.write(_PAGE_TEMPLATE_HEAD.format(
+            title=html.escape(self.title),
+            subtitle=html.escape(self.subtitle)
+        ))
+        # wbits=31 produces a gzip container that DecompressionStream understands
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        self._feed(b"[")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self._feed(b"]")
+                self._pending.extend(self._compressor.flush())
+                self._flush_pending(final=True)
+                self._file.write(_PAGE_TEMPLATE_TAIL % {
+                    "columns": json.dumps(self.columns),
+                    "status_colors": json.dumps(self.status_colors)
+                })
+        finally:
+            self._file.close()
+
+    def write_row(self, record: Dict[str, Any], evidence_paths: Optional[List[str]] = None) -> None:
+        """Append one test case, embedding thumbnails for its evidence images"""
+        if evidence_paths:
+            record = dict(record)
+            record["evidence"] = [
+                {"name": os.path.basename(path), "thumbnail": self.get_thumbnail(path)}
+                for path in evidence_paths
+            ]
+        data = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self._feed(b"," + data if self.row_count else data)
+        self.row_count += 1
+
+    def get_thumbnail(self, path: str) -> Optional[str]:
+        """Get a JPEG data URI thumbnail of an image, cached per file version"""
+        try:
+            key = (path, os.path.getmtime(path))
+        except OSError:
+            return None
+        if key not in self._thumbnails:
+            try:
+                with Image.open(path) as img:
+                    img.thumbnail(self.thumbnail_size)
+                    buffer = BytesIO()
+                    img.convert("RGB").save(buffer, format="JPEG", quality=70)
+                encoded = base64.b64encode(buffer.getvalue()).decode('ascii')
+                self._thumbnails[key] = f"data:image/jpeg;base64,{encoded}"
+            except Exception as e:
+                print(f"Error creating thumbnail for {path}: {e}")
+                self._thumbnails[key] = None
+        return self._thumbnails[key]
+
+    def _feed(self, data: bytes) -> None:
+        self._pending.extend(self._compressor.compress(data))
+        if len(self._pending) >= _BASE64_CHUNK:
+            self._flush_pending()
+
+    def _flush_pending(self, final: bool = False) -> None:
+        size = len(self._pending) if final else len(self._pending) - len(self._pending) % 3
+        if size:
+            self._file.write(base64.b64encode(bytes(self._pending[:size])).decode('ascii'))
+            del self._pending[:size]
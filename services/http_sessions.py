@@ -0,0 +1,85 @@
+import http.cookiejar
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from services.request_timing import TimedHTTPAdapter
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class _HostSession:
+    __slots__ = ("session", "last_used", "active")
+
+    def __init__(self, session: requests.Session) -> None:
+        self.session = session
+        self.last_used = time.monotonic()
+        self.active = 0
+
+
+class SessionPool:
+    """One pooled requests.Session per (scheme, host, port).
+
+    Consecutive requests to the same host reuse open TCP/TLS connections
+    instead of handshaking every time. Sessions nobody used for idle_timeout
+    seconds are closed the next time a session is leased.
+    """
+
+    def __init__(self, pool_maxsize: int = 10, idle_timeout: float = 90.0) -> None:
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[Tuple[str, str, int], _HostSession] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_key(url: str) -> Tuple[str, str, int]:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        return scheme, (parts.hostname or "").lower(), parts.port or _DEFAULT_PORTS.get(scheme, 0)
+
+    @contextmanager
+    def lease(self, url: str) -> Iterator[requests.Session]:
+        """Borrow the session for url's host for the duration of one request"""
+        key = self.host_key(url)
+        with self._lock:
+            self._evict_idle_locked()
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = self._sessions[key] = _HostSession(self._create_session())
+            entry.active += 1
+        try:
+            yield entry.session
+        finally:
+            with self._lock:
+                entry.active -= 1
+                entry.last_used = time.monotonic()
+
+    def close(self) -> None:
+        """Close every session and its open connections"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for entry in sessions:
+            entry.session.close()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        # Sessions are shared by unrelated test cases, so a Set-Cookie must not carry over
+        # into later requests the way it would in a browser; explicit Cookie headers still go out
+        session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        # A single host per session, so one connection pool of pool_maxsize connections
+        adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _evict_idle_locked(self) -> None:
+        now = time.monotonic()
+        for key, entry in list(self._sessions.items()):
+            if entry.active == 0 and now - entry.last_used > self.idle_timeout:
+                del self._sessions[key]
+                entry.session.close()
@@ -0,0 +1,283 @@
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+# One step of an ignore path: ..name, .name, .*, [*], ['name'], ["name"] or [index]
+_IGNORE_TOKEN = re.compile(
+    r"\.\.([^.\[\]]+)|\.([^.\[\]]+)|\[\s*(\*)\s*\]|\[\s*'([^']*)'\s*\]|\[\s*\"([^\"]*)\"\s*\]|\[\s*(-?\d+)\s*\]"
+)
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Kinds of ignore path steps
+_KEY, _ANY, _DEEP = range(3)
+
+Path = Tuple[Union[str, int], ...]
+
+# Stands in for the other side of a key or array item that only one document has
+_MISSING_ITEM = object()
+
+
+def format_path(path: Path) -> str:
+    """Spell a path of keys and indexes the way JsonPath reads it, e.g. $.data['x y'][0]"""
+    parts = ["$"]
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        elif _IDENTIFIER.match(key):
+            parts.append(f".{key}")
+        else:
+            parts.append(f"[{json.dumps(key)}]")
+    return "".join(parts)
+
+
+class IgnoreRules:
+    """Paths left out of a comparison, such as $.timestamp, $.transactions[*].id or $..referenceNumber.
+
+    * matches any one key or index and ..name matches name at any depth. An
+    ignored path is skipped together with everything below it.
+    """
+
+    __slots__ = ("paths", "_exact", "_patterns")
+
+    def __init__(self, paths: Sequence[str] = ()) -> None:
+        self.paths = [path.strip() for path in paths if path and path.strip()]
+        # Plain paths are found with a set lookup, the others are matched step by step
+        self._exact = set()
+        self._patterns: List[Tuple[Tuple[int, Any], ...]] = []
+        for path in self.paths:
+            steps = self._parse(path)
+            if all(kind == _KEY for kind, _ in steps):
+                self._exact.add(tuple(value for _, value in steps))
+            else:
+                self._patterns.append(steps)
+
+    @staticmethod
+    def _parse(path: str) -> Tuple[Tuple[int, Any], ...]:
+        expression = path[1:] if path.startswith("$") else path
+        if expression and expression[0] not in ".[":
+            expression = "." + expression
+        steps = []
+        position = 0
+        while position < len(expression):
+            match = _IGNORE_TOKEN.match(expression, position)
+            if not match:
+                raise ValueError(f"Invalid ignore path {path!r} at {expression[position:]!r}")
+            deep, key, star, quoted, double_quoted, index = match.groups()
+            if deep is not None:
+                steps.append((_DEEP, None if deep == "*" else deep))
+            elif star is not None or key == "*":
+                steps.append((_ANY, None))
+            elif index is not None:
+                steps.append((_KEY, int(index)))
+            else:
+                steps.append((_KEY, key if key is not None else quoted if quoted is not None else double_quoted))
+            position = match.end()
+        if not steps:
+            raise ValueError(f"Ignore path {path!r} would ignore the whole document")
+        return tuple(steps)
+
+    def __bool__(self) -> bool:
+        return bool(self.paths)
+
+    def matches(self, path: Path) -> bool:
+        if path in self._exact:
+            return True
+        return any(self._match(steps, 0, path, 0) for steps in self._patterns)
+
+    @classmethod
+    def _match(cls, steps: Tuple[Tuple[int, Any], ...], i: int, path: Path, j: int) -> bool:
+        while i < len(steps):
+            kind, value = steps[i]
+            if kind == _DEEP:
+                return any(
+                    (value is None or path[k] == value) and cls._match(steps, i + 1, path, k + 1)
+                    for k in range(j, len(path))
+                )
+            if j >= len(path) or (kind == _KEY and (path[j] != value or type(path[j]) is not type(value))):
+                return False
+            i += 1
+            j += 1
+        return j == len(path)
+
+
+@dataclass(slots=True)
+class Difference:
+    # added, removed or changed
+    kind: str
+    path: Path
+    old: Any = None
+    new: Any = None
+
+    def describe(self, value_chars: int = 120) -> str:
+        path = format_path(self.path)
+        if self.kind == "added":
+            return f"+ {path}: {_short(self.new, value_chars)}"
+        if self.kind == "removed":
+            return f"- {path}: {_short(self.old, value_chars)}"
+        return f"~ {path}: {_short(self.old, value_chars)} -> {_short(self.new, value_chars)}"
+
+
+def _short(value: Any, limit: int) -> str:
+    text = json.dumps(value, default=str)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+@dataclass(slots=True)
+class JsonDiff:
+    """Fields added, removed and changed between two JSON documents"""
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    # The first max_differences differences in document order, keys only in the new
+    # document coming after the old document's keys; the counts cover all of them
+    differences: List[Difference] = field(default_factory=list)
+    max_differences: int = 1000
+
+    @property
+    def count(self) -> int:
+        return self.added + self.removed + self.changed
+
+    @property
+    def identical(self) -> bool:
+        return self.count == 0
+
+    def record(self, kind: str, path: Path, old: Any = None, new: Any = None) -> None:
+        if kind == "added":
+            self.added += 1
+        elif kind == "removed":
+            self.removed += 1
+        else:
+            self.changed += 1
+        if len(self.differences) < self.max_differences:
+            self.differences.append(Difference(kind, path, old, new))
+
+    def summary(self) -> str:
+        if self.identical:
+            return "identical"
+        return f"{self.added} added, {self.removed} removed, {self.changed} changed"
+
+    def describe(self, limit: Optional[int] = None) -> str:
+        shown = self.differences if limit is None else self.differences[:limit]
+        lines = [difference.describe() for difference in shown]
+        if self.count > len(shown):
+            lines.append(f"... {self.count - len(shown)} more differences")
+        return "\n".join(lines)
+
+
+def _same(old: Any, new: Any) -> bool:
+    try:
+        if not old == new:
+            return False
+    except RecursionError:
+        # Too deep for ==; the walk goes down a level and tries again
+        return False
+    if not isinstance(old, (dict, list)):
+        # True == 1 in Python, but not in JSON
+        return isinstance(old, bool) == isinstance(new, bool)
+    return _same_types(old, new)
+
+
+def _same_types(old: Any, new: Any) -> bool:
+    """Check that two equal containers also hold values of the same types throughout.
+
+    == lets True stand for 1 anywhere below. The types of each container's
+    values are compared with map() in C, so only nested containers are
+    visited in Python. 1 and 1.0 count as different here too, which only
+    sends the walk down to where == tells them apart again.
+    """
+    pending = [(old, new)]
+    while pending:
+        old, new = pending.pop()
+        if isinstance(old, dict):
+            types = list(map(type, old.values()))
+            if types != list(map(type, new.values())):
+                # Possibly just a different key order
+                if any(type(value) is not type(new[key]) for key, value in old.items()):
+                    return False
+            if dict in types or list in types:
+                pending.extend((value, new[key]) for key, value in old.items() if isinstance(value, (dict, list)))
+        else:
+            types = list(map(type, old))
+            if types != list(map(type, new)):
+                return False
+            if dict in types or list in types:
+                pending.extend((a, b) for a, b in zip(old, new) if isinstance(a, (dict, list)))
+    return True
+
+
+def diff_json(baseline: Any, current: Any, ignore: Union[IgnoreRules, Sequence[str]] = (),
+              max_differences: int = 1000) -> JsonDiff:
+    """Compare two parsed JSON documents structurally.
+
+    Objects are compared key by key and arrays index by index. Subtrees are
+    first compared with ==, which runs in C and stops at the first
+    difference, so only the branches that actually differ are walked in
+    Python; equal ones just get their value types checked, a container at
+    a time, so a multi-MB document with a few changed fields stays cheap.
+    The walk uses an explicit stack, so deeply nested documents don't hit
+    the recursion limit.
+    """
+    rules = ignore if isinstance(ignore, IgnoreRules) else IgnoreRules(ignore)
+    diff = JsonDiff(max_differences=max_differences)
+    stack: List[Tuple[Path, Any, Any]] = [((), baseline, current)]
+    while stack:
+        path, old, new = stack.pop()
+        if _same(old, new) or (rules and path and rules.matches(path)):
+            continue
+        if isinstance(old, dict) and isinstance(new, dict):
+            children = [(path + (key,), value, new.get(key, _MISSING_ITEM)) for key, value in old.items()]
+            children.extend((path + (key,), _MISSING_ITEM, value) for key, value in new.items() if key not in old)
+            # Reversed, so the stack hands the children back in document order
+            stack.extend(reversed(children))
+        elif isinstance(old, list) and isinstance(new, list):
+            common = min(len(old), len(new))
+            for index in range(len(old) - 1, common - 1, -1):
+                stack.append((path + (index,), old[index], _MISSING_ITEM))
+            for index in range(len(new) - 1, common - 1, -1):
+                stack.append((path + (index,), _MISSING_ITEM, new[index]))
+            stack.extend((path + (index,), old[index], new[index]) for index in range(common - 1, -1, -1))
+        elif old is _MISSING_ITEM:
+            diff.record("added", path, new=new)
+        elif new is _MISSING_ITEM:
+            diff.record("removed", path, old=old)
+        else:
+            diff.record("changed", path, old, new)
+    return diff
+
+
+class JsonBaseline:
+    """The golden response of a test case, parsed on first use and compared with new responses.
+
+    load_text() gets the stored body, e.g. from the BlobStore. Parsing
+    happens once, on whichever thread compares first, so a multi-MB baseline
+    is neither read nor parsed on the UI thread. Raises ValueError from
+    compare() when the baseline is not JSON.
+    """
+
+    def __init__(self, load_text: Callable[[], str], ignore: Sequence[str] = (), max_differences: int = 1000) -> None:
+        self.load_text = load_text
+        self.rules = IgnoreRules(ignore)
+        self.max_differences = max_differences
+        self._document: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def document(self) -> Any:
+        with self._lock:
+            if not self._loaded:
+                text = self.load_text()
+                try:
+                    self._document = json.loads(text)
+                except ValueError as e:
+                    raise ValueError(f"Baseline response is not JSON: {e}") from None
+                self._loaded = True
+            return self._document
+
+    def set_ignore(self, paths: Sequence[str]) -> None:
+        self.rules = IgnoreRules(paths)
+
+    def compare(self, document: Any) -> JsonDiff:
+        return diff_json(self.document, document, self.rules, self.max_differences)
@@ -0,0 +1,53 @@
+import re
+from typing import Any, List, Union
+
+# One step of a JSON path: .name, ['name'], ["name"] or [index]
+_PATH_TOKEN = re.compile(r"\.([^.\[\]]+)|\[\s*'([^']*)'\s*\]|\[\s*\"([^\"]*)\"\s*\]|\[\s*(-?\d+)\s*\]")
+
+
+class JsonPath:
+    """A JSON path such as $.data.accounts[0].number, parsed once and applied to many documents.
+
+    The leading "$" is optional. get() raises KeyError when the path does
+    not exist in the document.
+    """
+
+    __slots__ = ("path", "keys")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.keys: List[Union[str, int]] = []
+        expression = path.strip()
+        if expression.startswith("$"):
+            expression = expression[1:]
+        if expression and expression[0] not in ".[":
+            expression = "." + expression
+
+        position = 0
+        while position < len(expression):
+            match = _PATH_TOKEN.match(expression, position)
+            if not match:
+                raise ValueError(f"Invalid JSON path {path!r} at {expression[position:]!r}")
+            key, quoted, double_quoted, index = match.groups()
+            if index is not None:
+                self.keys.append(int(index))
+            else:
+                self.keys.append(key if key is not None else quoted if quoted is not None else double_quoted)
+            position = match.end()
+
+    def get(self, document: Any) -> Any:
+        value = document
+        try:
+            for key in self.keys:
+                value = value[key]
+        except (KeyError, IndexError, TypeError):
+            raise KeyError(f"{self.path} not found in the response") from None
+        return value
+
+    def __repr__(self) -> str:
+        return f"JsonPath({self.path!r})"
+
+
+def extract_json_path(document: Any, path: str) -> Any:
+    """Get the value at path in document, see JsonPath"""
+    return JsonPath(path).get(document)
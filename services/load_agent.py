@@ -0,0 +1,211 @@
+"""Load agent: runs load tests on behalf of the desktop app on another machine.
+
+Start it with
+
+    python -m services.load_agent --host 0.0.0.0 --port 8765 --token <secret>
+
+and list the machine as "host:port" under Agents in the Load Test tab. The
+app and the agent talk JSON lines over TCP: the app sends one "start"
+message with the scenario, the agent streams back the histogram and counters
+recorded during each interval and the app may send "stop" at any time.
+The agent only listens on 127.0.0.1 unless told otherwise, and anyone who can
+reach its port can make it send requests, so set a token when exposing it.
+"""
+import argparse
+import dataclasses
+import hmac
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.load_test import LoadProfile, LoadSnapshot, LoadTest
+from services.load_workers import MultiProcessLoadTest
+from services.request_engine import RequestSpec
+
+DEFAULT_PORT = 8765
+# Upper bound for one protocol message; a scenario with many test cases stays far below
+_MAX_LINE = 16 * 1024 * 1024
+
+
+def parse_agent_address(address: str) -> Tuple[str, int]:
+    """Split "host:port" (port optional) into a socket address"""
+    host, _, port = address.strip().rpartition(":")
+    if not host:
+        return port, DEFAULT_PORT
+    return host.strip("[]"), int(port)
+
+
+def _send(stream, message: Dict[str, Any], lock: threading.Lock) -> None:
+    data = (json.dumps(message) + "\n").encode()
+    with lock:
+        stream.write(data)
+        stream.flush()
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    """Serves one load test run for a connected app"""
+
+    def handle(self) -> None:
+        lock = threading.Lock()
+        try:
+            message = json.loads(self.rfile.readline(_MAX_LINE) or b"{}")
+            token = self.server.token
+            if token and not hmac.compare_digest(str(message.get("token", "")), token):
+                _send(self.wfile, {"type": "error", "message": "Invalid agent token"}, lock)
+                return
+            if message.get("type") != "start":
+                _send(self.wfile, {"type": "error", "message": "Expected a start message"}, lock)
+                return
+
+            specs = [RequestSpec.from_dict(spec) for spec in message["specs"]]
+            profile = LoadProfile(**message["profile"])
+        except (ValueError, KeyError, TypeError) as e:
+            _send(self.wfile, {"type": "error", "message": f"Invalid scenario: {e}"}, lock)
+            return
+
+        def report(snapshot: LoadSnapshot) -> None:
+            histogram, requests, errors, assertion_failures = load_test.take_interval()
+            _send(self.wfile, {
+                "type": "interval",
+                "histogram": histogram.to_dict(),
+                "requests": requests,
+                "errors": errors,
+                "assertion_failures": assertion_failures,
+                "active_users": snapshot.active_users,
+                "finished": snapshot.finished,
+            }, lock)
+
+        load_test = LoadTest(specs, profile, on_snapshot=report,
+                             snapshot_interval=float(message.get("interval", 1.0)))
+        print(f"Load agent: {profile.virtual_users} users for {profile.duration_s:.0f}s "
+              f"requested by {self.client_address[0]}")
+
+        def watch() -> None:
+            # Stop on request, and when the app goes away
+            try:
+                for line in self.rfile:
+                    if json.loads(line).get("type") == "stop":
+                        break
+            except (OSError, ValueError):
+                pass
+            load_test.stop()
+
+        threading.Thread(target=watch, name="load-agent-watch", daemon=True).start()
+        try:
+            load_test.run()
+        except OSError:
+            # The app disconnected; the run was stopped by the watcher
+            pass
+
+
+class LoadAgent(socketserver.ThreadingTCPServer):
+    """TCP server running load tests sent by the desktop app"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, token: Optional[str] = None) -> None:
+        self.token = token or None
+        super().__init__((host, port), _AgentHandler)
+
+
+class RemoteLoadTest(MultiProcessLoadTest):
+    """Spreads a load test over load agents instead of local processes.
+
+    Virtual users and target rate are split evenly over the agents and their
+    interval reports are merged like those of local worker processes, so the
+    Load Test tab shows one combined run.
+    """
+
+    def __init__(self, specs: List[RequestSpec], profile: LoadProfile, agents: List[str],
+                 token: Optional[str] = None, on_snapshot=None, snapshot_interval: float = 1.0,
+                 connect_timeout: float = 10.0) -> None:
+        if not agents:
+            raise ValueError("No load agents given")
+        super().__init__(specs, profile, len(agents), on_snapshot=on_snapshot,
+                         snapshot_interval=snapshot_interval)
+        self.agents = [parse_agent_address(agent) for agent in agents][:len(self.shares)]
+        self.token = token
+        self.connect_timeout = connect_timeout
+        self._sockets: Dict[int, socket.socket] = {}
+        self._sockets_lock = threading.Lock()
+
+    def stop(self) -> None:
+        super().stop()
+        with self._sockets_lock:
+            sockets = list(self._sockets.values())
+        for sock in sockets:
+            try:
+                sock.sendall(b'{"type": "stop"}\n')
+            except OSError:
+                pass
+
+    def _launch(self, results) -> list:
+        workers = [
+            threading.Thread(target=self._drive_agent, args=(index, address, share, results),
+                             name=f"load-agent-{index}", daemon=True)
+            for index, (address, share) in enumerate(zip(self.agents, self.shares))
+        ]
+        for worker in workers:
+            worker.start()
+        return workers
+
+    def _close(self) -> None:
+        with self._sockets_lock:
+            sockets, self._sockets = list(self._sockets.values()), {}
+        for sock in sockets:
+            sock.close()
+
+    def _drive_agent(self, index: int, address: Tuple[str, int], share: LoadProfile, results) -> None:
+        host, port = address
+        try:
+            sock = socket.create_connection(address, timeout=self.connect_timeout)
+            sock.settimeout(None)
+            with self._sockets_lock:
+                self._sockets[index] = sock
+            sock.sendall((json.dumps({
+                "type": "start",
+                "token": self.token or "",
+                "specs": [spec.to_dict() for spec in self.specs],
+                "profile": dataclasses.asdict(share),
+                "interval": self.snapshot_interval,
+            }) + "\n").encode())
+            if self._stop_event.is_set():
+                sock.sendall(b'{"type": "stop"}\n')
+
+            for line in sock.makefile("rb"):
+                message = json.loads(line)
+                if message.get("type") == "error":
+                    raise ValueError(message.get("message", "unknown error"))
+                message["worker"] = index
+                results.put(message)
+                if message.get("finished"):
+                    return
+            raise ConnectionError("connection closed before the run finished")
+        except (OSError, ValueError) as e:
+            results.put({"worker": index, "finished": True, "error": f"{host}:{port}: {e}"})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run load tests sent by the Test Case Management app")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--token", default=os.environ.get("LOAD_AGENT_TOKEN"),
+                        help="shared secret the app must send (default: $LOAD_AGENT_TOKEN)")
+    args = parser.parse_args()
+
+    agent = LoadAgent(args.host, args.port, args.token)
+    print(f"Load agent listening on {args.host}:{args.port}")
+    try:
+        agent.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import dataclasses
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from services.execution_policy import CircuitBreakerRegistry
+from services.histogram import LatencyHistogram
+from services.http_sessions import SessionPool
+from services.request_engine import RequestEngine, RequestSpec, RequestTicket
+
+
+@dataclass(slots=True)
+class LoadProfile:
+    """Shape of a load test run"""
+    virtual_users: int = 10
+    # Requests per second across all users; 0 lets every user send back to back
+    target_rps: float = 0.0
+    ramp_up_s: float = 0.0
+    duration_s: float = 30.0
+
+
+@dataclass(slots=True)
+class LoadSnapshot:
+    """Live or final figures of a load test run"""
+    elapsed_s: float = 0.0
+    active_users: int = 0
+    requests: int = 0
+    errors: int = 0
+    # Responses that arrived but failed their test case's assertions, counted in errors too
+    assertion_failures: int = 0
+    # Throughput over the last snapshot interval, and over the whole run
+    current_rps: float = 0.0
+    average_rps: float = 0.0
+    p50_ms: float = 0.0
+    p90_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    finished: bool = False
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests * 100 if self.requests else 0.0
+
+
+class TokenBucket:
+    """Paces requests to a target rate shared by all virtual users"""
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: threading.Event) -> bool:
+        """Wait for a token; returns False if stop was set while waiting"""
+        while not stop.is_set():
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            stop.wait(wait)
+        return False
+
+
+class LoadTest:
+    """Drives saved test cases with a number of virtual users.
+
+    Each virtual user is a thread that starts after its share of the ramp-up
+    and then sends the given requests round-robin until the duration is up,
+    optionally paced by a shared token bucket. Latencies of successful
+    requests go into a LatencyHistogram; on_snapshot(snapshot) is called
+    from the run thread every snapshot_interval seconds and once at the end.
+    """
+
+    def __init__(self, specs: List[RequestSpec], profile: LoadProfile,
+                 on_snapshot: Optional[Callable[[LoadSnapshot], None]] = None,
+                 snapshot_interval: float = 1.0) -> None:
+        if not specs:
+            raise ValueError("A load test needs at least one request")
+        # Measure the endpoint itself: no retries and no circuit breaker failing fast
+        self.specs = [
+            dataclasses.replace(spec, policy=dataclasses.replace(spec.policy, retries=0)) for spec in specs
+        ]
+        self.profile = profile
+        self.on_snapshot = on_snapshot
+        self.snapshot_interval = snapshot_interval
+        self.engine = RequestEngine(
+            max_workers=1,
+            session_pool=SessionPool(pool_maxsize=max(1, profile.virtual_users)),
+            breakers=CircuitBreakerRegistry(failure_threshold=float("inf"))
+        )
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.assertion_failures = 0
+        # Recordings since the last take_interval(), for merging across processes
+        self._interval_histogram = LatencyHistogram()
+        self._interval_requests = 0
+        self._interval_errors = 0
+        self._interval_assertion_failures = 0
+        self.active_users = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._start_time = 0.0
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run, name="load-test", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> LoadSnapshot:
+        profile = self.profile
+        bucket = TokenBucket(profile.target_rps, burst=max(1.0, profile.target_rps / 10)) if profile.target_rps > 0 else None
+        self._start_time = time.monotonic()
+        end_time = self._start_time + profile.duration_s
+
+        users = []
+        for number in range(profile.virtual_users):
+            delay = profile.ramp_up_s * number / profile.virtual_users if profile.virtual_users else 0
+            user = threading.Thread(
+                target=self._virtual_user, args=(number, delay, end_time, bucket),
+                name=f"load-vu-{number}", daemon=True
+            )
+            users.append(user)
+            user.start()
+
+        last_requests, last_time = 0, self._start_time
+        while not self._stop.wait(self.snapshot_interval):
+            snapshot = self.snapshot(last_requests, last_time)
+            last_requests, last_time = snapshot.requests, time.monotonic()
+            self._emit(snapshot)
+            if time.monotonic() >= end_time and not any(user.is_alive() for user in users):
+                break
+        self._stop.set()
+        # Give requests still in flight a moment; users stuck on a dead server are abandoned
+        join_until = time.monotonic() + 5.0
+        for user in users:
+            user.join(timeout=max(0.0, join_until - time.monotonic()))
+        self.engine.shutdown()
+
+        final = self.snapshot(0, self._start_time)
+        final.finished = True
+        self._emit(final)
+        return final
+
+    def snapshot(self, last_requests: int = 0, last_time: Optional[float] = None) -> LoadSnapshot:
+        """Get the figures of the run so far"""
+        now = time.monotonic()
+        with self._lock:
+            histogram = self.histogram.copy()
+            requests, errors, active = self.requests, self.errors, self.active_users
+            assertion_failures = self.assertion_failures
+        elapsed = now - self._start_time
+        interval = now - (last_time if last_time is not None else self._start_time)
+        return LoadSnapshot(
+            elapsed_s=elapsed,
+            active_users=active,
+            requests=requests,
+            errors=errors,
+            assertion_failures=assertion_failures,
+            current_rps=(requests - last_requests) / interval if interval > 0 else 0.0,
+            average_rps=requests / elapsed if elapsed > 0 else 0.0,
+            p50_ms=histogram.percentile_ms(50),
+            p90_ms=histogram.percentile_ms(90),
+            p99_ms=histogram.percentile_ms(99),
+            max_ms=histogram.max_value / 1000.0
+        )
+
+    def take_interval(self):
+        """Get (histogram, requests, errors, assertion failures) recorded since the previous call and reset them"""
+        with self._lock:
+            interval = (self._interval_histogram, self._interval_requests, self._interval_errors,
+                        self._interval_assertion_failures)
+            self._interval_histogram = LatencyHistogram(self.histogram.sub_bucket_bits)
+            self._interval_requests = 0
+            self._interval_errors = 0
+            self._interval_assertion_failures = 0
+        return interval
+
+    def _emit(self, snapshot: LoadSnapshot) -> None:
+        if self.on_snapshot:
+            try:
+                self.on_snapshot(snapshot)
+            except Exception as e:
+                print(f"Error publishing load test snapshot: {e}")
+
+    def _virtual_user(self, number: int, delay: float, end_time: float, bucket: Optional[TokenBucket]) -> None:
+        if delay and self._stop.wait(delay):
+            return
+        with self._lock:
+            self.active_users += 1
+        try:
+            iteration = number
+            while not self._stop.is_set() and time.monotonic() < end_time:
+                if bucket is not None and not bucket.acquire(self._stop):
+                    break
+                spec = self.specs[iteration % len(self.specs)]
+                iteration += 1
+                result = self.engine.execute(RequestTicket(0, spec))
+                with self._lock:
+                    self.requests += 1
+                    self._interval_requests += 1
+                    if result.ok:
+                        self.histogram.record_ms(result.elapsed_ms)
+                        self._interval_histogram.record_ms(result.elapsed_ms)
+                    else:
+                        self.errors += 1
+                        self._interval_errors += 1
+                        if result.assertion_failures:
+                            self.assertion_failures += 1
+                            self._interval_assertion_failures += 1
+        finally:
+            with self._lock:
+                self.active_users -= 1
@@ -0,0 +1,189 @@
+import dataclasses
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from services.histogram import LatencyHistogram
+from services.load_test import LoadProfile, LoadSnapshot, LoadTest
+from services.request_engine import RequestSpec
+
+# Seconds a worker process may be gone before its missing final report is given up on
+_EXIT_GRACE = 2.0
+
+
+def split_profile(profile: LoadProfile, processes: int) -> List[LoadProfile]:
+    """Divide virtual users and target rate over worker processes"""
+    processes = max(1, min(processes, profile.virtual_users))
+    base, extra = divmod(profile.virtual_users, processes)
+    shares = []
+    for index in range(processes):
+        users = base + (1 if index < extra else 0)
+        shares.append(dataclasses.replace(
+            profile,
+            virtual_users=users,
+            target_rps=profile.target_rps * users / profile.virtual_users if profile.target_rps else 0.0
+        ))
+    return shares
+
+
+def _worker_main(index: int, specs: List[RequestSpec], profile: LoadProfile,
+                 stop_event, results, interval: float) -> None:
+    """Entry point of a load worker process: run a threaded LoadTest and report deltas"""
+    try:
+        def report(snapshot: LoadSnapshot) -> None:
+            histogram, requests, errors, assertion_failures = load_test.take_interval()
+            results.put({
+                "worker": index,
+                "histogram": histogram.to_dict(),
+                "requests": requests,
+                "errors": errors,
+                "assertion_failures": assertion_failures,
+                "active_users": snapshot.active_users,
+                "finished": snapshot.finished,
+            })
+
+        load_test = LoadTest(specs, profile, on_snapshot=report, snapshot_interval=interval)
+        threading.Thread(target=lambda: (stop_event.wait(), load_test.stop()), daemon=True).start()
+        load_test.run()
+    except Exception as e:
+        results.put({"worker": index, "finished": True, "error": str(e)})
+
+
+class MultiProcessLoadTest:
+    """Spreads a load test over worker processes so it isn't bound by one GIL.
+
+    Every worker runs its share of the virtual users as a threaded LoadTest
+    and sends the histogram and counters recorded during each interval back
+    over a queue. Those deltas are merged here, so percentiles cover all
+    workers exactly as if a single process had recorded them. Offers the same
+    start/stop/on_snapshot interface as LoadTest.
+    """
+
+    def __init__(self, specs: List[RequestSpec], profile: LoadProfile, processes: int,
+                 on_snapshot: Optional[Callable[[LoadSnapshot], None]] = None,
+                 snapshot_interval: float = 1.0) -> None:
+        if not specs:
+            raise ValueError("A load test needs at least one request")
+        self.specs = list(specs)
+        self.profile = profile
+        self.shares = split_profile(profile, processes)
+        self.on_snapshot = on_snapshot
+        self.snapshot_interval = snapshot_interval
+        self.histogram = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.assertion_failures = 0
+        self.errors_by_worker: Dict[int, str] = {}
+        self._active_users: Dict[int, int] = {}
+        # Spawn works the same on Windows, macOS and Linux and doesn't fork Tk state
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._start_time = 0.0
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run, name="load-coordinator", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> LoadSnapshot:
+        results = self._context.Queue()
+        self._start_time = time.monotonic()
+        workers = self._launch(results)
+
+        finished = set()
+        exited_at: Dict[int, float] = {}
+        last_emit = last_time = self._start_time
+        last_requests = 0
+        while len(finished) < len(workers):
+            try:
+                self._merge(results.get(timeout=self.snapshot_interval / 4), finished)
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            for index, worker in enumerate(workers):
+                if index in finished or worker.is_alive():
+                    continue
+                # Give the queue time to deliver the last report of a worker that exited
+                exited_at.setdefault(index, now)
+                if now - exited_at[index] > _EXIT_GRACE:
+                    finished.add(index)
+                    self._active_users[index] = 0
+
+            if now - last_emit >= self.snapshot_interval:
+                snapshot = self.snapshot(last_requests, last_time)
+                last_requests, last_time, last_emit = snapshot.requests, now, now
+                self._emit(snapshot)
+
+        for worker in workers:
+            worker.join(timeout=_EXIT_GRACE)
+        self._close()
+
+        final = self.snapshot(0, self._start_time)
+        final.finished = True
+        self._emit(final)
+        return final
+
+    def _launch(self, results) -> list:
+        """Start one worker per share, each reporting to results; returns handles with is_alive()/join()"""
+        workers = [
+            self._context.Process(
+                target=_worker_main,
+                args=(index, self.specs, share, self._stop_event, results, self.snapshot_interval),
+                name=f"load-worker-{index}",
+                daemon=True
+            )
+            for index, share in enumerate(self.shares)
+        ]
+        for worker in workers:
+            worker.start()
+        return workers
+
+    def _close(self) -> None:
+        """Release whatever _launch set up once all workers are done"""
+
+    def snapshot(self, last_requests: int = 0, last_time: Optional[float] = None) -> LoadSnapshot:
+        now = time.monotonic()
+        elapsed = now - self._start_time
+        interval = now - (last_time if last_time is not None else self._start_time)
+        return LoadSnapshot(
+            elapsed_s=elapsed,
+            active_users=sum(self._active_users.values()),
+            requests=self.requests,
+            errors=self.errors,
+            assertion_failures=self.assertion_failures,
+            current_rps=(self.requests - last_requests) / interval if interval > 0 else 0.0,
+            average_rps=self.requests / elapsed if elapsed > 0 else 0.0,
+            p50_ms=self.histogram.percentile_ms(50),
+            p90_ms=self.histogram.percentile_ms(90),
+            p99_ms=self.histogram.percentile_ms(99),
+            max_ms=self.histogram.max_value / 1000.0
+        )
+
+    def _merge(self, message: Dict[str, Any], finished: set) -> None:
+        worker = message["worker"]
+        if "error" in message:
+            self.errors_by_worker[worker] = message["error"]
+            print(f"Load worker {worker} failed: {message['error']}")
+        if "histogram" in message:
+            self.histogram.merge(LatencyHistogram.from_dict(message["histogram"]))
+            self.requests += message["requests"]
+            self.errors += message["errors"]
+            # Agents from before assertions existed don't send the count
+            self.assertion_failures += message.get("assertion_failures", 0)
+            self._active_users[worker] = message["active_users"]
+        if message.get("finished"):
+            finished.add(worker)
+            self._active_users[worker] = 0
+
+    def _emit(self, snapshot: LoadSnapshot) -> None:
+        if self.on_snapshot:
+            try:
+                self.on_snapshot(snapshot)
+            except Exception as e:
+                print(f"Error publishing load test snapshot: {e}")
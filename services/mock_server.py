@@ -0,0 +1,328 @@
+"""Local stub of the banking API for offline, reproducible runs.
+
+Start it from the API Test view or with
+
+    python -m services.mock_server --port 7200 --latency-ms 40 --error-rate 0.01 --seed 1
+
+and point test cases at http://127.0.0.1:7200/<route>. Every route has a
+canned JSON body in which ${name} is replaced by the field of the same name
+in the request body, or by request_id, timestamp, method or path. Latency,
+error rate and payload size are configurable per route; with a seed the same
+sequence of requests gets the same delays and errors every run.
+"""
+import abc
+import argparse
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config.app_config import AppConfig
+
+# (status, headers, body, seconds to wait before answering)
+StubResponse = Tuple[int, Dict[str, str], bytes, float]
+
+# Canned bodies of the banking features, on top of the common response fields
+_FEATURE_BODIES = {
+    "/balance-inquiry": {"accountNumber": "${accountNumber}", "balance": 15250000.00, "currency": "IDR"},
+    "/transaction-history": {
+        "accountNumber": "${accountNumber}",
+        "transactions": [
+            {"date": "2025-01-14", "description": "ATM Withdrawal", "amount": -500000.00},
+            {"date": "2025-01-13", "description": "Salary", "amount": 12000000.00},
+        ],
+    },
+    "/account-details": {
+        "accountNumber": "${accountNumber}", "accountName": "John Doe", "accountType": "Savings", "status": "Active"
+    },
+    "/fund-transfer": {"sourceAccount": "${accountNumber}", "beneficiaryAccount": "${beneficiaryAccount}",
+                       "amount": "${amount}", "transferStatus": "Completed"},
+    "/card-activation": {"cardNumber": "${cardNumber}", "cardStatus": "Active"},
+    "/card-block": {"cardNumber": "${cardNumber}", "cardStatus": "Blocked"},
+    "/card-unblock": {"cardNumber": "${cardNumber}", "cardStatus": "Active"},
+    "/card-transaction-inquiry": {"cardNumber": "${cardNumber}", "transactions": []},
+    "/payment": {"billerCode": "${billerCode}", "amount": "${amount}", "paymentStatus": "Paid"},
+    "/purchase": {"merchantId": "${merchantId}", "amount": "${amount}", "purchaseStatus": "Approved"},
+    "/check-status": {"originalReference": "${referenceNumber}", "transactionStatus": "Success"},
+}
+
+
+@dataclass(slots=True)
+class LatencyModel:
+    """Distribution the response delay is drawn from, in milliseconds"""
+    # fixed, uniform, normal, lognormal or exponential
+    distribution: str = "fixed"
+    mean_ms: float = 0.0
+    stddev_ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "LatencyModel":
+        model = cls()
+        for name, value in (config or {}).items():
+            if name in cls.__dataclass_fields__:
+                setattr(model, name, value)
+        return model
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay in seconds"""
+        kind = self.distribution
+        if kind == "uniform":
+            value = rng.uniform(self.min_ms, self.max_ms if self.max_ms is not None else self.mean_ms * 2)
+        elif kind == "normal":
+            value = rng.gauss(self.mean_ms, self.stddev_ms)
+        elif kind == "lognormal" and self.mean_ms > 0:
+            # Parameters of the underlying normal giving the requested mean and deviation
+            sigma2 = math.log(1 + (self.stddev_ms / self.mean_ms) ** 2)
+            value = rng.lognormvariate(math.log(self.mean_ms) - sigma2 / 2, math.sqrt(sigma2))
+        elif kind == "exponential" and self.mean_ms > 0:
+            value = rng.expovariate(1 / self.mean_ms)
+        else:
+            value = self.mean_ms
+        value = max(self.min_ms, value)
+        if self.max_ms is not None:
+            value = min(self.max_ms, value)
+        return value / 1000.0
+
+
+@dataclass(slots=True)
+class MockRoute:
+    """Canned response served for one method and path"""
+    method: str
+    path: str
+    status: int = 200
+    body: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    # Share of requests answered with error_status instead
+    error_rate: float = 0.0
+    error_status: int = 500
+    # Bodies shorter than this are padded, to test large payloads
+    payload_bytes: int = 0
+    _template: Optional[Template] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.method = self.method.upper()
+        text = self.body if isinstance(self.body, str) else json.dumps(self.body)
+        self._template = Template(text)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], defaults: Optional[Dict[str, Any]] = None) -> "MockRoute":
+        values = dict(defaults or {})
+        values.update(config)
+        return cls(
+            method=values.get("method", "POST"),
+            path=values["path"],
+            status=int(values.get("status", 200)),
+            body=values.get("body", {}),
+            headers=dict(values.get("headers", {})),
+            latency=LatencyModel.from_config(values.get("latency")),
+            error_rate=float(values.get("error_rate", 0.0)),
+            error_status=int(values.get("error_status", 500)),
+            payload_bytes=int(values.get("payload_bytes", 0))
+        )
+
+    def render(self, fields: Dict[str, Any], rng: random.Random) -> StubResponse:
+        delay = self.latency.sample(rng)
+        if self.error_rate and rng.random() < self.error_rate:
+            body = json.dumps({"responseCode": "96", "responseMessage": "System Malfunction"}).encode()
+            return self.error_status, {"Content-Type": "application/json"}, body, delay
+
+        # Escape substituted values so they can't break the JSON around them
+        values = {name: json.dumps(value if isinstance(value, str) else json.dumps(value))[1:-1]
+                  for name, value in fields.items()}
+        text = self._template.safe_substitute(values)
+        if self.payload_bytes > len(text) and text.endswith("}"):
+            padding = self.payload_bytes - len(text) - len(', "padding": ""')
+            text = text[:-1] + ', "padding": "' + "x" * max(0, padding) + '"}'
+        headers = {"Content-Type": "application/json", **self.headers}
+        return self.status, headers, text.encode(), delay
+
+
+def default_routes(defaults: Optional[Dict[str, Any]] = None) -> List[MockRoute]:
+    """Routes for the banking features listed in API_TEST_CONFIG"""
+    routes = []
+    for path, extra in _FEATURE_BODIES.items():
+        body = {
+            "responseCode": "00",
+            "responseMessage": "Success",
+            "transactionType": "${transactionType}",
+            "referenceNumber": "${request_id}",
+            "timestamp": "${timestamp}",
+            **extra,
+        }
+        routes.append(MockRoute.from_config({"method": "POST", "path": path, "body": body}, defaults))
+    return routes
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, every request on a
+    # kept-alive connection would wait ~40ms for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, headers, payload, delay = self.server.stub.respond(self.command, self.path, body)
+        if delay > 0:
+            time.sleep(delay)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Logging every request would dominate the cost of serving it
+        pass
+
+
+class StubServer(abc.ABC):
+    """Threaded local HTTP server answering from respond(); subclasses supply the answers"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def running(self) -> bool:
+        return self._httpd is not None
+
+    def start(self) -> threading.Thread:
+        """Listen on host:port (port 0 picks a free one) and serve on a background thread"""
+        httpd = ThreadingHTTPServer((self.host, self.port), _StubHandler)
+        httpd.daemon_threads = True
+        httpd.stub = self
+        self.port = httpd.server_address[1]
+        self._httpd = httpd
+        self._thread = threading.Thread(target=httpd.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        httpd, self._httpd = self._httpd, None
+        if httpd is not None:
+            httpd.shutdown()
+            httpd.server_close()
+
+    @abc.abstractmethod
+    def respond(self, method: str, path: str, body: bytes) -> StubResponse:
+        """Answer one request: (status code, headers, body, delay in seconds)"""
+
+    @staticmethod
+    def not_found(method: str, path: str) -> StubResponse:
+        payload = json.dumps({"error": f"No route for {method} {path}"}).encode()
+        return 404, {"Content-Type": "application/json"}, payload, 0.0
+
+
+class MockServer(StubServer):
+    """Serves MockRoutes, matched on method and path (query string ignored)"""
+
+    def __init__(self, routes: List[MockRoute], host: str = "127.0.0.1", port: int = 0,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(host, port)
+        self.routes: Dict[Tuple[str, str], MockRoute] = {}
+        for route in routes:
+            self.routes[(route.method, route.path.rstrip("/") or "/")] = route
+        self._rng = random.Random(seed)
+        self._request_ids = itertools.count(1)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **overrides: Any) -> "MockServer":
+        """Build the server described by an API_TEST_CONFIG["mock_server"] style dict"""
+        config = {**config, **{k: v for k, v in overrides.items() if v is not None}}
+        defaults = {key: config[key] for key in ("latency", "error_rate", "error_status", "payload_bytes")
+                    if key in config}
+        routes = {(route.method, route.path): route for route in default_routes(defaults)}
+        for route_config in config.get("routes", []):
+            route = MockRoute.from_config(route_config, defaults)
+            routes[(route.method, route.path)] = route
+        return cls(list(routes.values()), config.get("host", "127.0.0.1"), int(config.get("port", 0)),
+                   config.get("seed"))
+
+    def respond(self, method: str, path: str, body: bytes) -> StubResponse:
+        path = urlsplit(path).path.rstrip("/") or "/"
+        route = self.routes.get((method, path))
+        if route is None:
+            return self.not_found(method, path)
+
+        fields: Dict[str, Any] = {}
+        try:
+            data = json.loads(body) if body else {}
+            if isinstance(data, dict):
+                fields.update(data)
+        except ValueError:
+            pass
+        with self._lock:
+            self.requests += 1
+            fields.update(
+                request_id=f"MOCK{next(self._request_ids):010d}",
+                timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                method=method,
+                path=path
+            )
+            # One seeded generator under the lock: the same request order gets the same answers
+            return route.render(fields, self._rng)
+
+
+def main() -> None:
+    config = dict(AppConfig.API_TEST_CONFIG["mock_server"])
+    parser = argparse.ArgumentParser(description="Serve canned responses for the banking API routes")
+    parser.add_argument("--host", default=config["host"])
+    parser.add_argument("--port", type=int, default=config["port"])
+    parser.add_argument("--routes", help="JSON file with the same keys as the mock_server config")
+    parser.add_argument("--latency-ms", type=float, help="mean response delay")
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "normal", "lognormal", "exponential"])
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--payload-bytes", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.routes:
+        with open(args.routes, encoding="utf-8") as f:
+            config.update(json.load(f))
+    latency = dict(config.get("latency", {}))
+    if args.latency_ms is not None:
+        latency["mean_ms"] = args.latency_ms
+        latency.setdefault("stddev_ms", args.latency_ms / 3)
+    if args.latency_distribution:
+        latency["distribution"] = args.latency_distribution
+    server = MockServer.from_config(
+        config, host=args.host, port=args.port, latency=latency, error_rate=args.error_rate,
+        payload_bytes=args.payload_bytes, seed=args.seed
+    )
+    server.start()
+    print(f"Mock server listening on {server.url} with {len(server.routes)} routes")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
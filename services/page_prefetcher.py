@@ -0,0 +1,125 @@
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from services import data_events
+
+# fetch_page(conn, page, page_size) -> page data as the view wants to render it
+PageFetcher = Callable[[sqlite3.Connection, int, int], Any]
+
+
+class PagePrefetcher:
+    """Small bounded cache of result pages, filled ahead of time by a worker thread.
+
+    The view loads the page it shows through load() and then asks for the
+    neighbouring pages with prefetch(). Those are fetched on a background
+    connection, so moving to the next or previous page is served from memory.
+    Publishing a change on the data topic drops every cached page; results
+    of fetches that were already running at that point are discarded.
+    """
+
+    def __init__(self, db_path: str, fetch_page: PageFetcher,
+                 topic: Optional[str] = None, max_pages: int = 5) -> None:
+        self.db_path = db_path
+        self.fetch_page = fetch_page
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[Tuple[int, int], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._queue: "queue.Queue[Optional[Tuple[int, int, int]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._unsubscribe = data_events.subscribe(topic, self._on_data_changed) if topic else None
+
+    def get(self, page: int, page_size: int) -> Optional[Any]:
+        """Get a cached page, or None if it is not in memory"""
+        with self._lock:
+            key = (page, page_size)
+            if key not in self._pages:
+                return None
+            self._pages.move_to_end(key)
+            return self._pages[key]
+
+    def load(self, page: int, page_size: int, conn: Optional[sqlite3.Connection] = None) -> Any:
+        """Get a page from memory, fetching it on the calling thread if needed"""
+        cached = self.get(page, page_size)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            generation = self._generation
+        own_conn = conn is None
+        if own_conn:
+            conn = sqlite3.connect(self.db_path)
+        try:
+            data = self.fetch_page(conn, page, page_size)
+        finally:
+            if own_conn:
+                conn.close()
+        self._store(generation, page, page_size, data)
+        return data
+
+    def prefetch(self, pages: Iterable[int], page_size: int) -> None:
+        """Queue pages for fetching in the background"""
+        with self._lock:
+            generation = self._generation
+            wanted = [p for p in pages if (p, page_size) not in self._pages]
+        if not wanted:
+            return
+        self._ensure_worker()
+        for page in wanted:
+            self._queue.put((generation, page, page_size))
+
+    def invalidate(self) -> None:
+        """Drop every cached page and ignore fetches still in flight"""
+        with self._lock:
+            self._generation += 1
+            self._pages.clear()
+
+    def close(self) -> None:
+        """Stop the worker thread and the change subscription"""
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._worker:
+            self._queue.put(None)
+            self._worker = None
+
+    def _on_data_changed(self, topic: str, version: int) -> None:
+        self.invalidate()
+
+    def _store(self, generation: int, page: int, page_size: int, data: Any) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._pages[(page, page_size)] = data
+            self._pages.move_to_end((page, page_size))
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="page-prefetch", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        # sqlite connections can't be shared across threads, so the worker has its own
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                generation, page, page_size = item
+                with self._lock:
+                    if generation != self._generation or (page, page_size) in self._pages:
+                        continue
+                try:
+                    data = self.fetch_page(conn, page, page_size)
+                except Exception as e:
+                    print(f"Error prefetching page {page}: {e}")
+                    continue
+                self._store(generation, page, page_size, data)
+        finally:
+            conn.close()
@@ -0,0 +1,80 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from services import data_events
+
+
+class QueryCache:
+    """Read-through cache for the read queries of one data topic.
+
+    Results are keyed by the SQL text and its parameters and remember the
+    topic version they were read at. Every write publishes a new version
+    through data_events, after which older results are simply not returned
+    anymore, so identical queries repeated between two writes hit memory.
+    """
+
+    def __init__(self, topic: str, max_entries: int = 256) -> None:
+        self.topic = topic
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetchall(self, conn: sqlite3.Connection, sql: str, params: Sequence[Any] = (),
+                 model: Optional[type] = None, db_path: Optional[str] = None) -> list:
+        """Get all result rows, as model instances when a model class is given"""
+        def load():
+            if model is not None:
+                return model.query(conn, sql, params, db_path=db_path)
+            return conn.execute(sql, params).fetchall()
+        return self._get_or_load(("all", model, sql, tuple(params)), load)
+
+    def fetchone(self, conn: sqlite3.Connection, sql: str, params: Sequence[Any] = (),
+                 model: Optional[type] = None, db_path: Optional[str] = None) -> Any:
+        """Get the first result row, as a model instance when a model class is given"""
+        def load():
+            if model is not None:
+                return model.query_one(conn, sql, params, db_path=db_path)
+            return conn.execute(sql, params).fetchone()
+        return self._get_or_load(("one", model, sql, tuple(params)), load)
+
+    def scalar(self, conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> Any:
+        """Get the first column of the first result row"""
+        def load():
+            row = conn.execute(sql, params).fetchone()
+            return row[0] if row else None
+        return self._get_or_load(("scalar", None, sql, tuple(params)), load)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _get_or_load(self, key: Tuple, load: Callable[[], Any]) -> Any:
+        # Read the version before querying so a write racing the query makes the result stale
+        version = data_events.get_version(self.topic)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        result = load()
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+
+_caches: Dict[str, QueryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_query_cache(topic: str) -> QueryCache:
+    """Get the cache shared by every reader of topic"""
+    with _caches_lock:
+        if topic not in _caches:
+            _caches[topic] = QueryCache(topic)
+        return _caches[topic]
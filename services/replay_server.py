@@ -0,0 +1,163 @@
+"""Replay server: answers with the responses recorded in saved API test cases.
+
+Start it from the API Test view or with
+
+    python -m services.replay_server --db db_apitestcase.db --port 7300
+
+While it runs from the view, Run All and load tests are sent to it instead
+of the host stored in each test case, so suites can run against a recording
+rather than the shared staging host.
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from config.app_config import AppConfig
+from services import data_events
+from services.blob_store import BlobStore
+from services.mock_server import StubResponse, StubServer
+
+# Recorded headers that describe the original transfer rather than the payload
+_SKIPPED_HEADERS = {"content-length", "transfer-encoding", "content-encoding", "connection", "keep-alive", "date"}
+
+
+def body_hash(body: Any) -> Optional[str]:
+    """Hash a request body so equal JSON matches regardless of key order and spacing"""
+    if body is None or body == "" or body == b"":
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return hashlib.sha1(body.strip().encode()).hexdigest()
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def _route_path(url: str) -> str:
+    return urlsplit(url or "").path.rstrip("/") or "/"
+
+
+class ReplayServer(StubServer):
+    """Serves recorded responses from an index on (method, path) and request body hash.
+
+    A request whose body matches a recording of the same route gets that
+    response; otherwise the route's most recent recording is used, unless
+    match_body is set, in which case it is a 404. Responses are encoded once
+    when the recordings are loaded. With a topic, the index is rebuilt
+    whenever that data_events topic reports a change.
+    """
+
+    def __init__(self, db_path: str, blob_store: BlobStore, host: str = "127.0.0.1", port: int = 0,
+                 match_body: bool = False, topic: Optional[str] = None) -> None:
+        super().__init__(host, port)
+        self.db_path = db_path
+        self.blob_store = blob_store
+        self.match_body = match_body
+        self.misses = 0
+        # (method, path) -> {body hash or None: response}, the None entry being the latest recording
+        self.routes: Dict[Tuple[str, str], Dict[Optional[str], StubResponse]] = {}
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self.reload()
+        if topic:
+            self._unsubscribe = data_events.subscribe(topic, lambda topic, version: self.reload())
+
+    def reload(self) -> int:
+        """Rebuild the route index from the database; returns the number of recordings"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT method, url, body, response_status, response_headers, response_body, response_hash, response_blob "
+                "FROM test_cases WHERE response_body IS NOT NULL ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        routes: Dict[Tuple[str, str], Dict[Optional[str], StubResponse]] = {}
+        for method, url, body, status, response_headers, response_body, response_hash, response_blob in rows:
+            if response_hash:
+                try:
+                    response_body = self.blob_store.get(response_hash, response_blob)
+                except (OSError, ValueError, RuntimeError) as e:
+                    print(f"Replay server: skipping recording of {method} {url}: {e}")
+                    continue
+            response = self._encode(status, response_headers, response_body)
+            entries = routes.setdefault(((method or "GET").upper(), _route_path(url)), {})
+            entries[body_hash(body)] = response
+            # Later recordings win as the route's fallback
+            entries[None] = response
+        # Swapping the whole dict keeps lookups lock-free while serving
+        self.routes = routes
+        return len(rows)
+
+    @staticmethod
+    def _encode(status: Optional[int], response_headers: Optional[str], response_body: Optional[str]) -> StubResponse:
+        try:
+            headers = json.loads(response_headers) if response_headers else {}
+        except ValueError:
+            headers = {}
+        if not isinstance(headers, dict):
+            headers = {}
+        headers = {str(k): str(v) for k, v in headers.items() if str(k).lower() not in _SKIPPED_HEADERS}
+        headers.setdefault("Content-Type", "application/json")
+        # Rows saved before the status code was kept are replayed as 200
+        return status or 200, headers, (response_body or "").encode(), 0.0
+
+    def respond(self, method: str, path: str, body: bytes) -> StubResponse:
+        with self._lock:
+            self.requests += 1
+        entries = self.routes.get((method, _route_path(path)))
+        if entries:
+            response = entries.get(body_hash(body)) if body else None
+            if response is None and not (self.match_body and body):
+                response = entries[None]
+            if response is not None:
+                return response
+        with self._lock:
+            self.misses += 1
+        return self.not_found(method, path)
+
+    def rebase(self, url: str) -> str:
+        """Point url at this server, keeping its path and query"""
+        parts = urlsplit(url)
+        return urlunsplit(("http", f"{self.host}:{self.port}", parts.path, parts.query, ""))
+
+    def stop(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        super().stop()
+
+
+def main() -> None:
+    config = AppConfig.API_TEST_CONFIG["replay_server"]
+    parser = argparse.ArgumentParser(description="Serve the responses recorded in saved API test cases")
+    parser.add_argument("--db", default=AppConfig.DB_PATHS["api_test"])
+    parser.add_argument("--host", default=config["host"])
+    parser.add_argument("--port", type=int, default=config["port"])
+    parser.add_argument("--match-body", action="store_true", default=config["match_body"],
+                        help="answer 404 instead of the latest recording when no request body matches")
+    args = parser.parse_args()
+
+    blob_config = AppConfig.API_TEST_CONFIG["blob_store"]
+    blob_store = BlobStore(blob_config["directory"], blob_config["threshold"], blob_config["level"])
+    server = ReplayServer(args.db, blob_store, args.host, args.port, args.match_body)
+    server.start()
+    print(f"Replay server listening on {server.url} with {len(server.routes)} routes")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
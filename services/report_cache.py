@@ -0,0 +1,69 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class ReportCache:
+    """Remembers which data version each generated report was built from.
+
+    The manifest lives next to the reports so a report whose data version
+    still matches can be handed back instead of being rebuilt, and the last
+    version covered by a report serves as the watermark for delta reports.
+    """
+
+    MANIFEST_NAME = "report_manifest.json"
+
+    def __init__(self, report_dir: str) -> None:
+        self.path = os.path.join(report_dir, self.MANIFEST_NAME)
+        self.manifest = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get_cached(self, kind: str, data_version: int, delta: bool = False) -> Optional[str]:
+        """Get the path of a report that is still current for data_version.
+
+        A full report is reusable when it was built from the same version.
+        A delta report has nothing new to show when no change happened since
+        the last report of this kind, so that last report is returned.
+        """
+        entry = self.manifest.get(kind, {})
+        candidate = entry.get("last") if delta else entry.get("full")
+        if not candidate or candidate.get("data_version") != data_version:
+            return None
+        if not os.path.exists(candidate.get("path", "")):
+            return None
+        return candidate["path"]
+
+    def get_watermark(self, kind: str) -> int:
+        """Get the data version covered by the previous report of this kind"""
+        return self.manifest.get(kind, {}).get("last", {}).get("data_version", 0)
+
+    def record(self, kind: str, data_version: int, path: str,
+               delta: bool = False, watermark: int = 0) -> None:
+        """Store the data version a freshly generated report was built from"""
+        entry = self.manifest.setdefault(kind, {})
+        record = {
+            "data_version": data_version,
+            "path": path,
+            "generated_on": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        if delta:
+            record["watermark"] = watermark
+        entry["delta" if delta else "full"] = record
+        entry["last"] = record
+        try:
+            self._save()
+        except OSError as e:
+            print(f"Error saving report manifest: {e}")
@@ -0,0 +1,347 @@
+import base64
+import dataclasses
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import requests
+
+from services.assertions import compiled_assertions
+from services.execution_policy import CircuitBreakerRegistry, Deadline, ExecutionPolicy
+from services.http_sessions import SessionPool
+from services.request_timing import RequestTimings, TimingRecorder
+
+# Size of the pieces the response body is read in; cancellation is checked between them
+_CHUNK_SIZE = 64 * 1024
+
+
+def auth_headers(auth_type: str, auth_value: str) -> Dict[str, str]:
+    """Get the Authorization header for an auth type as chosen in the UI"""
+    if auth_type == "Basic Auth" and auth_value:
+        return {'Authorization': f'Basic {base64.b64encode(auth_value.encode()).decode()}'}
+    if auth_type == "Bearer Token" and auth_value:
+        return {'Authorization': f'Bearer {auth_value}'}
+    return {}
+
+
+@dataclass(slots=True)
+class RequestSpec:
+    """Everything needed to send one HTTP request, detached from the UI"""
+    method: str
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Union[Dict[str, Any], str, None] = None
+    verify: bool = True
+    policy: ExecutionPolicy = field(default_factory=ExecutionPolicy)
+    # False sends "Connection: close" so the connection isn't kept in the pool
+    keep_alive: bool = True
+    # Checks of the response, see services.assertions.compile_assertions
+    assertions: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_test_case(cls, test_case: Any, policy_defaults: Optional[Dict[str, Any]] = None) -> "RequestSpec":
+        """Build the request a stored API test case describes, the same way the form does"""
+        headers = {**auth_headers(test_case.auth_type, test_case.auth_value), 'Content-Type': 'application/json'}
+        try:
+            custom_headers = json.loads(test_case.headers or "{}")
+            if isinstance(custom_headers, dict):
+                headers.update(custom_headers)
+        except ValueError:
+            pass
+
+        body = None
+        if test_case.method in ("POST", "PUT") and test_case.body:
+            try:
+                body = json.loads(test_case.body)
+            except ValueError:
+                body = test_case.body
+
+        config = test_case.config or {}
+        return cls(
+            method=test_case.method,
+            url=test_case.url,
+            headers=headers,
+            body=body,
+            verify=config.get("verify_ssl", True),
+            policy=ExecutionPolicy.from_config(config, policy_defaults),
+            keep_alive=config.get("keep_alive", True),
+            assertions=config.get("assertions") or []
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serializable form, e.g. to hand the request to a load agent"""
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RequestSpec":
+        values = dict(data)
+        policy = dict(values.pop("policy", None) or {})
+        if "retry_statuses" in policy:
+            policy["retry_statuses"] = tuple(policy["retry_statuses"])
+        return cls(policy=ExecutionPolicy(**policy), **values)
+
+
+@dataclass(slots=True)
+class RequestResult:
+    """Outcome of a request as handed back to the UI"""
+    spec: RequestSpec
+    status_code: int = 0
+    headers: Dict[str, str] = field(default_factory=dict)
+    body_text: str = ""
+    # Pretty printed JSON when the body parses, otherwise the raw text
+    formatted_body: str = ""
+    json_body: Any = None
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+    cancelled: bool = False
+    # Number of times the request was actually sent, retries included
+    attempts: int = 0
+    # Phase breakdown of the last attempt
+    timings: Optional[RequestTimings] = None
+    # Size of the raw body, and the file it was streamed to when large
+    body_size: int = 0
+    body_path: Optional[str] = None
+    # Number of assertions evaluated, and (description, message) of those that failed
+    assertions_checked: int = 0
+    assertion_failures: List[Tuple[str, str]] = field(default_factory=list)
+    # Set when a status assertion decides which status codes are acceptable instead of 2xx
+    status_asserted: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return (self.error is None and not self.cancelled
+                and (self.status_asserted or 200 <= self.status_code < 300)
+                and not self.assertion_failures)
+
+    @property
+    def failure(self) -> str:
+        """Why the request did not pass: the error, the failed assertions or the status"""
+        if self.error is not None:
+            return self.error
+        if self.assertion_failures:
+            return "; ".join(message for _, message in self.assertion_failures)
+        return f"HTTP {self.status_code}"
+
+
+class RequestTicket:
+    """Handle to a submitted request that can be cancelled from the UI thread"""
+
+    def __init__(self, ticket_id: int, spec: RequestSpec, deadline: Optional[Deadline] = None) -> None:
+        self.id = ticket_id
+        self.spec = spec
+        self.deadline = deadline
+        self._cancelled = threading.Event()
+        self._response: Optional[requests.Response] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Stop waiting for the request and drop its result.
+
+        A body download stops at the next chunk. A request still waiting for
+        its response headers can't be interrupted, so that worker runs until
+        the timeout, but its result is discarded and the UI moves on at once.
+        """
+        self._cancelled.set()
+        with self._lock:
+            response = self._response
+        if response is not None:
+            response.close()
+
+    def wait_cancelled(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, returning early (True) when cancelled"""
+        return self._cancelled.wait(timeout)
+
+    def _attach(self, response: requests.Response) -> None:
+        with self._lock:
+            self._response = response
+        if self.cancelled:
+            response.close()
+
+
+class RequestEngine:
+    """Runs HTTP requests on a pool of worker threads.
+
+    submit() returns immediately; on_done(ticket, result) is called on the
+    worker thread, so UI code should pass it through a UiQueue. With a
+    spool_dir, raw bodies larger than spool_threshold bytes are also streamed
+    to a file there as they download; the newest spool_keep files are kept.
+    """
+
+    def __init__(self, max_workers: int = 4, session_pool: Optional[SessionPool] = None,
+                 breakers: Optional[CircuitBreakerRegistry] = None, spool_dir: Optional[str] = None,
+                 spool_threshold: int = 1024 * 1024, spool_keep: int = 20) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-request")
+        self._ids = itertools.count(1)
+        self.session_pool = session_pool or SessionPool()
+        self.breakers = breakers or CircuitBreakerRegistry()
+        self.spool_dir = spool_dir
+        self.spool_threshold = spool_threshold
+        self.spool_keep = spool_keep
+
+    def submit(self, spec: RequestSpec, on_done: Callable[[RequestTicket, RequestResult], None],
+               deadline: Optional[Deadline] = None) -> RequestTicket:
+        ticket = RequestTicket(next(self._ids), spec, deadline)
+        self._executor.submit(self._run, ticket, on_done)
+        return ticket
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session_pool.close()
+
+    def execute(self, ticket: RequestTicket) -> RequestResult:
+        """Send the request of ticket on the calling thread, applying its policy.
+
+        Failed attempts (connection errors, timeouts and the policy's retry
+        statuses) of idempotent requests are retried with backoff while the
+        ticket's deadline allows. Every attempt is reported to the host's
+        circuit breaker, and an open circuit fails the request without sending.
+        """
+        spec = ticket.spec
+        policy = spec.policy
+        host = SessionPool.host_key(spec.url)
+        breaker = self.breakers.get(host)
+        attempts = 0
+        while True:
+            if ticket.deadline is not None and ticket.deadline.expired:
+                result = RequestResult(spec=spec, error="Suite deadline exceeded, request not sent")
+                break
+            if not breaker.allow():
+                result = RequestResult(spec=spec, error=f"Circuit open for {host[1]}:{host[2]}, request not sent")
+                break
+
+            attempts += 1
+            result = self._send(ticket, policy.timeouts(ticket.deadline))
+            if result.cancelled:
+                breaker.release()
+                break
+            if result.error is None and result.status_code not in policy.retry_statuses:
+                breaker.record_success()
+                break
+            breaker.record_failure()
+
+            if attempts > policy.retries or not policy.can_retry(spec.method):
+                break
+            delay = policy.backoff(attempts)
+            if ticket.deadline is not None and delay >= ticket.deadline.remaining():
+                break
+            if ticket.wait_cancelled(delay):
+                break
+
+        result.attempts = attempts
+        result.cancelled = ticket.cancelled
+        if spec.assertions and result.error is None and not result.cancelled:
+            self._check_assertions(spec, result)
+        return result
+
+    @staticmethod
+    def _check_assertions(spec: RequestSpec, result: RequestResult) -> None:
+        try:
+            # Compiled on first use and cached for the spec's definitions list
+            assertions = compiled_assertions(spec.assertions)
+        except ValueError as e:
+            result.assertions_checked = 1
+            result.assertion_failures = [("valid assertions", str(e))]
+            return
+        result.assertions_checked = len(assertions.checks)
+        result.status_asserted = assertions.checks_status
+        result.assertion_failures = assertions.evaluate(result)
+
+    def _send(self, ticket: RequestTicket, timeouts: Tuple[float, float]) -> RequestResult:
+        spec = ticket.spec
+        result = RequestResult(spec=spec)
+        headers = dict(spec.headers)
+        if not spec.keep_alive:
+            # Replace whatever Connection header the user typed
+            headers = {k: v for k, v in headers.items() if k.lower() != "connection"}
+            headers["Connection"] = "close"
+
+        start_time = time.perf_counter()
+        recorder = TimingRecorder.begin(start_time)
+        try:
+            with self.session_pool.lease(spec.url) as session:
+                response = session.request(
+                    method=spec.method,
+                    url=spec.url,
+                    headers=headers,
+                    json=spec.body if isinstance(spec.body, dict) else None,
+                    data=spec.body if isinstance(spec.body, str) else None,
+                    verify=spec.verify,
+                    timeout=timeouts,
+                    stream=True
+                )
+                ticket._attach(response)
+                spool = None
+                try:
+                    chunks = []
+                    for chunk in response.iter_content(_CHUNK_SIZE):
+                        if ticket.cancelled:
+                            break
+                        chunks.append(chunk)
+                        result.body_size += len(chunk)
+                        if spool is not None:
+                            spool.write(chunk)
+                        elif self.spool_dir and result.body_size > self.spool_threshold:
+                            spool = self._open_spool()
+                            for earlier in chunks:
+                                spool.write(earlier)
+                finally:
+                    # Fully read responses hand their connection back to the pool here
+                    response.close()
+                    if spool is not None:
+                        spool.close()
+                        if ticket.cancelled:
+                            os.unlink(spool.name)
+                        else:
+                            result.body_path = spool.name
+
+            result.timings = recorder.finish()
+            result.elapsed_ms = result.timings.total_ms
+            result.status_code = response.status_code
+            result.headers = dict(response.headers)
+            result.body_text = b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+            # Formatting large bodies is slow, so it is done here rather than on the UI thread
+            try:
+                result.json_body = json.loads(result.body_text)
+                result.formatted_body = json.dumps(result.json_body, indent=2)
+            except ValueError:
+                result.formatted_body = result.body_text
+        except Exception as e:
+            result.timings = recorder.finish()
+            result.elapsed_ms = result.timings.total_ms
+            result.error = str(e)
+        result.cancelled = ticket.cancelled
+        return result
+
+    def _open_spool(self):
+        """Create the file a large body is streamed to, pruning the oldest ones"""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        try:
+            entries = sorted(
+                (entry for entry in os.scandir(self.spool_dir) if entry.name.startswith("response-")),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            for entry in entries[:max(0, len(entries) - self.spool_keep + 1)]:
+                os.unlink(entry.path)
+        except OSError as e:
+            print(f"Error pruning saved responses: {e}")
+        return tempfile.NamedTemporaryFile(dir=self.spool_dir, prefix="response-", suffix=".bin", delete=False)
+
+    def _run(self, ticket: RequestTicket, on_done: Callable[[RequestTicket, RequestResult], None]) -> None:
+        if ticket.cancelled:
+            on_done(ticket, RequestResult(spec=ticket.spec, cancelled=True))
+            return
+        result = self.execute(ticket)
+        try:
+            on_done(ticket, result)
+        except Exception as e:
+            print(f"Error delivering request result: {e}")
@@ -0,0 +1,193 @@
+import json
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Deque, Dict, List, Optional
+
+LOG_FILE = "requests.jsonl"
+# Fields searched for text, in the log tab and in the log files
+SEARCHED_FIELDS = ("message", "url", "status_code", "response_body")
+
+
+@dataclass(slots=True)
+class LogEntry:
+    """One line of the request log: an exchange with a server or an event"""
+    timestamp: str
+    # "request" for a request/response exchange, "event" for anything else
+    kind: str = "event"
+    message: str = ""
+    method: Optional[str] = None
+    url: Optional[str] = None
+    status_code: Optional[int] = None
+    elapsed_ms: Optional[float] = None
+    request_headers: Dict[str, Any] = field(default_factory=dict)
+    request_body: Any = None
+    response_headers: Dict[str, Any] = field(default_factory=dict)
+    # Bounded preview in memory; the log file gets the whole body
+    response_body: str = ""
+
+    def render(self) -> str:
+        """Format the entry for the log tab"""
+        if self.kind != "request":
+            return f"{self.timestamp} - {self.message}\n"
+        return (
+            f"=== Request [{self.timestamp}] ===\n"
+            f"{self.method} {self.url}\n"
+            f"Headers: {json.dumps(self.request_headers, indent=2)}\n"
+            f"Body: {json.dumps(self.request_body, indent=2) if self.request_body else 'None'}\n\n"
+            f"=== Response ===\n"
+            f"Status: {self.status_code}\n"
+            f"Headers: {json.dumps(self.response_headers, indent=2)}\n"
+            f"Body: {self.response_body}\n"
+            + "=" * 50 + "\n\n"
+        )
+
+    def matches(self, text: str) -> bool:
+        text = text.lower()
+        return any(text in str(getattr(self, name)).lower() for name in SEARCHED_FIELDS)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queues records untouched, so JSON encoding happens on the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record.msg, default=str, ensure_ascii=False)
+
+
+class RequestLog:
+    """Bounded in-memory log of recent entries, with every entry also written to disk.
+
+    The newest capacity entries are kept in a ring buffer for the log tab;
+    version changes on every append so views can skip re-rendering when
+    nothing happened. Complete entries are queued to a background thread that
+    appends them as JSON Lines to directory/requests.jsonl, rotating the file
+    at max_bytes and keeping backups old files.
+    """
+
+    def __init__(self, directory: Optional[str] = "logs", capacity: int = 1000, preview_chars: int = 4000,
+                 max_bytes: int = 10 * 1024 * 1024, backups: int = 5) -> None:
+        self.directory = directory
+        self.preview_chars = preview_chars
+        self.version = 0
+        self._entries: Deque[LogEntry] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._logger: Optional[logging.Logger] = None
+        self._listener: Optional[QueueListener] = None
+        if directory:
+            self._start_writer(max_bytes, backups)
+
+    def _start_writer(self, max_bytes: int, backups: int) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            os.path.join(self.directory, LOG_FILE), maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+        file_handler.setFormatter(_JsonLinesFormatter())
+        records: "queue.Queue[logging.LogRecord]" = queue.Queue()
+        self._listener = QueueListener(records, file_handler)
+        self._listener.start()
+
+        # One logger per log file, kept out of the application's root logging
+        self._logger = logging.getLogger(f"{__name__}.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(_DeferredQueueHandler(records))
+
+    def event(self, message: str) -> LogEntry:
+        """Log a one-line event"""
+        return self._append(LogEntry(timestamp=_now(), message=message), None)
+
+    def exchange(self, method: str, url: str, headers: Dict[str, Any], body: Any, result: Any) -> LogEntry:
+        """Log a request and the RequestResult it produced"""
+        text = result.formatted_body or ""
+        preview = text if len(text) <= self.preview_chars else (
+            f"{text[:self.preview_chars]}\n... ({result.body_size} bytes"
+            + (f", raw body saved to {result.body_path})" if result.body_path else ")")
+        )
+        entry = LogEntry(
+            timestamp=_now(),
+            kind="request",
+            message=result.error or "; ".join(message for _, message in result.assertion_failures),
+            method=method,
+            url=url,
+            status_code=result.status_code,
+            elapsed_ms=round(result.elapsed_ms, 2),
+            request_headers=dict(headers or {}),
+            request_body=body,
+            response_headers=dict(result.headers),
+            response_body=preview
+        )
+        return self._append(entry, result.body_text)
+
+    def entries(self, limit: Optional[int] = None, text: str = "") -> List[LogEntry]:
+        """Get the newest entries first, optionally only those containing text"""
+        with self._lock:
+            entries = list(self._entries)
+        entries.reverse()
+        if text:
+            entries = [entry for entry in entries if entry.matches(text)]
+        return entries[:limit] if limit else entries
+
+    def close(self) -> None:
+        """Flush queued entries to disk and stop the writer thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+    def _append(self, entry: LogEntry, full_body: Optional[str]) -> LogEntry:
+        with self._lock:
+            self._entries.append(entry)
+            self.version += 1
+        if self._logger is not None:
+            record = asdict(entry)
+            if full_body is not None:
+                record["response_body"] = full_body
+            self._logger.info(record)
+        return entry
+
+
+def search_log_files(directory: str, text: str, limit: int = 200) -> List[Dict[str, Any]]:
+    """Find logged entries containing text, newest file first"""
+    paths = [os.path.join(directory, LOG_FILE)]
+    paths += sorted(
+        (os.path.join(directory, name) for name in os.listdir(directory) if name.startswith(LOG_FILE + ".")),
+        key=lambda path: int(path.rsplit(".", 1)[1])
+    ) if os.path.isdir(directory) else []
+
+    needle = text.lower()
+    # Printable ASCII other than quotes and backslashes is written as is, even in files from
+    # before ensure_ascii=False, so lines without it can be skipped without decoding them
+    verbatim = all(" " <= c <= "~" and c not in '"\\' for c in needle)
+    found: List[Dict[str, Any]] = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            lines = [line for line in f if needle in line.lower()] if verbatim else f.readlines()
+        # Newest lines are at the end of each file
+        for line in reversed(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not any(needle in str(record.get(name)).lower() for name in SEARCHED_FIELDS):
+                continue
+            found.append(record)
+            if len(found) >= limit:
+                return found
+    return found
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -0,0 +1,229 @@
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+_local = threading.local()
+
+
+@dataclass(slots=True)
+class RequestTimings:
+    """Where the time of one request went, in milliseconds.
+
+    The phases follow each other in the order of PHASES and add up to
+    total_ms. DNS, connect and TLS are zero when a pooled connection was
+    reused; redirect covers every hop before the final one.
+    """
+
+    PHASES: ClassVar[Tuple[Tuple[str, str], ...]] = (
+        ("redirect_ms", "Redirects"),
+        ("prepare_ms", "Prepare"),
+        ("dns_ms", "DNS"),
+        ("connect_ms", "TCP Connect"),
+        ("tls_ms", "TLS Handshake"),
+        ("send_ms", "Send"),
+        ("wait_ms", "Waiting (TTFB)"),
+        ("download_ms", "Download"),
+    )
+
+    redirect_ms: float = 0.0
+    # Building the request and waiting for a pooled connection
+    prepare_ms: float = 0.0
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    send_ms: float = 0.0
+    # From the request being sent to the response headers arriving
+    wait_ms: float = 0.0
+    download_ms: float = 0.0
+    total_ms: float = 0.0
+    reused_connection: bool = True
+
+    def phases(self) -> List[Tuple[str, float, float]]:
+        """Get (label, start_ms, duration_ms) of every phase that took any time"""
+        phases = []
+        offset = 0.0
+        for name, label in self.PHASES:
+            duration = getattr(self, name)
+            if duration > 0:
+                phases.append((label, offset, duration))
+                offset += duration
+        return phases
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RequestTimings":
+        timings = cls()
+        for name, value in (data or {}).items():
+            if name in cls.__dataclass_fields__:
+                setattr(timings, name, value)
+        return timings
+
+
+class TimingRecorder:
+    """Collects the phase timestamps of the request running on this thread.
+
+    begin() installs a recorder for the current thread; the connection
+    classes below report into it while requests sends the request, and
+    finish() turns what was collected into RequestTimings.
+    """
+
+    __slots__ = ("start", "hop_start", "dns", "connect", "tls", "connected_at",
+                 "request_start", "sent", "first_byte", "reused")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.hop_start = start
+        self.dns = self.connect = self.tls = 0.0
+        self.connected_at: Optional[float] = None
+        self.request_start: Optional[float] = None
+        self.sent: Optional[float] = None
+        self.first_byte: Optional[float] = None
+        self.reused = True
+
+    @classmethod
+    def begin(cls, start: Optional[float] = None) -> "TimingRecorder":
+        recorder = cls(start if start is not None else time.perf_counter())
+        _local.recorder = recorder
+        return recorder
+
+    @staticmethod
+    def current() -> Optional["TimingRecorder"]:
+        return getattr(_local, "recorder", None)
+
+    def new_hop(self, now: float) -> None:
+        """Start over for the next request of a redirect chain"""
+        self.hop_start = now
+        self.dns = self.connect = self.tls = 0.0
+        self.connected_at = self.sent = self.first_byte = None
+        self.reused = True
+
+    def finish(self, end: Optional[float] = None) -> RequestTimings:
+        """Compute the phases up to end (the body fully read) and detach from the thread"""
+        if getattr(_local, "recorder", None) is self:
+            _local.recorder = None
+        end = end if end is not None else time.perf_counter()
+        timings = RequestTimings(
+            redirect_ms=(self.hop_start - self.start) * 1000,
+            dns_ms=self.dns * 1000,
+            connect_ms=self.connect * 1000,
+            tls_ms=self.tls * 1000,
+            total_ms=(end - self.start) * 1000,
+            reused_connection=self.reused
+        )
+        connecting = timings.dns_ms + timings.connect_ms + timings.tls_ms
+        if self.sent is None:
+            # Failed before the request went out
+            timings.prepare_ms = max(0.0, (end - self.hop_start) * 1000 - connecting)
+            return timings
+
+        send_start = max(t for t in (self.request_start, self.connected_at, self.hop_start) if t is not None)
+        timings.send_ms = (self.sent - send_start) * 1000
+        timings.prepare_ms = max(0.0, (self.sent - self.hop_start) * 1000 - connecting - timings.send_ms)
+        if self.first_byte is not None:
+            timings.wait_ms = (self.first_byte - self.sent) * 1000
+            timings.download_ms = (end - self.first_byte) * 1000
+        else:
+            timings.wait_ms = (end - self.sent) * 1000
+        return timings
+
+
+class _TimedConnectionMixin:
+    """Reports DNS, connect and request/response timestamps to the thread's recorder"""
+
+    def _new_conn(self):
+        recorder = TimingRecorder.current()
+        if recorder is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        except OSError:
+            # Let urllib3 resolve again and raise its usual error
+            addresses = []
+        resolved = time.perf_counter()
+        recorder.dns += resolved - start
+        recorder.reused = False
+
+        try:
+            if not addresses:
+                return super()._new_conn()
+            # Connect to the resolved addresses in turn, as urllib3 would
+            for index, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError:
+                    if index == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+            recorder.connected_at = time.perf_counter()
+            recorder.connect += recorder.connected_at - resolved
+
+    def request(self, *args, **kwargs):
+        recorder = TimingRecorder.current()
+        if recorder is not None:
+            now = time.perf_counter()
+            if recorder.first_byte is not None:
+                recorder.new_hop(now)
+            recorder.request_start = now
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        recorder = TimingRecorder.current()
+        if recorder is None:
+            return super().getresponse(*args, **kwargs)
+        recorder.sent = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        recorder.first_byte = time.perf_counter()
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+
+    def connect(self):
+        recorder = TimingRecorder.current()
+        if recorder is None:
+            return super().connect()
+        start = time.perf_counter()
+        before = recorder.dns + recorder.connect
+        super().connect()
+        recorder.connected_at = time.perf_counter()
+        # Whatever connect() spent beyond resolving and the TCP connect is the handshake
+        recorder.tls += max(0.0, recorder.connected_at - start - (recorder.dns + recorder.connect - before))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report per-phase timings"""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
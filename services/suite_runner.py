@@ -0,0 +1,206 @@
+import itertools
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from services.execution_policy import Deadline
+from services.http_sessions import SessionPool
+from services.request_engine import RequestEngine, RequestResult, RequestSpec, RequestTicket
+
+
+@dataclass(slots=True)
+class SuiteCase:
+    """One stored test case queued for a suite run"""
+    record: Any
+    spec: RequestSpec
+    # Cases sharing an order group run one after another in list order
+    order_group: Optional[str] = None
+    # Dataset row the spec was rendered from, for data-driven cases
+    iteration: Optional[int] = None
+    row: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    # Environment the spec was pointed at, for cross-environment comparisons
+    environment: Optional[str] = None
+    host: tuple = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.host = SessionPool.host_key(self.spec.url)
+
+
+@dataclass(slots=True)
+class SuiteSummary:
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    elapsed_s: float = 0.0
+    # Why the cases stopped coming, e.g. an unreadable dataset
+    error: Optional[str] = None
+
+
+class SuiteRunner:
+    """Runs many test cases concurrently without going through the UI.
+
+    At most concurrency requests are in flight overall and at most
+    per_host_limit against any single host. Cases with the same order group
+    form a lane that runs strictly in sequence; every other case is a lane
+    of its own. Cases are taken from the iterable only as slots free up, so
+    a generator over a large dataset is never held in memory as a whole.
+    on_result(case, result) is called from worker threads as each case
+    completes and on_done(summary) once the whole run finished. After a
+    cancel, requests still waiting on a slow server are not waited for:
+    on_done comes first and their results are dropped.
+    """
+
+    def __init__(self, engine: RequestEngine, concurrency: int = 16, per_host_limit: int = 8,
+                 deadline_seconds: Optional[float] = None) -> None:
+        self.engine = engine
+        self.concurrency = max(1, concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self.deadline_seconds = deadline_seconds
+        self._cancelled = threading.Event()
+        self._condition = threading.Condition()
+        self._tickets: Dict[int, RequestTicket] = {}
+        self._ids = itertools.count(1)
+
+    def start(self, cases: Iterable[SuiteCase], on_result: Callable[[SuiteCase, RequestResult], None],
+              on_done: Callable[[SuiteSummary], None]) -> threading.Thread:
+        """Run cases on a background dispatcher thread"""
+        thread = threading.Thread(
+            target=self.run, args=(cases, on_result, on_done), name="suite-runner", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def cancel(self) -> None:
+        """Stop dispatching and cancel the requests in flight"""
+        self._cancelled.set()
+        with self._condition:
+            tickets = list(self._tickets.values())
+            self._condition.notify()
+        for ticket in tickets:
+            ticket.cancel()
+
+    def run(self, cases: Iterable[SuiteCase], on_result: Callable[[SuiteCase, RequestResult], None],
+            on_done: Callable[[SuiteSummary], None]) -> SuiteSummary:
+        start_time = time.perf_counter()
+        deadline = Deadline(self.deadline_seconds)
+        summary = SuiteSummary()
+        pending = iter(cases)
+        exhausted = False
+
+        ready: Deque[Deque[SuiteCase]] = deque()
+        waiting: Dict[tuple, Deque[Deque[SuiteCase]]] = defaultdict(deque)
+        # Cases taken from the iterable but not dispatched yet
+        buffered = 0
+        groups: Dict[str, Deque[SuiteCase]] = {}
+        host_active: Dict[tuple, int] = defaultdict(int)
+        in_flight = 0
+        # Results being handed to on_result, which on_done waits for
+        reporting = 0
+        # Set once the summary is final; later results are dropped
+        closed = False
+        condition = self._condition
+
+        def take_case() -> None:
+            """Move the next case into a lane: grouped cases share one, ungrouped cases get their own"""
+            nonlocal exhausted, buffered
+            try:
+                case = next(pending)
+            except StopIteration:
+                exhausted = True
+                return
+            except Exception as e:
+                # The cases already queued still run
+                summary.error = str(e)
+                exhausted = True
+                return
+            summary.total += 1
+            buffered += 1
+            lane = groups.get(case.order_group) if case.order_group else None
+            if lane:
+                # The group's lane is still queued or running; the case follows its predecessors
+                lane.append(case)
+            else:
+                lane = deque([case])
+                if case.order_group:
+                    groups[case.order_group] = lane
+                ready.append(lane)
+
+        def finished(lane: Deque[SuiteCase], case: SuiteCase, ticket: RequestTicket, result: RequestResult) -> None:
+            nonlocal in_flight, reporting
+            with condition:
+                self._tickets.pop(ticket.id, None)
+                if closed:
+                    return
+                reporting += 1
+            try:
+                on_result(case, result)
+            except Exception as e:
+                print(f"Error handling suite result: {e}")
+
+            with condition:
+                reporting -= 1
+                if result.cancelled:
+                    summary.cancelled += 1
+                elif result.ok:
+                    summary.passed += 1
+                else:
+                    summary.failed += 1
+                in_flight -= 1
+                host_active[case.host] -= 1
+                lane.popleft()
+                if lane:
+                    ready.append(lane)
+                # A slot for this host opened up, so one lane waiting on it can go
+                if waiting[case.host]:
+                    ready.append(waiting[case.host].popleft())
+                condition.notify()
+
+        def execute(lane: Deque[SuiteCase], case: SuiteCase, ticket: RequestTicket) -> None:
+            try:
+                result = self.engine.execute(ticket)
+            except Exception as e:
+                result = RequestResult(spec=case.spec, error=str(e))
+            finished(lane, case, ticket, result)
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="suite-request")
+        with condition:
+            while not self._cancelled.is_set():
+                while in_flight < self.concurrency:
+                    # Read ahead at most concurrency cases beyond those in flight
+                    while not ready and not exhausted and buffered < self.concurrency:
+                        take_case()
+                    if not ready:
+                        break
+                    lane = ready.popleft()
+                    case = lane[0]
+                    if host_active[case.host] >= self.per_host_limit:
+                        waiting[case.host].append(lane)
+                        continue
+                    ticket = RequestTicket(next(self._ids), case.spec, deadline)
+                    self._tickets[ticket.id] = ticket
+                    in_flight += 1
+                    buffered -= 1
+                    host_active[case.host] += 1
+                    executor.submit(execute, lane, case, ticket)
+                if in_flight == 0 and not ready and exhausted:
+                    break
+                condition.wait()
+
+            # Let the results already being handed over finish before the summary is final
+            while reporting:
+                condition.wait()
+            closed = True
+            # Cases dispatched or queued but unfinished when the run was cancelled
+            summary.cancelled = summary.total - summary.passed - summary.failed
+        # Cancelled requests waiting on a slow server are left to time out on their own
+        executor.shutdown(wait=not self._cancelled.is_set())
+        summary.elapsed_s = time.perf_counter() - start_time
+        try:
+            on_done(summary)
+        except Exception as e:
+            print(f"Error finishing suite run: {e}")
+        return summary
@@ -0,0 +1,47 @@
+import queue
+from typing import Any, Callable, Optional
+
+
+class UiQueue:
+    """Hands callbacks from worker threads over to the Tk main loop.
+
+    Tk widgets may only be touched from the thread running mainloop, so
+    workers post() their callbacks here and the queue is drained on that
+    thread through widget.after().
+    """
+
+    def __init__(self, widget, interval_ms: int = 50, max_batch: int = 100) -> None:
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._after_id: Optional[str] = None
+
+    def post(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Run callback(*args) on the UI thread; safe to call from any thread"""
+        self._queue.put((callback, args))
+
+    def start(self) -> None:
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._drain)
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _drain(self) -> None:
+        # Bounded batches keep the UI responsive when workers post in bursts
+        for _ in range(self.max_batch):
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in UI callback: {e}")
+        self._after_id = self.widget.after(self.interval_ms, self._drain)
@@ -0,0 +1,305 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from services.datasets import RequestTemplate
+from services.execution_policy import Deadline, ExecutionPolicy
+from services.json_path import JsonPath
+from services.request_engine import RequestEngine, RequestResult, RequestSpec, RequestTicket
+
+
+@dataclass(slots=True)
+class WorkflowStep:
+    """One request of a workflow, run once all the steps it depends on passed"""
+    name: str
+    template: RequestTemplate
+    depends_on: Tuple[str, ...] = ()
+    # Variable name -> JSON path into the response body
+    extract: Dict[str, JsonPath] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class StepOutcome:
+    step: str
+    # passed, failed, skipped or cancelled
+    status: str
+    result: Optional[RequestResult] = None
+    variables: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class WorkflowSummary:
+    name: str
+    outcomes: Dict[str, StepOutcome] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        return bool(self.outcomes) and all(outcome.status == "passed" for outcome in self.outcomes.values())
+
+
+class Workflow:
+    """Requests declared as a dependency graph, passing values from responses to later requests.
+
+    Built from a definition such as
+
+        {"name": "Transfer",
+         "variables": {"accountNumber": "1234567890"},
+         "steps": [
+            {"name": "details", "method": "POST", "url": "...", "body": {...},
+             "extract": {"accountName": "$.accountName"}},
+            {"name": "transfer", "depends_on": ["details"], "test_case": 12,
+             "extract": {"referenceNumber": "$.referenceNumber"}}]}
+
+    A step is either written out (method, url, headers, body) or refers to
+    a saved test case by id. {{name}} placeholders in a step are filled from
+    the workflow variables and the values extracted by the steps it depends
+    on, directly or through other steps; "details.accountName" names the
+    value of one step explicitly.
+    """
+
+    def __init__(self, name: str, steps: List[WorkflowStep], variables: Optional[Dict[str, Any]] = None) -> None:
+        self.name = name
+        self.steps = {step.name: step for step in steps}
+        if len(self.steps) != len(steps):
+            raise ValueError(f"Workflow '{name}' has more than one step with the same name")
+        self.variables = dict(variables or {})
+        self.order = self._topological_order(steps)
+        # Every step each step depends on, directly or not
+        self.ancestors: Dict[str, Set[str]] = {}
+        for step_name in self.order:
+            ancestors: Set[str] = set()
+            for dependency in self.steps[step_name].depends_on:
+                ancestors |= {dependency} | self.ancestors[dependency]
+            self.ancestors[step_name] = ancestors
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], load_test_case: Optional[Callable[[int], Any]] = None,
+                  policy_defaults: Optional[Dict[str, Any]] = None) -> "Workflow":
+        steps = []
+        for index, step in enumerate(data.get("steps") or [], 1):
+            name = str(step.get("name") or f"step{index}")
+            if step.get("test_case") is not None:
+                if load_test_case is None:
+                    raise ValueError(f"Step '{name}' refers to a test case but none can be loaded")
+                test_case = load_test_case(int(step["test_case"]))
+                if test_case is None:
+                    raise ValueError(f"Step '{name}' refers to test case {step['test_case']}, which does not exist")
+                spec = RequestSpec.from_test_case(test_case, policy_defaults)
+            else:
+                if not step.get("url"):
+                    raise ValueError(f"Step '{name}' needs a url or a test_case")
+                spec = RequestSpec(
+                    method=str(step.get("method") or "GET").upper(),
+                    url=step["url"],
+                    headers={"Content-Type": "application/json", **(step.get("headers") or {})},
+                    body=step.get("body"),
+                    policy=ExecutionPolicy.from_config(step.get("policy") or {}, policy_defaults)
+                )
+            steps.append(WorkflowStep(
+                name=name,
+                template=RequestTemplate(spec),
+                depends_on=tuple(str(d) for d in step.get("depends_on") or ()),
+                extract={str(k): JsonPath(str(v)) for k, v in (step.get("extract") or {}).items()}
+            ))
+        if not steps:
+            raise ValueError("Workflow has no steps")
+        return cls(str(data.get("name") or "Workflow"), steps, data.get("variables"))
+
+    @staticmethod
+    def _topological_order(steps: List[WorkflowStep]) -> List[str]:
+        names = {step.name for step in steps}
+        remaining: Dict[str, Set[str]] = {}
+        for step in steps:
+            unknown = [d for d in step.depends_on if d not in names]
+            if unknown:
+                raise ValueError(f"Step '{step.name}' depends on unknown step {', '.join(unknown)}")
+            remaining[step.name] = set(step.depends_on)
+
+        order: List[str] = []
+        ready = [step.name for step in steps if not remaining[step.name]]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for other, dependencies in remaining.items():
+                if name in dependencies:
+                    dependencies.discard(name)
+                    if not dependencies:
+                        ready.append(other)
+        if len(order) != len(steps):
+            cycle = sorted(name for name, dependencies in remaining.items() if dependencies)
+            raise ValueError(f"Workflow steps depend on each other in a cycle: {', '.join(cycle)}")
+        return order
+
+    def scope(self, step_name: str, extracted: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Variables visible to a step: the workflow's, then those of its ancestors in run order"""
+        scope = dict(self.variables)
+        for ancestor in self.order:
+            if ancestor in self.ancestors[step_name] and ancestor in extracted:
+                for name, value in extracted[ancestor].items():
+                    scope[name] = value
+                    scope[f"{ancestor}.{name}"] = value
+        return scope
+
+
+class WorkflowRunner:
+    """Runs the steps of a workflow as soon as their dependencies passed.
+
+    Independent branches run concurrently, at most concurrency requests at
+    a time. Extracted values are passed between steps here, off the UI
+    thread; a step whose dependency failed is skipped. route(spec), when
+    given, adjusts every rendered request, e.g. to send it to the replay
+    server. on_step(outcome) is called from worker threads as steps finish
+    and on_done(summary) once the workflow is over; a step still waiting on
+    the server when the workflow is cancelled is reported as cancelled
+    rather than when it finally returns.
+    """
+
+    def __init__(self, engine: RequestEngine, concurrency: int = 8, deadline_seconds: Optional[float] = None,
+                 route: Optional[Callable[[RequestSpec], RequestSpec]] = None) -> None:
+        self.engine = engine
+        self.concurrency = max(1, concurrency)
+        self.deadline_seconds = deadline_seconds
+        self.route = route
+        self._cancelled = threading.Event()
+        self._condition = threading.Condition()
+        self._tickets: Dict[int, RequestTicket] = {}
+        self._ids = itertools.count(1)
+
+    def start(self, workflow: Workflow, on_step: Callable[[StepOutcome], None],
+              on_done: Callable[[WorkflowSummary], None]) -> threading.Thread:
+        """Run the workflow on a background thread"""
+        thread = threading.Thread(
+            target=self.run, args=(workflow, on_step, on_done), name="workflow-runner", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def cancel(self) -> None:
+        """Stop starting steps and cancel the requests in flight"""
+        self._cancelled.set()
+        with self._condition:
+            tickets = list(self._tickets.values())
+            self._condition.notify()
+        for ticket in tickets:
+            ticket.cancel()
+
+    def run(self, workflow: Workflow, on_step: Callable[[StepOutcome], None],
+            on_done: Callable[[WorkflowSummary], None]) -> WorkflowSummary:
+        start_time = time.perf_counter()
+        deadline = Deadline(self.deadline_seconds)
+        summary = WorkflowSummary(workflow.name)
+        extracted: Dict[str, Dict[str, Any]] = {}
+        pending = list(workflow.order)
+        in_flight = 0
+        # Outcomes being handed to on_step, which on_done waits for
+        reporting = 0
+        # Set once the summary is final; later outcomes are dropped
+        closed = False
+        condition = self._condition
+
+        def report(outcome: StepOutcome) -> None:
+            try:
+                on_step(outcome)
+            except Exception as e:
+                print(f"Error handling workflow step: {e}")
+
+        def execute(step: WorkflowStep, ticket: Optional[RequestTicket], error: Optional[str]) -> None:
+            nonlocal in_flight, reporting
+            outcome = StepOutcome(step.name, "failed", error=error)
+            if ticket is not None:
+                try:
+                    outcome.result = self.engine.execute(ticket)
+                except Exception as e:
+                    outcome.result = RequestResult(spec=ticket.spec, error=str(e))
+                outcome = self._check(step, outcome)
+            with condition:
+                self._tickets.pop(ticket.id if ticket else 0, None)
+                if closed:
+                    return
+                reporting += 1
+            # Reported before dependent steps can start, so outcomes arrive in dependency order
+            report(outcome)
+            with condition:
+                reporting -= 1
+                summary.outcomes[step.name] = outcome
+                if outcome.status == "passed":
+                    extracted[step.name] = outcome.variables
+                in_flight -= 1
+                condition.notify()
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="workflow-step")
+        with condition:
+            while not self._cancelled.is_set():
+                for name in list(pending):
+                    if in_flight >= self.concurrency:
+                        break
+                    step = workflow.steps[name]
+                    dependencies = [summary.outcomes.get(d) for d in step.depends_on]
+                    if any(outcome is None for outcome in dependencies):
+                        continue
+                    pending.remove(name)
+                    failed = [outcome.step for outcome in dependencies if outcome.status != "passed"]
+                    if failed:
+                        summary.outcomes[name] = StepOutcome(name, "skipped", error=f"{', '.join(failed)} did not pass")
+                        condition.release()
+                        try:
+                            report(summary.outcomes[name])
+                        finally:
+                            condition.acquire()
+                        continue
+
+                    # Rendering happens here, with the values its ancestors extracted
+                    ticket, error = None, None
+                    try:
+                        spec = step.template.render(workflow.scope(name, extracted))
+                        if self.route is not None:
+                            spec = self.route(spec)
+                        ticket = RequestTicket(next(self._ids), spec, deadline)
+                        self._tickets[ticket.id] = ticket
+                    except Exception as e:
+                        error = f"Cannot build request: {e}"
+                    in_flight += 1
+                    executor.submit(execute, step, ticket, error)
+                if in_flight == 0 and not pending:
+                    break
+                condition.wait()
+
+            # Let the outcomes already being handed over finish before the summary is final
+            while reporting:
+                condition.wait()
+            closed = True
+            # Steps never started, or still in flight, when the run was cancelled
+            unfinished = [name for name in workflow.order if name not in summary.outcomes]
+        for name in unfinished:
+            summary.outcomes[name] = StepOutcome(name, "cancelled")
+            report(summary.outcomes[name])
+        executor.shutdown(wait=not self._cancelled.is_set())
+        summary.elapsed_s = time.perf_counter() - start_time
+        try:
+            on_done(summary)
+        except Exception as e:
+            print(f"Error finishing workflow: {e}")
+        return summary
+
+    @staticmethod
+    def _check(step: WorkflowStep, outcome: StepOutcome) -> StepOutcome:
+        result = outcome.result
+        if result.cancelled:
+            outcome.status = "cancelled"
+            return outcome
+        if not result.ok:
+            outcome.error = result.failure
+            return outcome
+        for variable, path in step.extract.items():
+            try:
+                outcome.variables[variable] = path.get(result.json_body)
+            except KeyError as e:
+                outcome.error = f"Cannot extract {variable}: {e.args[0]}"
+                return outcome
+        outcome.status = "passed"
+        return outcome
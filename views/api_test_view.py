@@ -1,35 +1,112 @@
 import customtkinter as ctk
+import dataclasses
 import requests
 import json
+from collections import Counter
 from datetime import datetime
+import threading
 import time
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import sqlite3
+from tkinter import filedialog, messagebox
 from config.app_config import AppConfig
+from models import ApiTestCase
+from services import data_events
+from services.assertions import compile_assertions
+from services.request_engine import RequestEngine, RequestSpec, auth_headers
+from services.suite_runner import SuiteCase, SuiteRunner
+from services.workflows import Workflow, WorkflowRunner
+from services.blob_store import BlobStore
+from services.datasets import DatasetSummary, RequestTemplate, check_columns, iter_dataset
+from services.env_compare import EnvironmentComparison
+from services.json_diff import JsonBaseline
+from services.load_agent import RemoteLoadTest
+from services.load_test import LoadProfile, LoadTest
+from services.load_workers import MultiProcessLoadTest
+from services.mock_server import MockServer
+from services.page_prefetcher import PagePrefetcher
+from services.replay_server import ReplayServer
+from services.request_log import RequestLog, search_log_files
+from services.http_sessions import SessionPool
+from services.execution_policy import CircuitBreakerRegistry, ExecutionPolicy
+from services.request_timing import RequestTimings
+from services.ui_queue import UiQueue
+from widgets import ChunkedTextbox, TimingWaterfall
+
+# Columns shown in the Manage tab
+MANAGE_COLUMNS = "id, name, api_name, method, url, status, response_time"
 
 class APITestView(ctk.CTkFrame):
     def __init__(self, master):
         super().__init__(master)
         self.config = AppConfig()
         self.request_logs = []
+        # Requests sent this session, saved test cases per API name, and assertion outcomes
         self.stats = {
-            "success": 0, 
+            "success": 0,
             "failed": 0,
-            "features": {
-                "InquirySaldo": {"total": 0, "passed": 0},
-                "Transfer": {"total": 0, "passed": 0},
-                "Payment": {"total": 0, "passed": 0}
-            }
+            "features": {},
+            "assertions": {"passed": 0, "failed": 0, "checks": 0, "failures": Counter()}
         }
-        self.test_cases = []
+        self.stats_redraw_pending = False
+        # Manage tab shows one page of saved test cases at a time, newest first
+        self.manage_page = 1
+        self.manage_page_size = self.config.API_TEST_CONFIG["manage_list"]["page_size"]
+        self.manage_rows = []
+        self.manage_page_cases = []
+
+        # Requests run on worker threads; results come back through the UI queue
+        self.policy_defaults = self.config.API_TEST_CONFIG["execution_policy"]
+        self.response_view_config = self.config.API_TEST_CONFIG["response_view"]
+        self.request_engine = RequestEngine(
+            session_pool=SessionPool(**self.config.API_TEST_CONFIG["http_pool"]),
+            breakers=CircuitBreakerRegistry(
+                failure_threshold=self.policy_defaults["breaker_failures"],
+                reset_timeout=self.policy_defaults["breaker_reset"]
+            ),
+            spool_dir=self.response_view_config["spool_dir"],
+            spool_threshold=self.response_view_config["spool_threshold"],
+            spool_keep=self.response_view_config["spool_keep"]
+        )
+        self.ui_queue = UiQueue(self)
+        self.ui_queue.start()
+        log_config = self.config.API_TEST_CONFIG["request_log"]
+        self.request_log = RequestLog(
+            log_config["directory"],
+            capacity=log_config["capacity"],
+            preview_chars=self.response_view_config["log_preview_chars"],
+            max_bytes=log_config["max_bytes"],
+            backups=log_config["backups"]
+        )
+        self.rendered_log_version = None
+        self.active_request = None
+        # Phase breakdown of the last response, saved along with a test case
+        self.last_timings = None
+        self.last_result = None
+        # Test case last loaded into the form, and the baseline its responses are compared with
+        self.baseline_config = self.config.API_TEST_CONFIG["baseline"]
+        self.loaded_test_case = None
+        self.active_baseline = None
+        self.suite_runner = None
+        self.dataset_summaries = {}
+        self.suite_baselines = {}
+        self.workflow_runner = None
+        self.comparison = None
+        self.comparison_rows = []
+        self.comparison_reference = None
+        self.load_test = None
+        self.mock_server = None
+        self.replay_server = None
+        
         self.setup_ui()
         self.load_default_values()
         self.setup_request_config()
         self.setup_database()
 
     def setup_database(self):
-        self.conn = sqlite3.connect('db_apitestcase.db')
+        self.db_path = self.config.DB_PATHS["api_test"]
+        self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS test_cases (
@@ -46,55 +123,177 @@ class APITestView(ctk.CTkFrame):
                 response_time TEXT,
                 response_headers TEXT,
                 response_body TEXT,
-                api_name TEXT
+                api_name TEXT,
+                timings TEXT
+            )
+        ''')
+        self.cursor.execute("PRAGMA table_info(test_cases)")
+        columns = [column[1] for column in self.cursor.fetchall()]
+        for column, column_type in (("timings", "TEXT"), ("response_hash", "TEXT"),
+                                    ("response_size", "INTEGER"), ("response_blob", "BLOB"),
+                                    ("baseline_hash", "TEXT"), ("baseline_blob", "BLOB"),
+                                    ("response_status", "INTEGER")):
+            if column not in columns:
+                self.cursor.execute(f'ALTER TABLE test_cases ADD COLUMN {column} {column_type}')
+        # Feature counts are read from this index alone; the partial one finds rows still to compress
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_test_cases_api_status ON test_cases (api_name, status)')
+        self.cursor.execute(
+            'CREATE INDEX IF NOT EXISTS idx_test_cases_uncompressed ON test_cases (id) WHERE response_hash IS NULL'
+        )
+        # One summary row per load test run
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS load_test_runs (
+                id INTEGER PRIMARY KEY,
+                started_at TEXT,
+                target TEXT,
+                virtual_users INTEGER,
+                target_rps REAL,
+                ramp_up_s REAL,
+                duration_s REAL,
+                requests INTEGER,
+                errors INTEGER,
+                average_rps REAL,
+                p50_ms REAL,
+                p90_ms REAL,
+                p99_ms REAL,
+                max_ms REAL,
+                histogram TEXT
+            )
+        ''')
+        # Workflow definitions as entered in the Workflows tab, see services.workflows.Workflow
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS workflows (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE,
+                definition TEXT
             )
         ''')
         self.conn.commit()
-        self.load_test_cases()
-
-    def load_test_cases(self):
-        self.cursor.execute('SELECT * FROM test_cases')
-        rows = self.cursor.fetchall()
-        for row in rows:
-            test_case = {
-                "id": row[0],
-                "name": row[1],
-                "method": row[2],
-                "url": row[3],
-                "headers": row[4],
-                "body": row[5],
-                "auth_type": row[6],
-                "auth_value": row[7],
-                "config": json.loads(row[8]),
-                "status": row[9],
-                "response_time": row[10],
-                "response_headers": row[11],
-                "response_body": row[12],
-                "api_name": row[13]
-            }
-            self.test_cases.append(test_case)
-            self.add_to_manage_list(test_case)
+
+        blob_config = self.config.API_TEST_CONFIG["blob_store"]
+        self.blob_store = BlobStore(blob_config["directory"], blob_config["threshold"], blob_config["level"])
+        threading.Thread(target=self.compact_stored_responses, name="response-compaction", daemon=True).start()
+        self.manage_cache = PagePrefetcher(self.db_path, self.fetch_manage_page, topic=data_events.API_TEST)
+        self.refresh_manage_list()
+        self.load_feature_stats()
+        self.refresh_load_runs()
+        self.refresh_workflow_list()
+
+    def compact_stored_responses(self, batch_size=200):
+        """Move response bodies of rows saved before compression into the blob store.
+
+        Runs on a background thread with a connection of its own, one batch
+        per transaction, so the tab opens without waiting for old rows. Once
+        everything is moved, VACUUM gives the space the bodies took back.
+        """
+        preview_chars = self.config.API_TEST_CONFIG["blob_store"]["preview_chars"]
+        conn = sqlite3.connect(self.db_path)
+        moved = 0
+        try:
+            while True:
+                rows = conn.execute(
+                    'SELECT id, response_body FROM test_cases WHERE response_hash IS NULL LIMIT ?', (batch_size,)
+                ).fetchall()
+                if not rows:
+                    break
+                updates = []
+                for row_id, response_body in rows:
+                    stored = self.blob_store.put(response_body)
+                    updates.append((stored.digest, stored.size, stored.inline,
+                                    BlobStore.preview(response_body, preview_chars), row_id))
+                conn.executemany(
+                    'UPDATE test_cases SET response_hash = ?, response_size = ?, response_blob = ?, response_body = ? '
+                    'WHERE id = ?',
+                    updates
+                )
+                conn.commit()
+                moved += len(rows)
+            if moved:
+                print(f"Compressed {moved} stored API responses")
+                # Freed pages would otherwise only be reused by new rows, never shrinking the file
+                conn.execute('VACUUM')
+        except (sqlite3.Error, OSError) as e:
+            print(f"Stopped compressing stored API responses: {e}")
+        finally:
+            conn.close()
+        if moved:
+            # The rows now hold previews, so pages read before are stale
+            self.ui_queue.post(data_events.publish, data_events.API_TEST)
+
+    def get_response_body(self, test_case):
+        """Get the full response body of a stored test case"""
+        if not test_case.response_hash:
+            return test_case.response_body
+        try:
+            return self.blob_store.get(test_case.response_hash, test_case.response_blob)
+        except (OSError, ValueError, RuntimeError) as e:
+            return f"{test_case.response_body}\n\n[Full response unavailable: {e}]"
+
+    def fetch_manage_page(self, conn, page, page_size):
+        """Fetch one page of the Manage tab: (total row count, test cases)"""
+        total_rows = conn.execute('SELECT COUNT(*) FROM test_cases').fetchone()[0]
+        # Only the listed columns; the rest is read when a test case is loaded or run
+        test_cases = ApiTestCase.query(
+            conn,
+            f'SELECT {MANAGE_COLUMNS} FROM test_cases ORDER BY id DESC LIMIT ? OFFSET ?',
+            (page_size, (page - 1) * page_size),
+            db_path=self.db_path
+        )
+        return total_rows, test_cases
+
+    def fetch_test_cases(self, test_case_id=None):
+        """Fetch saved test cases ready to send, without their stored responses"""
+        sql = f'SELECT {ApiTestCase.list_columns()} FROM test_cases'
+        if test_case_id is not None:
+            return ApiTestCase.query(self.conn, sql + ' WHERE id = ?', (test_case_id,), db_path=self.db_path)
+        return ApiTestCase.query(self.conn, sql + ' ORDER BY id', db_path=self.db_path)
+
+    def load_feature_stats(self):
+        """Count saved test cases per API name in the database"""
+        rows = self.cursor.execute(
+            "SELECT api_name, COUNT(*), SUM(status = 'Successful') FROM test_cases GROUP BY api_name"
+        ).fetchall()
+        self.stats["features"] = {
+            api_name: {"total": total, "passed": passed or 0} for api_name, total, passed in rows
+        }
+        self.update_statistics()
 
     def save_test_case_to_db(self, test_case):
+        # The row keeps a preview; the compressed body goes inline or to the blob directory
+        stored = self.blob_store.put(test_case.response_body)
+        test_case.response_body = BlobStore.preview(
+            test_case.response_body, self.config.API_TEST_CONFIG["blob_store"]["preview_chars"]
+        )
+        test_case.response_hash = stored.digest
+        test_case.response_size = stored.size
+        test_case.response_blob = stored.inline
         self.cursor.execute('''
-            INSERT INTO test_cases (name, method, url, headers, body, auth_type, auth_value, config, status, response_time, response_headers, response_body, api_name)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO test_cases (name, method, url, headers, body, auth_type, auth_value, config, status, response_status, response_time, response_headers, response_body, api_name, timings, response_hash, response_size, response_blob)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
-            test_case["name"],
-            test_case["method"],
-            test_case["url"],
-            test_case["headers"],
-            test_case["body"],
-            test_case["auth_type"],
-            test_case["auth_value"],
-            json.dumps(test_case["config"]),
-            test_case["status"],
-            test_case["response_time"],
-            test_case["response_headers"],
-            test_case["response_body"],
-            test_case["api_name"]
+            test_case.name,
+            test_case.method,
+            test_case.url,
+            test_case.headers,
+            test_case.body,
+            test_case.auth_type,
+            test_case.auth_value,
+            json.dumps(test_case.config),
+            test_case.status,
+            test_case.response_status,
+            test_case.response_time,
+            test_case.response_headers,
+            test_case.response_body,
+            test_case.api_name,
+            json.dumps(test_case.timings),
+            test_case.response_hash,
+            test_case.response_size,
+            test_case.response_blob
         ))
         self.conn.commit()
+        test_case.id = self.cursor.lastrowid
+        test_case._db_path = self.db_path
+        data_events.publish(data_events.API_TEST)
 
     def load_default_values(self):
         # Set default URL
@@ -219,6 +418,16 @@ class APITestView(ctk.CTkFrame):
         )
         self.send_button.pack(side="right", padx=5)
 
+        self.cancel_button = ctk.CTkButton(
+            self.url_frame,
+            text="Cancel",
+            command=self.cancel_request,
+            width=80,
+            state="disabled",
+            font=self.config.FONT_STYLES["normal"]
+        )
+        self.cancel_button.pack(side="right", padx=5)
+
     def _setup_tab_view(self):
         # Main tab view
         self.tab_view = ctk.CTkTabview(self)
@@ -268,6 +477,21 @@ class APITestView(ctk.CTkFrame):
         )
         self.body_text.pack(fill="both", expand=True, padx=5, pady=5)
 
+        # Assertions checked against every response of the test case
+        self.assertions_label = ctk.CTkLabel(
+            tab,
+            text="Assertions:",
+            font=self.config.FONT_STYLES["normal"]
+        )
+        self.assertions_label.pack(anchor="w", padx=5, pady=(5,0))
+
+        self.assertions_text = ctk.CTkTextbox(
+            tab,
+            height=100,
+            font=self.config.FONT_STYLES["normal"]
+        )
+        self.assertions_text.pack(fill="x", padx=5, pady=5)
+
     def setup_response_tab(self, tab):
         # Headers with themed appearance
         self.resp_headers_label = ctk.CTkLabel(
@@ -284,6 +508,53 @@ class APITestView(ctk.CTkFrame):
         )
         self.resp_headers_text.pack(fill="x", padx=5, pady=5)
 
+        # Where the response time went
+        self.resp_timing_label = ctk.CTkLabel(
+            tab,
+            text="Timing:",
+            font=self.config.FONT_STYLES["normal"]
+        )
+        self.resp_timing_label.pack(anchor="w", padx=5, pady=(5,0))
+
+        self.timing_waterfall = TimingWaterfall(tab)
+        self.timing_waterfall.pack(fill="x", padx=5, pady=5)
+        self.timing_waterfall.show(None)
+
+        # Differences from the baseline of the loaded test case
+        baseline_frame = ctk.CTkFrame(tab)
+        baseline_frame.pack(fill="x", padx=5, pady=(5,0))
+        self.baseline_label = ctk.CTkLabel(
+            baseline_frame,
+            text="Baseline: none",
+            font=self.config.FONT_STYLES["normal"]
+        )
+        self.baseline_label.pack(side="left", padx=5)
+        self.baseline_ignore_entry = ctk.CTkEntry(
+            baseline_frame,
+            placeholder_text="Ignored paths, e.g. $..timestamp, $.items[*].id"
+        )
+        self.baseline_ignore_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.baseline_ignore_entry.insert(0, ", ".join(self.baseline_config["ignore"]))
+        ctk.CTkButton(
+            baseline_frame,
+            text="Compare",
+            command=self.compare_with_baseline,
+            width=80
+        ).pack(side="left", padx=5)
+        ctk.CTkButton(
+            baseline_frame,
+            text="Clear Baseline",
+            command=self.clear_baseline,
+            width=100
+        ).pack(side="left", padx=5)
+
+        self.baseline_diff_text = ctk.CTkTextbox(
+            tab,
+            height=120,
+            font=self.config.FONT_STYLES["normal"]
+        )
+        self.baseline_diff_text.pack(fill="x", padx=5, pady=5)
+
         # Body
         self.resp_body_label = ctk.CTkLabel(
             tab,  # Changed from self.resp_tab to tab
@@ -292,8 +563,10 @@ class APITestView(ctk.CTkFrame):
         )
         self.resp_body_label.pack(anchor="w", padx=5, pady=(5,0))
         
-        self.resp_body_text = ctk.CTkTextbox(
+        # Large bodies are shown a chunk at a time as the user scrolls
+        self.resp_body_text = ChunkedTextbox(
             tab,  # Changed from self.resp_tab to tab
+            chunk_chars=self.response_view_config["chunk_chars"],
             font=self.config.FONT_STYLES["normal"]
         )
         self.resp_body_text.pack(fill="both", expand=True, padx=5, pady=5)
@@ -311,6 +584,14 @@ class APITestView(ctk.CTkFrame):
         self.manage_results_tab = self.data_notebook.add("Manage Results")
         self.setup_manage_results_tab()
 
+        # Workflows tab
+        self.workflows_tab = self.data_notebook.add("Workflows")
+        self.setup_workflows_tab(self.workflows_tab)
+
+        # Environments tab
+        self.environments_tab = self.data_notebook.add("Environments")
+        self.setup_environments_tab(self.environments_tab)
+
     def setup_test_results_tab(self):
         # Title
         title_frame = ctk.CTkFrame(self.test_results_tab)
@@ -340,6 +621,16 @@ class APITestView(ctk.CTkFrame):
         )
         self.clear_btn.pack(side="left", padx=5)
 
+        self.run_all_btn = ctk.CTkButton(
+            self.data_controls,
+            text="Run All",
+            command=self.run_all_tests
+        )
+        self.run_all_btn.pack(side="left", padx=5)
+
+        self.suite_status_label = ctk.CTkLabel(self.data_controls, text="")
+        self.suite_status_label.pack(side="left", padx=5)
+
         # Test results list
         test_results_frame = ctk.CTkFrame(self.test_results_tab)
         test_results_frame.pack(fill="both", expand=True, padx=5, pady=5)
@@ -381,8 +672,8 @@ class APITestView(ctk.CTkFrame):
         manage_results_headers_frame = ctk.CTkFrame(manage_results_frame)
         manage_results_headers_frame.pack(fill="x", padx=5, pady=2)
         
-        manage_results_headers = ["ID", "Name", "API Name", "Method", "URL", "Headers", "Body", "Status", "Response Time"]
-        manage_results_weights = [1, 2, 2, 1, 2, 2, 2, 1, 1]
+        manage_results_headers = ["ID", "Name", "API Name", "Method", "URL", "Status", "Response Time"]
+        manage_results_weights = [1, 2, 2, 1, 2, 1, 1]
         
         for header, weight in zip(manage_results_headers, manage_results_weights):
             ctk.CTkLabel(
@@ -395,6 +686,337 @@ class APITestView(ctk.CTkFrame):
         self.manage_results_list = ctk.CTkScrollableFrame(manage_results_frame)
         self.manage_results_list.pack(fill="both", expand=True, padx=5, pady=5)
 
+        # Pagination
+        pagination_frame = ctk.CTkFrame(manage_results_frame, fg_color="transparent")
+        pagination_frame.pack(fill="x", padx=5, pady=(0, 5))
+
+        self.manage_prev_button = ctk.CTkButton(
+            pagination_frame,
+            text="Previous",
+            command=lambda: self.show_manage_page(self.manage_page - 1),
+            width=100
+        )
+        self.manage_prev_button.pack(side="left", padx=5)
+
+        self.manage_page_label = ctk.CTkLabel(pagination_frame, text="Page 1")
+        self.manage_page_label.pack(side="left", padx=5)
+
+        self.manage_next_button = ctk.CTkButton(
+            pagination_frame,
+            text="Next",
+            command=lambda: self.show_manage_page(self.manage_page + 1),
+            width=100
+        )
+        self.manage_next_button.pack(side="left", padx=5)
+
+    def setup_workflows_tab(self, tab):
+        controls = ctk.CTkFrame(tab)
+        controls.pack(fill="x", padx=5, pady=5)
+
+        self.workflow_var = ctk.StringVar(value="New Workflow")
+        self.workflow_menu = ctk.CTkOptionMenu(
+            controls,
+            values=["New Workflow"],
+            variable=self.workflow_var,
+            command=self.select_workflow,
+            width=200
+        )
+        self.workflow_menu.pack(side="left", padx=5)
+
+        ctk.CTkButton(controls, text="Save", command=self.save_workflow, width=80).pack(side="left", padx=5)
+        ctk.CTkButton(controls, text="Delete", command=self.delete_workflow, width=80).pack(side="left", padx=5)
+        self.workflow_run_btn = ctk.CTkButton(controls, text="Run Workflow", command=self.toggle_workflow, width=120)
+        self.workflow_run_btn.pack(side="left", padx=5)
+        self.workflow_status_label = ctk.CTkLabel(controls, text="")
+        self.workflow_status_label.pack(side="left", padx=5)
+
+        # Definition: steps with depends_on and extract, see services.workflows.Workflow
+        self.workflow_text = ctk.CTkTextbox(tab, height=220, font=self.config.FONT_STYLES["normal"])
+        self.workflow_text.pack(fill="both", expand=True, padx=5, pady=5)
+        self.workflow_text.insert("1.0", json.dumps(self.config.API_TEST_CONFIG["workflows"]["example"], indent=2))
+
+        self.workflow_results_text = ctk.CTkTextbox(tab, height=150)
+        self.workflow_results_text.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def setup_environments_tab(self, tab):
+        compare_config = self.config.API_TEST_CONFIG["environment_compare"]
+        self.environment_entries = {}
+        urls_frame = ctk.CTkFrame(tab)
+        urls_frame.pack(fill="x", padx=5, pady=5)
+        for row, (environment, base_url) in enumerate(compare_config["environments"].items()):
+            ctk.CTkLabel(urls_frame, text=environment).grid(row=row, column=0, sticky="w", padx=5, pady=2)
+            entry = ctk.CTkEntry(urls_frame, width=320)
+            entry.grid(row=row, column=1, sticky="ew", padx=5, pady=2)
+            entry.insert(0, base_url)
+            self.environment_entries[environment] = entry
+        urls_frame.grid_columnconfigure(1, weight=1)
+
+        controls = ctk.CTkFrame(tab)
+        controls.pack(fill="x", padx=5, pady=5)
+        ctk.CTkLabel(controls, text="Compare with:").pack(side="left", padx=5)
+        self.reference_environment_var = ctk.StringVar(value=compare_config["reference"])
+        ctk.CTkOptionMenu(
+            controls,
+            values=list(compare_config["environments"]),
+            variable=self.reference_environment_var,
+            width=140
+        ).pack(side="left", padx=5)
+        self.compare_run_btn = ctk.CTkButton(
+            controls, text="Run Comparison", command=self.toggle_environment_comparison, width=140
+        )
+        self.compare_run_btn.pack(side="left", padx=5)
+        self.compare_status_label = ctk.CTkLabel(controls, text="")
+        self.compare_status_label.pack(side="left", padx=5)
+
+        # One row per test case, one column per environment
+        self.comparison_list = ctk.CTkScrollableFrame(tab, height=220)
+        self.comparison_list.pack(fill="both", expand=True, padx=5, pady=5)
+
+        self.comparison_details_text = ctk.CTkTextbox(tab, height=150, font=self.config.FONT_STYLES["normal"])
+        self.comparison_details_text.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def toggle_environment_comparison(self):
+        """Run every saved test case against all environments at once, or stop the run"""
+        if self.comparison is not None:
+            self.comparison.cancel()
+            self.compare_run_btn.configure(state="disabled", text="Stopping...")
+            return
+        environments = {
+            environment: entry.get().strip()
+            for environment, entry in self.environment_entries.items() if entry.get().strip()
+        }
+        compare_config = self.config.API_TEST_CONFIG["environment_compare"]
+        runner_config = self.config.API_TEST_CONFIG["suite_runner"]
+        try:
+            self.comparison = EnvironmentComparison(
+                self.request_engine,
+                environments,
+                reference=self.reference_environment_var.get(),
+                concurrency=runner_config["concurrency"],
+                per_host_limit=runner_config["per_host_limit"],
+                deadline_seconds=self.policy_defaults["suite_deadline"],
+                latency_ratio=compare_config["latency_ratio"],
+                latency_floor_ms=compare_config["latency_floor_ms"],
+                max_differences=compare_config["max_differences"],
+                ignore_for=lambda test_case: test_case.config.get("baseline_ignore", self.baseline_config["ignore"])
+            )
+        except ValueError as e:
+            messagebox.showerror("Environments", str(e))
+            return
+
+        for widget in self.comparison_list.winfo_children():
+            widget.destroy()
+        self.comparison_rows = []
+        self.comparison_reference = self.comparison.reference
+        self.comparison_details_text.delete("1.0", "end")
+        header = ["Test Case"] + [
+            f"{environment} (reference)" if environment == self.comparison_reference else environment
+            for environment in environments
+        ]
+        for column, title in enumerate(header):
+            ctk.CTkLabel(self.comparison_list, text=title, font=("Arial Bold", 12)).grid(
+                row=0, column=column, sticky="w", padx=5
+            )
+        self.compare_run_btn.configure(text="Stop Comparison")
+        self.compare_status_label.configure(text="Running", text_color=("gray10", "gray90"))
+        # Tagged with the comparison, so a stopped run cannot write into the next one
+        comparison = self.comparison
+        comparison.start(
+            self.comparison_cases(self.fetch_test_cases()),
+            lambda row: self.ui_queue.post(self.on_comparison_row, comparison, row),
+            lambda summary: self.ui_queue.post(self.on_comparison_done, comparison, summary)
+        )
+
+    def comparison_cases(self, test_cases):
+        """Yield a suite case per test case, as built for its own URL; runs on the runner's thread"""
+        for test_case in test_cases:
+            if test_case.config.get("dataset"):
+                # Its rows would have to line up across environments too; compare it with Run All instead
+                continue
+            try:
+                spec = RequestSpec.from_test_case(test_case, self.policy_defaults)
+            except Exception as e:
+                print(f"Skipping test case {test_case.name}: {e}")
+                continue
+            yield SuiteCase(test_case, spec, test_case.config.get("order_group") or None)
+
+    def on_comparison_row(self, comparison, row):
+        """Add one test case lined up across environments; runs on the UI thread"""
+        if comparison is not self.comparison:
+            return
+        self.comparison_rows.append(row)
+        grid_row = len(self.comparison_rows)
+        test_case = row.record
+        ctk.CTkButton(
+            self.comparison_list,
+            text=test_case.name,
+            command=lambda: self.show_comparison_details(row),
+            width=140,
+            fg_color="transparent",
+            border_width=1
+        ).grid(row=grid_row, column=0, sticky="w", padx=5, pady=2)
+
+        for column, environment in enumerate(row.results, 1):
+            result = row.results[environment]
+            if result.cancelled:
+                text, color = "Cancelled", "gray"
+            else:
+                text = f"{result.status_code if result.error is None else 'Error'} · {result.elapsed_ms:.0f}ms"
+                if environment in row.divergent:
+                    color = "red"
+                elif environment in row.slower:
+                    color = "orange"
+                    text += " (slower)"
+                else:
+                    color = "green" if result.ok else ("gray10", "gray90")
+            ctk.CTkLabel(self.comparison_list, text=text, text_color=color).grid(
+                row=grid_row, column=column, sticky="w", padx=5
+            )
+
+        for environment, reason in row.divergent.items():
+            self.request_log.event(f"{test_case.name}: {environment} diverges from {self.comparison_reference}: {reason}")
+
+    def show_comparison_details(self, row):
+        lines = [row.record.name]
+        for environment, result in row.results.items():
+            lines.append("")
+            reference = " (reference)" if environment == self.comparison_reference else ""
+            lines.append(
+                f"{environment}{reference}: {result.spec.method} {result.spec.url} -> "
+                f"{result.error or result.status_code} in {result.elapsed_ms:.2f}ms"
+            )
+            if environment in row.divergent:
+                lines.append(f"  Diverges: {row.divergent[environment]}")
+            if environment in row.slower:
+                lines.append(f"  Latency regression against {self.comparison_reference}")
+            diff = row.diffs.get(environment)
+            if diff is not None and not diff.identical:
+                lines.append(diff.describe())
+        self.comparison_details_text.delete("1.0", "end")
+        self.comparison_details_text.insert("1.0", "\n".join(lines))
+
+    def on_comparison_done(self, comparison, summary):
+        if comparison is not self.comparison:
+            return
+        self.comparison = None
+        self.compare_run_btn.configure(state="normal", text="Run Comparison")
+        self.compare_status_label.configure(
+            text=f"{summary.rows} test cases: {summary.divergent} diverging, {summary.regressions} slower "
+                 f"than {summary.reference}, {summary.cancelled} cancelled in {summary.elapsed_s:.1f}s",
+            text_color="green" if not summary.divergent and not summary.regressions else "red"
+        )
+        if summary.error:
+            self.request_log.event(f"Comparison stopped reading test cases: {summary.error}")
+
+    def refresh_workflow_list(self):
+        names = [name for (name,) in self.cursor.execute('SELECT name FROM workflows ORDER BY name')]
+        self.workflow_menu.configure(values=["New Workflow"] + names)
+
+    def select_workflow(self, name):
+        if name == "New Workflow":
+            definition = self.config.API_TEST_CONFIG["workflows"]["example"]
+        else:
+            row = self.cursor.execute('SELECT definition FROM workflows WHERE name = ?', (name,)).fetchone()
+            if not row:
+                return
+            definition = json.loads(row[0])
+        self.workflow_text.delete("1.0", "end")
+        self.workflow_text.insert("1.0", json.dumps(definition, indent=2))
+
+    def build_workflow(self):
+        """Parse the definition in the Workflows tab; shows the problem and returns None when invalid"""
+        try:
+            definition = json.loads(self.workflow_text.get("1.0", "end-1c"))
+            workflow = Workflow.from_dict(
+                definition,
+                load_test_case=lambda test_case_id: next(iter(self.fetch_test_cases(test_case_id)), None),
+                policy_defaults=self.policy_defaults
+            )
+        except ValueError as e:
+            messagebox.showerror("Workflow", f"Invalid workflow: {e}")
+            return None
+        return definition, workflow
+
+    def save_workflow(self):
+        built = self.build_workflow()
+        if built is None:
+            return
+        definition, workflow = built
+        self.cursor.execute(
+            'INSERT INTO workflows (name, definition) VALUES (?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET definition = excluded.definition',
+            (workflow.name, json.dumps(definition))
+        )
+        self.conn.commit()
+        self.refresh_workflow_list()
+        self.workflow_var.set(workflow.name)
+
+    def delete_workflow(self):
+        name = self.workflow_var.get()
+        if name == "New Workflow" or not messagebox.askyesno("Delete Workflow", f"Delete workflow '{name}'?"):
+            return
+        self.cursor.execute('DELETE FROM workflows WHERE name = ?', (name,))
+        self.conn.commit()
+        self.refresh_workflow_list()
+        self.workflow_var.set("New Workflow")
+        self.select_workflow("New Workflow")
+
+    def toggle_workflow(self):
+        """Run the workflow in the editor, or stop the one running"""
+        if self.workflow_runner is not None:
+            self.workflow_runner.cancel()
+            self.workflow_run_btn.configure(state="disabled", text="Stopping...")
+            return
+        built = self.build_workflow()
+        if built is None:
+            return
+        _, workflow = built
+
+        self.workflow_runner = WorkflowRunner(
+            self.request_engine,
+            concurrency=self.config.API_TEST_CONFIG["workflows"]["concurrency"],
+            deadline_seconds=self.policy_defaults["suite_deadline"],
+            route=self.route_spec
+        )
+        self.workflow_results_text.delete("1.0", "end")
+        self.workflow_run_btn.configure(text="Stop Workflow")
+        self.workflow_status_label.configure(text=f"Running {len(workflow.steps)} steps", text_color=("gray10", "gray90"))
+        # Tagged with the runner, so a stopped workflow cannot write into the next one
+        runner = self.workflow_runner
+        runner.start(
+            workflow,
+            lambda outcome: self.ui_queue.post(self.on_workflow_step, runner, outcome),
+            lambda summary: self.ui_queue.post(self.on_workflow_done, runner, summary)
+        )
+
+    def on_workflow_step(self, runner, outcome):
+        """Show one finished workflow step; runs on the UI thread"""
+        if runner is not self.workflow_runner:
+            return
+        line = f"{outcome.status.upper():<9} {outcome.step}"
+        if outcome.result is not None and outcome.result.error is None:
+            line += f"  HTTP {outcome.result.status_code} in {outcome.result.elapsed_ms:.2f}ms"
+        if outcome.variables:
+            line += f"  {json.dumps(outcome.variables, default=str)}"
+        if outcome.error:
+            line += f"  ({outcome.error})"
+        self.workflow_results_text.insert("end", line + "\n")
+        if outcome.result is not None:
+            spec = outcome.result.spec
+            self.log_request(spec.method, spec.url, spec.headers, spec.body, outcome.result)
+            self.count_assertions(outcome.result)
+
+    def on_workflow_done(self, runner, summary):
+        if runner is not self.workflow_runner:
+            return
+        self.workflow_runner = None
+        self.workflow_run_btn.configure(state="normal", text="Run Workflow")
+        passed = sum(1 for outcome in summary.outcomes.values() if outcome.status == "passed")
+        self.workflow_status_label.configure(
+            text=f"{summary.name}: {passed}/{len(summary.outcomes)} steps passed in {summary.elapsed_s:.1f}s",
+            text_color="green" if summary.passed else "red"
+        )
+
     def setup_statistics_tab(self, tab):
         self.stats_notebook = ctk.CTkTabview(tab)
         self.stats_notebook.pack(fill="both", expand=True, padx=5, pady=5)
@@ -404,14 +1026,258 @@ class APITestView(ctk.CTkFrame):
         self.feature_fig, self.feature_ax = plt.subplots(figsize=(6, 4))
         self.feature_canvas = FigureCanvasTkAgg(self.feature_fig, master=self.feature_tab)
         self.feature_canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Bars are animated: full draws leave them out and they are blitted onto the saved background
+        self.feature_bars = []
+        self.feature_labels = None
+        self.feature_background = None
+        self.feature_canvas.mpl_connect("draw_event", self.on_feature_chart_drawn)
+
+        # Assertions tab
+        self.assertions_tab = self.stats_notebook.add("Assertions")
+        self.assertion_stats_text = ctk.CTkTextbox(self.assertions_tab, font=self.config.FONT_STYLES["normal"])
+        self.assertion_stats_text.pack(fill="both", expand=True, padx=5, pady=5)
+
+        # Load Test tab
+        self.load_test_tab = self.stats_notebook.add("Load Test")
+        self.setup_load_test_tab(self.load_test_tab)
 
         # Update statistics when the tab is selected
         self.stats_notebook.set("Feature Coverage")
         self.update_statistics()
 
+    def setup_load_test_tab(self, tab):
+        defaults = self.config.API_TEST_CONFIG["load_test"]
+
+        params_frame = ctk.CTkFrame(tab)
+        params_frame.pack(fill="x", padx=5, pady=5)
+
+        self.load_entries = {}
+        for key, label, width in (("virtual_users", "Virtual Users:", 60),
+                                  ("target_rps", "Target RPS (0 = max):", 60),
+                                  ("ramp_up_s", "Ramp-up (s):", 50),
+                                  ("duration_s", "Duration (s):", 50),
+                                  ("processes", "Processes:", 40)):
+            ctk.CTkLabel(params_frame, text=label).pack(side="left", padx=5)
+            entry = ctk.CTkEntry(params_frame, width=width)
+            entry.insert(0, str(defaults[key]))
+            entry.pack(side="left", padx=5)
+            self.load_entries[key] = entry
+
+        self.load_target_var = ctk.StringVar(value="Current Request")
+        self.load_target_menu = ctk.CTkOptionMenu(
+            params_frame,
+            values=["Current Request", "All Test Cases"],
+            variable=self.load_target_var,
+            width=180
+        )
+        self.load_target_menu.pack(side="left", padx=5)
+
+        self.load_test_btn = ctk.CTkButton(
+            params_frame,
+            text="Start Load Test",
+            command=self.toggle_load_test,
+            width=120
+        )
+        self.load_test_btn.pack(side="left", padx=5)
+
+        # Remote load agents; when any are listed they generate the load instead of this machine
+        agents_frame = ctk.CTkFrame(tab)
+        agents_frame.pack(fill="x", padx=5, pady=(0, 5))
+        ctk.CTkLabel(agents_frame, text="Agents:").pack(side="left", padx=5)
+        self.load_agents_entry = ctk.CTkEntry(agents_frame, placeholder_text="host:port, host:port", width=300)
+        if defaults["agents"]:
+            self.load_agents_entry.insert(0, defaults["agents"])
+        self.load_agents_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(agents_frame, text="Token:").pack(side="left", padx=5)
+        self.load_agent_token_entry = ctk.CTkEntry(agents_frame, show="*", width=150)
+        self.load_agent_token_entry.pack(side="left", padx=5)
+
+        # Live figures
+        live_frame = ctk.CTkFrame(tab)
+        live_frame.pack(fill="x", padx=5, pady=5)
+        self.load_labels = {}
+        for title in ("Elapsed", "Users", "Requests", "Throughput", "Error Rate", "Failed Assertions",
+                      "p50", "p90", "p99", "Max"):
+            box = ctk.CTkFrame(live_frame)
+            box.pack(side="left", expand=True, fill="x", padx=3, pady=3)
+            ctk.CTkLabel(box, text=title, font=("Arial Bold", 12)).pack(pady=(5, 0))
+            value_label = ctk.CTkLabel(box, text="-", font=("Arial Bold", 16))
+            value_label.pack(pady=(0, 5))
+            self.load_labels[title] = value_label
+
+        # Previous runs
+        ctk.CTkLabel(tab, text="Recent Runs", font=("Arial Bold", 14)).pack(anchor="w", padx=5, pady=(10, 0))
+        self.load_runs_text = ctk.CTkTextbox(tab, height=150)
+        self.load_runs_text.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def update_load_targets(self):
+        """Offer the test cases on the current Manage page as load test targets"""
+        targets = ["Current Request", "All Test Cases"] + [f"{tc.id}: {tc.name}" for tc in self.manage_page_cases]
+        self.load_target_menu.configure(values=targets)
+
+    def get_load_test_specs(self):
+        target = self.load_target_var.get()
+        if target == "Current Request":
+            return [self.build_request_spec()]
+        if target == "All Test Cases":
+            test_cases = self.fetch_test_cases()
+        else:
+            test_cases = self.fetch_test_cases(int(target.split(":", 1)[0]))
+        return [self.route_spec(RequestSpec.from_test_case(tc, self.policy_defaults)) for tc in test_cases]
+
+    def toggle_load_test(self):
+        """Start a load test, or stop the one running"""
+        if self.load_test is not None:
+            self.load_test.stop()
+            self.load_test_btn.configure(state="disabled", text="Stopping...")
+            return
+
+        try:
+            profile = LoadProfile(
+                virtual_users=max(1, int(self.load_entries["virtual_users"].get())),
+                target_rps=max(0.0, float(self.load_entries["target_rps"].get())),
+                ramp_up_s=max(0.0, float(self.load_entries["ramp_up_s"].get())),
+                duration_s=max(1.0, float(self.load_entries["duration_s"].get()))
+            )
+            processes = max(1, int(self.load_entries["processes"].get()))
+            specs = self.get_load_test_specs()
+            on_snapshot = lambda snapshot: self.ui_queue.post(self.on_load_snapshot, snapshot)
+            agents = [agent for agent in self.load_agents_entry.get().split(",") if agent.strip()]
+            if agents:
+                self.load_test = RemoteLoadTest(
+                    specs, profile, agents,
+                    token=self.load_agent_token_entry.get() or None,
+                    on_snapshot=on_snapshot
+                )
+            elif processes > 1:
+                # Worker processes each get their own interpreter, so heavy runs aren't GIL-bound
+                self.load_test = MultiProcessLoadTest(specs, profile, processes, on_snapshot=on_snapshot)
+            else:
+                self.load_test = LoadTest(specs, profile, on_snapshot=on_snapshot)
+        except Exception as e:
+            messagebox.showerror("Load Test", f"Cannot start load test: {e}")
+            return
+
+        self.load_test_started = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.load_test_target = self.load_target_var.get()
+        self.load_test_btn.configure(text="Stop Load Test")
+        self.load_test.start()
+
+    def on_load_snapshot(self, snapshot):
+        """Show live load test figures; runs on the UI thread"""
+        self.load_labels["Elapsed"].configure(text=f"{snapshot.elapsed_s:.0f}s")
+        self.load_labels["Users"].configure(text=str(snapshot.active_users))
+        self.load_labels["Requests"].configure(text=str(snapshot.requests))
+        self.load_labels["Throughput"].configure(
+            text=f"{(snapshot.average_rps if snapshot.finished else snapshot.current_rps):.1f}/s"
+        )
+        self.load_labels["Error Rate"].configure(text=f"{snapshot.error_rate:.1f}%")
+        self.load_labels["Failed Assertions"].configure(text=str(snapshot.assertion_failures))
+        for title, value in (("p50", snapshot.p50_ms), ("p90", snapshot.p90_ms),
+                             ("p99", snapshot.p99_ms), ("Max", snapshot.max_ms)):
+            self.load_labels[title].configure(text=f"{value:.1f}ms")
+
+        if snapshot.finished:
+            self.save_load_run(snapshot)
+            self.load_test = None
+            self.load_test_btn.configure(state="normal", text="Start Load Test")
+
+    def save_load_run(self, snapshot):
+        """Store the summary of a finished load test run"""
+        profile = self.load_test.profile
+        self.cursor.execute('''
+            INSERT INTO load_test_runs (started_at, target, virtual_users, target_rps, ramp_up_s, duration_s,
+                                        requests, errors, average_rps, p50_ms, p90_ms, p99_ms, max_ms, histogram)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            self.load_test_started,
+            self.load_test_target,
+            profile.virtual_users,
+            profile.target_rps,
+            profile.ramp_up_s,
+            profile.duration_s,
+            snapshot.requests,
+            snapshot.errors,
+            snapshot.average_rps,
+            snapshot.p50_ms,
+            snapshot.p90_ms,
+            snapshot.p99_ms,
+            snapshot.max_ms,
+            json.dumps(self.load_test.histogram.to_dict())
+        ))
+        self.conn.commit()
+        self.refresh_load_runs()
+
+    def refresh_load_runs(self, limit=20):
+        self.cursor.execute('''
+            SELECT started_at, target, virtual_users, target_rps, requests, errors,
+                   average_rps, p50_ms, p90_ms, p99_ms, max_ms
+            FROM load_test_runs ORDER BY id DESC LIMIT ?
+        ''', (limit,))
+        lines = []
+        for (started_at, target, users, target_rps, requests, errors,
+             average_rps, p50, p90, p99, max_ms) in self.cursor.fetchall():
+            error_rate = errors / requests * 100 if requests else 0
+            rps_text = f"{target_rps:g}" if target_rps else "max"
+            lines.append(
+                f"{started_at} | {target} | {users} VUs @ {rps_text} rps | {requests} req, "
+                f"{average_rps:.1f}/s, {error_rate:.1f}% errors | "
+                f"p50 {p50:.1f} p90 {p90:.1f} p99 {p99:.1f} max {max_ms:.1f} ms"
+            )
+        self.load_runs_text.delete("1.0", "end")
+        self.load_runs_text.insert("1.0", "\n".join(lines) if lines else "No load test runs yet")
+
     def setup_log_tab(self, tab):
+        search_frame = ctk.CTkFrame(tab)
+        search_frame.pack(fill="x", padx=5, pady=(5, 0))
+        self.log_filter_entry = ctk.CTkEntry(search_frame, placeholder_text="Filter recent entries", width=300)
+        self.log_filter_entry.pack(side="left", padx=5)
+        self.log_filter_entry.bind("<KeyRelease>", lambda event: self.render_log(force=True))
+        ctk.CTkButton(
+            search_frame,
+            text="Search Log Files",
+            command=self.search_log_files,
+            width=130
+        ).pack(side="left", padx=5)
+
         self.log_text = ctk.CTkTextbox(tab)
         self.log_text.pack(fill="both", expand=True, padx=5, pady=5)
+        self.after(500, self.refresh_log_tab)
+
+    def refresh_log_tab(self):
+        """Re-render the log tab while it is shown and entries were added"""
+        if self.tab_view.get() == "Logs":
+            self.render_log()
+        self.after(500, self.refresh_log_tab)
+
+    def render_log(self, force=False):
+        """Show the newest entries of the in-memory request log"""
+        if not force and self.rendered_log_version == self.request_log.version:
+            return
+        self.rendered_log_version = self.request_log.version
+        entries = self.request_log.entries(
+            limit=self.config.API_TEST_CONFIG["request_log"]["render_entries"],
+            text=self.log_filter_entry.get().strip()
+        )
+        self.log_text.delete("1.0", "end")
+        self.log_text.insert("1.0", "".join(entry.render() for entry in entries))
+
+    def search_log_files(self):
+        """Show entries from the log files on disk containing the filter text"""
+        text = self.log_filter_entry.get().strip()
+        if not text:
+            return
+        try:
+            found = search_log_files(self.request_log.directory, text)
+        except OSError as e:
+            messagebox.showerror("Search Logs", f"Cannot read log files: {e}")
+            return
+        self.log_text.delete("1.0", "end")
+        self.log_text.insert("1.0", f"{len(found)} logged entries containing '{text}':\n\n")
+        for record in found:
+            self.log_text.insert("end", json.dumps(record, indent=2) + "\n\n")
+        # Back to the live view with the next new entry
+        self.rendered_log_version = self.request_log.version
 
     def setup_request_config(self):
         """Add request configuration frame"""
@@ -436,12 +1302,143 @@ class APITestView(ctk.CTkFrame):
         )
         self.verify_ssl_cb.pack(side="left", padx=5)
 
-        # Timeout
+        # Connect timeout
+        ctk.CTkLabel(self.config_frame, text="Connect (s):").pack(side="left", padx=5)
+        self.connect_timeout_entry = ctk.CTkEntry(self.config_frame, width=60)
+        self.connect_timeout_entry.insert(0, str(self.policy_defaults["connect_timeout"]))
+        self.connect_timeout_entry.pack(side="left", padx=5)
+
+        # Read timeout
         ctk.CTkLabel(self.config_frame, text="Timeout (s):").pack(side="left", padx=5)
         self.timeout_entry = ctk.CTkEntry(self.config_frame, width=60)
-        self.timeout_entry.insert(0, "30")
+        self.timeout_entry.insert(0, str(self.policy_defaults["read_timeout"]))
         self.timeout_entry.pack(side="left", padx=5)
 
+        # Retries (idempotent methods only)
+        ctk.CTkLabel(self.config_frame, text="Retries:").pack(side="left", padx=5)
+        self.retries_entry = ctk.CTkEntry(self.config_frame, width=40)
+        self.retries_entry.insert(0, str(self.policy_defaults["retries"]))
+        self.retries_entry.pack(side="left", padx=5)
+
+        # Order group: stored cases sharing a group run sequentially in Run All
+        ctk.CTkLabel(self.config_frame, text="Order Group:").pack(side="left", padx=5)
+        self.order_group_entry = ctk.CTkEntry(self.config_frame, width=100)
+        self.order_group_entry.pack(side="left", padx=5)
+
+        # Dataset: Run All sends the saved case once per row, filling in {{column}} placeholders
+        ctk.CTkLabel(self.config_frame, text="Dataset:").pack(side="left", padx=5)
+        self.dataset_entry = ctk.CTkEntry(self.config_frame, width=160, placeholder_text="CSV, JSON or JSON Lines")
+        self.dataset_entry.pack(side="left", padx=5)
+        ctk.CTkButton(
+            self.config_frame,
+            text="...",
+            command=self.choose_dataset,
+            width=30
+        ).pack(side="left")
+
+        # Local stub of the banking routes for offline runs
+        self.mock_server_btn = ctk.CTkButton(
+            self.config_frame,
+            text="Start Mock Server",
+            command=self.toggle_mock_server,
+            width=130
+        )
+        self.mock_server_btn.pack(side="right", padx=5)
+
+        # Serves the recorded responses; Run All and load tests go to it while it runs
+        self.replay_server_btn = ctk.CTkButton(
+            self.config_frame,
+            text="Start Replay",
+            command=self.toggle_replay_server,
+            width=110
+        )
+        self.replay_server_btn.pack(side="right", padx=5)
+
+    def choose_dataset(self):
+        path = filedialog.askopenfilename(
+            title="Choose dataset",
+            filetypes=[("Datasets", "*.csv *.json *.jsonl *.ndjson"), ("All files", "*.*")]
+        )
+        if path:
+            self.dataset_entry.delete(0, "end")
+            self.dataset_entry.insert(0, path)
+
+    def toggle_mock_server(self):
+        """Start the local mock server, or stop the one running"""
+        if self.mock_server is not None:
+            self.mock_server.stop()
+            self.request_log.event(f"Mock server stopped after {self.mock_server.requests} requests")
+            self.mock_server = None
+            self.mock_server_btn.configure(text="Start Mock Server")
+            return
+
+        try:
+            server = MockServer.from_config(self.config.API_TEST_CONFIG["mock_server"])
+            server.start()
+        except OSError as e:
+            messagebox.showerror("Mock Server", f"Cannot start mock server: {e}")
+            return
+        self.mock_server = server
+        self.mock_server_btn.configure(text="Stop Mock Server")
+        self.request_log.event(
+            f"Mock server listening on {server.url} ({', '.join(sorted(p for _, p in server.routes))})"
+        )
+
+    def toggle_replay_server(self):
+        """Start serving the recorded test case responses, or stop"""
+        if self.replay_server is not None:
+            self.replay_server.stop()
+            self.request_log.event(
+                f"Replay server stopped after {self.replay_server.requests} requests "
+                f"({self.replay_server.misses} unmatched)"
+            )
+            self.replay_server = None
+            self.replay_server_btn.configure(text="Start Replay")
+            return
+
+        replay_config = self.config.API_TEST_CONFIG["replay_server"]
+        try:
+            server = ReplayServer(
+                self.db_path, self.blob_store, replay_config["host"], replay_config["port"],
+                match_body=replay_config["match_body"], topic=data_events.API_TEST
+            )
+            server.start()
+        except (OSError, sqlite3.Error) as e:
+            messagebox.showerror("Replay Server", f"Cannot start replay server: {e}")
+            return
+        self.replay_server = server
+        self.replay_server_btn.configure(text="Stop Replay")
+        self.request_log.event(
+            f"Replay server listening on {server.url} with {len(server.routes)} recorded routes; "
+            f"Run All and load tests now use it"
+        )
+
+    def route_spec(self, spec):
+        """Send a stored test case to the replay server instead of its host while replaying"""
+        if self.replay_server is None:
+            return spec
+        return dataclasses.replace(spec, url=self.replay_server.rebase(spec.url))
+
+    def get_execution_policy(self):
+        """Build the execution policy from the request config fields"""
+        values = {}
+        for key, entry in (("connect_timeout", self.connect_timeout_entry),
+                           ("read_timeout", self.timeout_entry),
+                           ("retries", self.retries_entry)):
+            try:
+                values[key] = float(entry.get()) if key != "retries" else int(entry.get())
+            except ValueError:
+                pass  # Fall back to the configured default
+        return ExecutionPolicy.from_config(values, self.policy_defaults)
+
+    def set_execution_policy(self, policy):
+        """Show an execution policy in the request config fields"""
+        for entry, value in ((self.connect_timeout_entry, policy.connect_timeout),
+                             (self.timeout_entry, policy.read_timeout),
+                             (self.retries_entry, policy.retries)):
+            entry.delete(0, "end")
+            entry.insert(0, str(value))
+
     def on_auth_change(self, auth_type):
         if auth_type == "None":
             self.auth_input.configure(state="disabled")
@@ -453,31 +1450,10 @@ class APITestView(ctk.CTkFrame):
                 self.auth_input.configure(placeholder_text="Enter token")
 
     def get_auth_headers(self):
-        auth_type = self.auth_type.get()
-        auth_value = self.auth_input.get()
-        
-        if auth_type == "Basic Auth" and auth_value:
-            import base64
-            auth_bytes = base64.b64encode(auth_value.encode()).decode()
-            return {'Authorization': f'Basic {auth_bytes}'}
-        elif auth_type == "Bearer Token" and auth_value:
-            return {'Authorization': f'Bearer {auth_value}'}
-        return {}
-
-    def log_request(self, method, url, headers, body, response):
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_entry = f"""
-=== Request [{timestamp}] ===
-{method} {url}
-Headers: {json.dumps(headers, indent=2)}
-Body: {json.dumps(body, indent=2) if body else 'None'}
-
-=== Response ===
-Status: {response.status_code}
-Headers: {json.dumps(dict(response.headers), indent=2)}
-Body: {json.dumps(response.json(), indent=2) if response.headers.get('content-type', '').startswith('application/json') else response.text}
-"""
-        self.log_text.insert("1.0", log_entry + "\n" + "="*50 + "\n\n")
+        return auth_headers(self.auth_type.get(), self.auth_input.get())
+
+    def log_request(self, method, url, headers, body, result):
+        self.request_log.exchange(method, url, headers, body, result)
 
     def on_method_change(self, method):
         if method in ["POST", "PUT"]:
@@ -487,89 +1463,264 @@ Body: {json.dumps(response.json(), indent=2) if response.headers.get('content-ty
             self.body_text.delete("1.0", "end")
 
     def send_request(self):
+        """Start the request built from the form on a worker thread"""
+        if self.active_request is not None:
+            return
+
         try:
-            start_time = time.time()
-            url = self.url_entry.get()
-            method = self.method_menu.get()
-            
-            # Combine custom headers with auth headers
-            headers = {**self.get_auth_headers(), 'Content-Type': 'application/json'}
-            try:
-                custom_headers = json.loads(self.headers_text.get("1.0", "end-1c"))
-                headers.update(custom_headers)
-            except:
-                pass
-            
-            # Get body for POST/PUT
-            body = None
-            if method in ["POST", "PUT"]:
-                body_text = self.body_text.get("1.0", "end-1c")
-                if body_text:
-                    try:
-                        body = json.loads(body_text)
-                    except:
-                        body = body_text
-
-            # Send request
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=body if isinstance(body, dict) else None,
-                data=body if isinstance(body, str) else None,
-                verify=self.verify_ssl_var.get()
-            )
-            
-            end_time = time.time()
-            response_time = (end_time - start_time) * 1000  # Convert to milliseconds
+            spec = self.build_request_spec()
+        except Exception as e:
+            self.show_request_error(self.method_menu.get(), self.url_entry.get(), f"Error: {str(e)}")
+            return
+
+        baseline = self.active_baseline
+
+        def done(ticket, result):
+            # Compared here on the worker thread, so a large body doesn't stall the UI
+            diff, diff_error = None, None
+            if result.error is None and not result.cancelled:
+                diff, diff_error = self.diff_with_baseline(baseline, result)
+            self.ui_queue.post(self.on_request_done, ticket, result, diff, diff_error)
+
+        self.active_request = self.request_engine.submit(spec, done)
+        self.set_request_in_flight(True)
+
+    def build_request_spec(self):
+        """Build the request described by the form"""
+        url = self.url_entry.get()
+        method = self.method_menu.get()
+
+        # Combine custom headers with auth headers
+        headers = {**self.get_auth_headers(), 'Content-Type': 'application/json'}
+        try:
+            custom_headers = json.loads(self.headers_text.get("1.0", "end-1c"))
+            headers.update(custom_headers)
+        except:
+            pass
+        
+        # Get body for POST/PUT
+        body = None
+        if method in ["POST", "PUT"]:
+            body_text = self.body_text.get("1.0", "end-1c")
+            if body_text:
+                try:
+                    body = json.loads(body_text)
+                except:
+                    body = body_text
 
+        return RequestSpec(
+            method=method,
+            url=url,
+            headers=headers,
+            body=body,
+            verify=self.verify_ssl_var.get(),
+            policy=self.get_execution_policy(),
+            keep_alive=self.keep_alive_var.get(),
+            assertions=self.get_assertions()
+        )
+
+    def get_assertions(self):
+        """Parse the assertions of the form, raising ValueError when they are invalid"""
+        text = self.assertions_text.get("1.0", "end-1c").strip()
+        if not text:
+            return []
+        try:
+            assertions = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"Assertions are not valid JSON: {e}") from None
+        if not isinstance(assertions, list):
+            raise ValueError("Assertions must be a JSON list")
+        # Compiling reports a bad definition now rather than on every response
+        compile_assertions(assertions)
+        return assertions
+
+    def cancel_request(self):
+        """Abandon the outstanding request and unlock the form"""
+        ticket = self.active_request
+        if ticket is None:
+            return
+        ticket.cancel()
+        self.active_request = None
+        self.set_request_in_flight(False)
+        self.status_label.configure(text="Status: Cancelled", text_color="orange")
+        self.response_time_label.configure(text="Response Time: -")
+        self.request_log.event(f"Cancelled {ticket.spec.method} {ticket.spec.url}")
+
+    def set_request_in_flight(self, in_flight):
+        """Reflect whether a request is outstanding in the send controls"""
+        self.send_button.configure(
+            state="disabled" if in_flight else "normal",
+            text="Sending..." if in_flight else "Send"
+        )
+        self.cancel_button.configure(state="normal" if in_flight else "disabled")
+        if in_flight:
+            self.status_label.configure(text="Status: Sending...", text_color="gray")
+            self.response_time_label.configure(text="Response Time: -")
+            self.timing_waterfall.show(None)
+
+    def on_request_done(self, ticket, result, diff=None, diff_error=None):
+        """Show a finished request; runs on the UI thread"""
+        # Results of cancelled or superseded requests are dropped
+        if ticket is not self.active_request or result.cancelled:
+            return
+        self.active_request = None
+        self.set_request_in_flight(False)
+        self.show_baseline_diff(diff, diff_error)
+
+        spec = result.spec
+        self.last_timings = result.timings
+        self.last_result = result
+        self.timing_waterfall.show(result.timings)
+        if result.error:
+            self.show_request_error(spec.method, spec.url, f"Error: {result.error}")
+        else:
             # Update status and response time
+            failed = len(result.assertion_failures)
             self.status_label.configure(
-                text=f"Status: {response.status_code}",
-                text_color="green" if 200 <= response.status_code < 300 else "red"
+                text=f"Status: {result.status_code}" + (
+                    f", {failed}/{result.assertions_checked} assertions failed" if failed else ""
+                ),
+                text_color="green" if result.ok else "red"
             )
+            retried = f" ({result.attempts} attempts)" if result.attempts > 1 else ""
             self.response_time_label.configure(
-                text=f"Response Time: {response_time:.2f}ms"
+                text=f"Response Time: {result.elapsed_ms:.2f}ms{retried}"
             )
 
             # Display response headers
             self.resp_headers_text.delete("1.0", "end")
-            self.resp_headers_text.insert("1.0", json.dumps(dict(response.headers), indent=2))
+            self.resp_headers_text.insert("1.0", json.dumps(result.headers, indent=2))
 
             # Display response body
-            self.resp_body_text.delete("1.0", "end")
-            try:
-                formatted_response = json.dumps(response.json(), indent=2)
-            except:
-                formatted_response = response.text
-            
-            self.resp_body_text.insert("1.0", formatted_response)
+            self.resp_body_text.set_text(result.formatted_body)
             
             # Log request and response
-            self.log_request(method, url, headers, body, response)
+            self.log_request(spec.method, spec.url, spec.headers, spec.body, result)
+            for _, message in result.assertion_failures:
+                self.request_log.event(f"{spec.method} {spec.url}: assertion failed: {message}")
+            self.count_assertions(result)
+            if diff is not None and not diff.identical:
+                self.request_log.event(f"{spec.method} {spec.url}: {self.describe_baseline_diff(diff)}")
             
             # Update history and stats
             timestamp = datetime.now().strftime('%H:%M:%S')
-            self.add_to_history(method, url, response.status_code, timestamp)
-            
-            # Update feature statistics if transaction type is present
-            if body and isinstance(body, dict) and "transactionType" in body:
-                feat = body["transactionType"]
-                if feat in self.stats["features"]:
-                    self.stats["features"][feat]["total"] += 1
-                    if 200 <= response.status_code < 300:
-                        self.stats["features"][feat]["passed"] += 1
-            
-            self.update_statistics()
-            
-        except Exception as e:
-            error_msg = f"Error: {str(e)}"
-            self.resp_body_text.delete("1.0", "end")
-            self.resp_body_text.insert("1.0", error_msg)
-            self.log_text.insert("1.0", f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {error_msg}\n")
-            self.add_to_history(method, url, 0, datetime.now().strftime('%H:%M:%S'), error=True)
-            self.status_label.configure(text="Status: Error", text_color="red")
-            self.response_time_label.configure(text="Response Time: -")
+            self.add_to_history(spec.method, spec.url, result.status_code, timestamp)
+
+    def make_baseline(self, test_case):
+        """Get the JsonBaseline of a saved test case, or None when it has none"""
+        if not test_case.baseline_hash:
+            return None
+        digest, inline = test_case.baseline_hash, test_case.baseline_blob
+        return JsonBaseline(
+            lambda: self.blob_store.get(digest, inline),
+            test_case.config.get("baseline_ignore", self.baseline_config["ignore"]),
+            self.baseline_config["max_differences"]
+        )
+
+    @staticmethod
+    def diff_with_baseline(baseline, result):
+        """Compare a response with a baseline: (JsonDiff, error message), meant for worker threads"""
+        if baseline is None:
+            return None, None
+        try:
+            document = result.json_body if result.json_body is not None else json.loads(result.body_text)
+            return baseline.compare(document), None
+        except (OSError, ValueError, RuntimeError) as e:
+            return None, f"Cannot compare with the baseline: {e}"
+
+    @staticmethod
+    def describe_baseline_diff(diff, limit=10):
+        """One line for the log: the counts and the first differences"""
+        shown = "; ".join(difference.describe() for difference in diff.differences[:limit])
+        return f"differs from baseline ({diff.summary()}): {shown}"
+
+    def show_baseline_diff(self, diff, error=None):
+        self.baseline_diff_text.delete("1.0", "end")
+        if error:
+            self.baseline_label.configure(text="Baseline: error", text_color="orange")
+            self.baseline_diff_text.insert("1.0", error)
+        elif diff is None:
+            self.baseline_label.configure(
+                text="Baseline: none" if self.active_baseline is None else "Baseline: not compared",
+                text_color="gray"
+            )
+        else:
+            self.baseline_label.configure(
+                text=f"Baseline: {diff.summary()}",
+                text_color="green" if diff.identical else "red"
+            )
+            self.baseline_diff_text.insert("1.0", diff.describe() or "No differences")
+
+    def get_baseline_ignore(self):
+        return [path.strip() for path in self.baseline_ignore_entry.get().split(",") if path.strip()]
+
+    def set_baseline(self, test_case):
+        """Make the stored response of a test case the baseline its new responses are compared with"""
+        self.cursor.execute(
+            'UPDATE test_cases SET baseline_hash = response_hash, baseline_blob = response_blob WHERE id = ?',
+            (test_case.id,)
+        )
+        self.conn.commit()
+        data_events.publish(data_events.API_TEST)
+        self.refresh_manage_list()
+        self.request_log.event(f"{test_case.name}: stored response set as the baseline")
+        if self.loaded_test_case is not None and self.loaded_test_case.id == test_case.id:
+            self.loaded_test_case = self.fetch_test_cases(test_case.id)[0]
+            self.active_baseline = self.make_baseline(self.loaded_test_case)
+            self.show_baseline_diff(None)
+
+    def clear_baseline(self):
+        """Stop comparing the loaded test case with a baseline"""
+        test_case = self.loaded_test_case
+        if test_case is None:
+            return
+        self.cursor.execute(
+            'UPDATE test_cases SET baseline_hash = NULL, baseline_blob = NULL WHERE id = ?', (test_case.id,)
+        )
+        self.conn.commit()
+        data_events.publish(data_events.API_TEST)
+        self.active_baseline = None
+        self.show_baseline_diff(None)
+
+    def compare_with_baseline(self):
+        """Apply the ignored paths and compare the last response, or the loaded one, with the baseline"""
+        test_case, baseline = self.loaded_test_case, self.active_baseline
+        if baseline is None:
+            self.show_baseline_diff(None, "No baseline: load a test case that has one, "
+                                          "or set one with Baseline in the Manage tab")
+            return
+        try:
+            baseline.set_ignore(self.get_baseline_ignore())
+        except ValueError as e:
+            self.show_baseline_diff(None, str(e))
+            return
+        # Kept with the test case, so Run All skips the same paths
+        test_case.config["baseline_ignore"] = baseline.rules.paths
+        self.cursor.execute('UPDATE test_cases SET config = ? WHERE id = ?', (json.dumps(test_case.config), test_case.id))
+        self.conn.commit()
+        data_events.publish(data_events.API_TEST)
+
+        result = self.last_result
+
+        def compare():
+            if result is not None:
+                outcome = self.diff_with_baseline(baseline, result)
+            else:
+                # The response saved with the test case, read from the blob store here rather than the UI
+                try:
+                    outcome = baseline.compare(json.loads(self.get_response_body(test_case))), None
+                except (OSError, ValueError, RuntimeError) as e:
+                    outcome = None, f"Cannot compare with the baseline: {e}"
+            self.ui_queue.post(self.show_baseline_diff, *outcome)
+
+        threading.Thread(target=compare, name="baseline-compare", daemon=True).start()
+
+    def show_request_error(self, method, url, error_msg):
+        self.resp_body_text.set_text(error_msg)
+        self.request_log.event(f"{method} {url}: {error_msg}")
+        self.add_to_history(method, url, 0, datetime.now().strftime('%H:%M:%S'), error=True)
+        self.status_label.configure(text="Status: Error", text_color="red")
+        self.response_time_label.configure(text="Response Time: -")
 
     def add_to_history(self, method, url, status_code, timestamp, error=False):
         """Update statistics and logs without using request_list"""
@@ -592,45 +1743,103 @@ Body: {json.dumps(response.json(), indent=2) if response.headers.get('content-ty
         }
         self.add_to_data_list(test_case)
         
-        # Update statistics display
+
+    def count_test_case(self, test_case, delta=1):
+        """Add a saved test case to the feature counts, or remove it with delta=-1"""
+        feature = self.stats["features"].setdefault(test_case.api_name, {"total": 0, "passed": 0})
+        feature["total"] += delta
+        if test_case.status == "Successful":
+            feature["passed"] += delta
+        if feature["total"] <= 0:
+            del self.stats["features"][test_case.api_name]
+        self.update_statistics()
+
+    def count_assertions(self, result):
+        """Add the assertion outcome of a result to the statistics"""
+        if not result.assertions_checked:
+            return
+        stats = self.stats["assertions"]
+        stats["checks"] += result.assertions_checked
+        if result.assertion_failures:
+            stats["failed"] += 1
+            stats["failures"].update(description for description, _ in result.assertion_failures)
+        else:
+            stats["passed"] += 1
         self.update_statistics()
 
     def update_statistics(self):
-        # Reset statistics
-        self.stats = {
-            "success": 0,
-            "failed": 0,
-            "features": {}
-        }
+        """Redraw the charts at most once per redraw interval, however many results arrive"""
+        if self.stats_redraw_pending:
+            return
+        self.stats_redraw_pending = True
+        self.after(self.config.API_TEST_CONFIG["statistics"]["redraw_interval_ms"], self.redraw_statistics)
 
-        # Collect data from test management
-        for test_case in self.test_cases:
-            api_name = test_case["api_name"]
-            if api_name not in self.stats["features"]:
-                self.stats["features"][api_name] = {"total": 0, "passed": 0}
-            self.stats["features"][api_name]["total"] += 1
-            if test_case["status"] == "Successful":
-                self.stats["features"][api_name]["passed"] += 1
+    def redraw_statistics(self):
+        self.stats_redraw_pending = False
+        self.redraw_feature_chart()
+        self.render_assertion_stats()
 
-        # Update feature coverage chart
-        self.feature_ax.clear()
+    def render_assertion_stats(self, limit=20):
+        stats = self.stats["assertions"]
+        checked = stats["passed"] + stats["failed"]
+        lines = [
+            f"Responses checked: {checked}",
+            f"Passed: {stats['passed']}",
+            f"Failed: {stats['failed']}" + (f" ({stats['failed'] / checked * 100:.1f}%)" if checked else ""),
+            f"Assertions evaluated: {stats['checks']}",
+        ]
+        if stats["failures"]:
+            lines += ["", "Most failed assertions:"]
+            lines += [f"{count:>8}  {description}" for description, count in stats["failures"].most_common(limit)]
+        self.assertion_stats_text.delete("1.0", "end")
+        self.assertion_stats_text.insert("1.0", "\n".join(lines))
+
+    def redraw_feature_chart(self):
         features = list(self.stats["features"].keys())
         total = [self.stats["features"][f]["total"] for f in features]
         passed = [self.stats["features"][f]["passed"] for f in features]
-        
+
+        # Same features and scale: only the bar heights change, so blit them
+        if (features == self.feature_labels and self.feature_background is not None
+                and max(total, default=0) <= self.feature_ax.get_ylim()[1]):
+            for bar, height in zip(self.feature_bars, total + passed):
+                bar.set_height(height)
+            self.blit_feature_bars()
+            return
+
+        self.feature_ax.clear()
         x = range(len(features))
         width = 0.35
-        
-        self.feature_ax.bar([i - width/2 for i in x], total, width, label='Total', color='lightblue')
-        self.feature_ax.bar([i + width/2 for i in x], passed, width, label='Passed', color='lightgreen')
-        
+
+        total_bars = self.feature_ax.bar([i - width/2 for i in x], total, width, label='Total', color='lightblue')
+        passed_bars = self.feature_ax.bar([i + width/2 for i in x], passed, width, label='Passed', color='lightgreen')
+        self.feature_bars = list(total_bars) + list(passed_bars)
+        for bar in self.feature_bars:
+            bar.set_animated(True)
+        self.feature_labels = features
+
         self.feature_ax.set_ylabel('Test Cases')
         self.feature_ax.set_title('Feature Coverage')
         self.feature_ax.set_xticks(x)
         self.feature_ax.set_xticklabels(features)
-        self.feature_ax.legend()
-        
-        self.feature_canvas.draw()
+        # Headroom so growing counts keep blitting instead of rescaling every time
+        self.feature_ax.set_ylim(0, max(5, int(max(total, default=0) * 1.5)))
+        if features:
+            self.feature_ax.legend()
+
+        # draw_event saves the new background and blits the bars onto it
+        self.feature_canvas.draw_idle()
+
+    def on_feature_chart_drawn(self, event):
+        self.feature_background = self.feature_canvas.copy_from_bbox(self.feature_ax.bbox)
+        self.blit_feature_bars(restore=False)
+
+    def blit_feature_bars(self, restore=True):
+        if restore:
+            self.feature_canvas.restore_region(self.feature_background)
+        for bar in self.feature_bars:
+            self.feature_ax.draw_artist(bar)
+        self.feature_canvas.blit(self.feature_ax.bbox)
 
     def add_to_data_list(self, test_case):
         frame = ctk.CTkFrame(self.test_results_list)
@@ -641,7 +1850,7 @@ Body: {json.dumps(response.json(), indent=2) if response.headers.get('content-ty
         except ValueError:
             status_code = 0
         
-        status_color = "green" if 200 <= status_code < 300 else "red"
+        status_color = test_case.get("status_color") or ("green" if 200 <= status_code < 300 else "red")
         
         # Add detailed information
         ctk.CTkLabel(frame, text=test_case["name"]).pack(side="left", padx=5)
@@ -655,150 +1864,378 @@ Body: {json.dumps(response.json(), indent=2) if response.headers.get('content-ty
                     text_color=status_color).pack(side="left", padx=5)
         ctk.CTkLabel(frame, text=test_case.get("response_time", "N/A")).pack(side="left", padx=5)
 
-    def add_to_manage_list(self, test_case):
+    def refresh_manage_list(self):
+        """Show the current page of saved test cases, reusing the row widgets"""
+        # Served from memory when the page was prefetched
+        total_rows, test_cases = self.manage_cache.load(self.manage_page, self.manage_page_size, self.conn)
+        total_pages = max(1, (total_rows + self.manage_page_size - 1) // self.manage_page_size)
+        if self.manage_page > total_pages:
+            # Rows were deleted from under the last page
+            self.manage_page = total_pages
+            total_rows, test_cases = self.manage_cache.load(self.manage_page, self.manage_page_size, self.conn)
+
+        self.manage_page_cases = test_cases
+        while len(self.manage_rows) < len(test_cases):
+            self.manage_rows.append(self.create_manage_row())
+        for row, test_case in zip(self.manage_rows, test_cases):
+            row["test_case"] = test_case
+            values = (test_case.id, test_case.name, test_case.api_name, test_case.method,
+                      test_case.url, test_case.status, test_case.response_time)
+            for label, value in zip(row["labels"], values):
+                label.configure(text="" if value is None else str(value))
+            row["frame"].pack(fill="x", padx=5, pady=2)
+        for row in self.manage_rows[len(test_cases):]:
+            row["test_case"] = None
+            row["frame"].pack_forget()
+
+        self.manage_page_label.configure(text=f"Page {self.manage_page} of {total_pages} ({total_rows} test cases)")
+        self.manage_prev_button.configure(state="normal" if self.manage_page > 1 else "disabled")
+        self.manage_next_button.configure(state="normal" if self.manage_page < total_pages else "disabled")
+        self.update_load_targets()
+
+        # Have the neighbouring pages ready before the user asks for them
+        neighbours = [p for p in (self.manage_page + 1, self.manage_page - 1) if 1 <= p <= total_pages]
+        self.manage_cache.prefetch(neighbours, self.manage_page_size)
+
+    def show_manage_page(self, page):
+        self.manage_page = max(1, page)
+        self.refresh_manage_list()
+
+    def create_manage_row(self):
+        """Create one reusable row of the Manage tab; refresh_manage_list fills it in"""
         frame = ctk.CTkFrame(self.manage_results_list)
-        frame.pack(fill="x", padx=5, pady=2)
-        
-        # Add detailed information
-        ctk.CTkLabel(frame, text=test_case["id"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["name"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["api_name"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["method"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["url"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["headers"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["body"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["status"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["response_time"]).pack(side="left", padx=5)
-        
-        def delete_test_case():
-            self.test_cases.remove(test_case)
-            frame.destroy()
-            self.cursor.execute('DELETE FROM test_cases WHERE id = ?', (test_case["id"],))
-            self.conn.commit()
-            self.update_statistics()
-        
+        row = {"frame": frame, "test_case": None}
+        row["labels"] = [ctk.CTkLabel(frame, text="") for _ in range(7)]
+        for label in row["labels"]:
+            label.pack(side="left", padx=5)
+
         ctk.CTkButton(
             frame,
             text="Delete",
-            command=delete_test_case,
+            command=lambda: row["test_case"] and self.delete_test_case(row["test_case"]),
+            width=60
+        ).pack(side="right", padx=5)
+        ctk.CTkButton(
+            frame,
+            text="Baseline",
+            command=lambda: row["test_case"] and self.set_baseline(row["test_case"]),
+            width=70
+        ).pack(side="right", padx=5)
+        ctk.CTkButton(
+            frame,
+            text="Run",
+            command=lambda: row["test_case"] and self.load_and_run_test(row["test_case"]),
             width=60
         ).pack(side="right", padx=5)
+        ctk.CTkButton(
+            frame,
+            text="Load",
+            command=lambda: row["test_case"] and self.load_test_case(row["test_case"]),
+            width=60
+        ).pack(side="right", padx=5)
+        return row
 
-    def add_to_detailed_data_list(self, test_case):
-        frame = ctk.CTkFrame(self.detailed_data_list)
-        frame.pack(fill="x", padx=5, pady=2)
-        
-        ctk.CTkLabel(frame, text=test_case["name"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["headers"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["body"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["status"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["response_time"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["response_headers"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["response_body"]).pack(side="left", padx=5)
+    def delete_test_case(self, test_case):
+        self.cursor.execute('DELETE FROM test_cases WHERE id = ?', (test_case.id,))
+        self.conn.commit()
+        data_events.publish(data_events.API_TEST)
+        self.refresh_manage_list()
+        self.count_test_case(test_case, -1)
 
     def add_test_case(self):
         """Save current test configuration"""
         api_name = self.api_name_var.get()
-        test_case = {
-            "id": len(self.test_cases) + 1,
-            "name": f"Test Case {len(self.test_cases) + 1}",
-            "method": self.method_menu.get(),
-            "url": self.url_entry.get(),
-            "headers": self.headers_text.get("1.0", "end-1c"),
-            "body": self.body_text.get("1.0", "end-1c"),
-            "auth_type": self.auth_type.get(),
-            "auth_value": self.auth_input.get(),
-            "config": {
+        try:
+            assertions = self.get_assertions()
+        except ValueError as e:
+            messagebox.showerror("Save Test Case", str(e))
+            return
+        saved = self.cursor.execute('SELECT COUNT(*) FROM test_cases').fetchone()[0]
+        test_case = ApiTestCase(
+            name=f"Test Case {saved + 1}",
+            method=self.method_menu.get(),
+            url=self.url_entry.get(),
+            headers=self.headers_text.get("1.0", "end-1c"),
+            body=self.body_text.get("1.0", "end-1c"),
+            auth_type=self.auth_type.get(),
+            auth_value=self.auth_input.get(),
+            config={
                 "keep_alive": self.keep_alive_var.get(),
-                "timeout": float(self.timeout_entry.get()),
-                "verify_ssl": self.verify_ssl_var.get()
+                "verify_ssl": self.verify_ssl_var.get(),
+                "order_group": self.order_group_entry.get().strip(),
+                "dataset": self.dataset_entry.get().strip(),
+                "assertions": assertions,
+                "baseline_ignore": self.get_baseline_ignore(),
+                **self.get_execution_policy().to_config()
             },
-            "status": "Successful",
-            "response_time": self.response_time_label.cget("text"),
-            "response_headers": self.resp_headers_text.get("1.0", "end-1c"),
-            "response_body": self.resp_body_text.get("1.0", "end-1c"),
-            "api_name": api_name
-        }
+            status=self.last_result_status(),
+            response_status=self.last_result_code(),
+            response_time=self.response_time_label.cget("text"),
+            response_headers=self.resp_headers_text.get("1.0", "end-1c"),
+            response_body=self.resp_body_text.full_text(),
+            api_name=api_name,
+            timings=self.last_timings.to_dict() if self.last_timings else {}
+        )
         
-        self.test_cases.append(test_case)
-        self.add_to_manage_list(test_case)
+        # Newest first, so the saved test case is at the top of the first page
         self.save_test_case_to_db(test_case)
-        self.update_statistics()
+        self.show_manage_page(1)
+        self.count_test_case(test_case)
+        # The form now stands for the new test case, which has no baseline yet
+        self.loaded_test_case = test_case
+        self.active_baseline = None
+        self.show_baseline_diff(None)
 
-    def add_to_mgmt_list(self, test_case):
-        frame = ctk.CTkFrame(self.mgmt_list)
-        frame.pack(fill="x", padx=5, pady=2)
-        
-        # Add detailed information
-        ctk.CTkLabel(frame, text=test_case["name"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["api_name"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["method"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["url"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["headers"]).pack(side="left", padx=5)
-        ctk.CTkLabel(frame, text=test_case["body"]).pack(side="left", padx=5)
-        
-        def load_test_case():
-            self.url_entry.delete(0, "end")
-            self.url_entry.insert(0, test_case["url"])
-            self.method_menu.set(test_case["method"])
-            self.headers_text.delete("1.0", "end")
-            self.headers_text.insert("1.0", json.dumps(test_case["headers"], indent=2))
-            self.body_text.delete("1.0", "end")
-            self.body_text.insert("1.0", test_case["body"])
-            self.auth_type.set(test_case["auth_type"])
-            self.auth_input.delete(0, "end")
-            self.auth_input.insert(0, test_case["auth_value"])
-            self.status_label.configure(text=test_case["status"])
-            self.response_time_label.configure(text=test_case["response_time"])
-            self.resp_headers_text.delete("1.0", "end")
-            self.resp_headers_text.insert("1.0", test_case["response_headers"])
-            self.resp_body_text.delete("1.0", "end")
-            self.resp_body_text.insert("1.0", test_case["response_body"])
-        
-        ctk.CTkButton(
-            frame,
-            text="Load",
-            command=load_test_case,
-            width=60
-        ).pack(side="right", padx=5)
+    def last_result_status(self):
+        """Status to save a test case with: the outcome of the last response, assertions included"""
+        if self.last_result is None:
+            return "Not Run"
+        return "Successful" if self.last_result.ok else "Failed"
 
-    def clear_test_results(self):
-        for widget in self.test_results_list.winfo_children():
-            widget.destroy()
+    def last_result_code(self):
+        """HTTP status code of the response in the form, which the replay server answers with"""
+        if self.last_result is None:
+            # The response shown is the one saved with the loaded test case, if any
+            return self.loaded_test_case.response_status if self.loaded_test_case is not None else None
+        return self.last_result.status_code if self.last_result.error is None else None
 
-    def clear_test_cases(self):
-        self.test_cases.clear()
+    def clear_test_results(self):
         for widget in self.test_results_list.winfo_children():
             widget.destroy()
-        for widget in self.manage_results_list.winfo_children():
-            widget.destroy()
 
     def run_all_tests(self):
-        for test_case in self.test_cases:
-            self.load_and_run_test(test_case)
+        """Run every stored test case concurrently, straight from the records"""
+        if self.suite_runner is not None:
+            self.suite_runner.cancel()
+            return
+        self.run_test_cases(self.fetch_test_cases())
+
+    def run_test_cases(self, test_cases):
+        if self.suite_runner is not None or not test_cases:
+            return
+
+        runner_config = self.config.API_TEST_CONFIG["suite_runner"]
+        self.suite_runner = SuiteRunner(
+            self.request_engine,
+            concurrency=runner_config["concurrency"],
+            per_host_limit=runner_config["per_host_limit"],
+            deadline_seconds=self.policy_defaults["suite_deadline"]
+        )
+        # Data-driven cases make the number of requests unknown until their datasets are read
+        data_driven = any(test_case.config.get("dataset") for test_case in test_cases)
+        self.suite_progress = {"done": 0, "total": None if data_driven else len(test_cases)}
+        self.dataset_summaries = {}
+        self.suite_baselines = {}
+        self.run_all_btn.configure(text="Stop Run")
+        self.suite_status_label.configure(text="Running 0" if data_driven else f"Running 0/{len(test_cases)}")
+        # Tagged with the runner, so a stopped run cannot write into the next one
+        runner = self.suite_runner
+        runner.start(
+            self.suite_cases(test_cases),
+            lambda case, result: self.ui_queue.post(
+                self.on_suite_result, runner, case, result, *self.suite_baseline_diff(case, result)
+            ),
+            lambda summary: self.ui_queue.post(self.on_suite_done, runner, summary)
+        )
+
+    def suite_cases(self, test_cases):
+        """Yield the suite cases for test_cases, one per dataset row for data-driven ones.
+
+        Runs on the suite runner's thread, which pulls rows only as requests
+        complete, so a dataset file is read as the run progresses.
+        """
+        for test_case in test_cases:
+            try:
+                spec = self.route_spec(RequestSpec.from_test_case(test_case, self.policy_defaults))
+            except Exception as e:
+                print(f"Skipping test case {test_case.name}: {e}")
+                continue
+            order_group = test_case.config.get("order_group") or None
+            dataset = test_case.config.get("dataset")
+            if not dataset:
+                yield SuiteCase(test_case, spec, order_group)
+                continue
+
+            template = RequestTemplate(spec)
+            for iteration, row in enumerate(iter_dataset(dataset), 1):
+                if iteration == 1:
+                    check_columns(template, row, dataset)
+                yield SuiteCase(test_case, template.render(row), order_group, iteration, row)
+
+    def suite_baseline_diff(self, case, result):
+        """Compare a suite result with its test case's baseline; runs on a suite worker thread"""
+        test_case = case.record
+        # Dataset rows are meant to get different responses
+        if case.iteration is not None or not test_case.baseline_hash or result.error is not None or result.cancelled:
+            return None, None
+        baseline = self.suite_baselines.get(test_case.id)
+        if baseline is None:
+            try:
+                baseline = self.make_baseline(test_case)
+            except ValueError as e:
+                return None, f"Cannot compare with the baseline: {e}"
+            # Parsed once per run, whichever worker gets there first
+            baseline = self.suite_baselines.setdefault(test_case.id, baseline)
+        return self.diff_with_baseline(baseline, result)
+
+    def on_suite_result(self, runner, case, result, diff=None, diff_error=None):
+        """Stream one suite result into the results tab; runs on the UI thread"""
+        if runner is not self.suite_runner:
+            return
+        self.suite_progress["done"] += 1
+        total = self.suite_progress["total"]
+        self.suite_status_label.configure(
+            text=f"Running {self.suite_progress['done']}" + (f"/{total}" if total else "")
+        )
+        if result.ok:
+            self.stats["success"] += 1
+        elif not result.cancelled:
+            # A stopped request neither passed nor failed
+            self.stats["failed"] += 1
+        self.count_assertions(result)
+
+        test_case = case.record
+        if case.iteration is not None:
+            # Dataset iterations are summed up per test case and listed when the run is over
+            if test_case.id not in self.dataset_summaries:
+                self.dataset_summaries[test_case.id] = (test_case, DatasetSummary(test_case.name))
+            self.dataset_summaries[test_case.id][1].add(case.iteration, case.row, result)
+            return
+
+        if result.cancelled:
+            status = "Cancelled"
+        elif result.error:
+            status = "Error"
+        elif result.assertion_failures:
+            status = f"{result.status_code}, {len(result.assertion_failures)} assertions failed"
+        else:
+            status = result.status_code
+        status_color = "green" if result.ok else "red"
+        if diff is not None and not diff.identical:
+            status = f"{status}, {diff.count} differences from baseline"
+            status_color = "orange" if result.ok else "red"
+        self.add_to_data_list({
+            "name": test_case.name,
+            "api_name": test_case.api_name,
+            "method": test_case.method,
+            "url": test_case.url,
+            "status": status,
+            "status_color": status_color,
+            "response_time": f"{result.elapsed_ms:.2f}ms",
+            "headers": test_case.headers,
+            "body": test_case.body
+        })
+        if result.error:
+            self.request_log.event(f"{test_case.name}: Error: {result.error}")
+        for _, message in result.assertion_failures:
+            self.request_log.event(f"{test_case.name}: assertion failed: {message}")
+        if diff is not None and not diff.identical:
+            self.request_log.event(f"{test_case.name}: {self.describe_baseline_diff(diff)}")
+        if diff_error:
+            self.request_log.event(f"{test_case.name}: {diff_error}")
+
+    def on_suite_done(self, runner, summary):
+        if runner is not self.suite_runner:
+            return
+        self.suite_runner = None
+        self.run_all_btn.configure(text="Run All")
+        self.suite_status_label.configure(
+            text=f"Passed {summary.passed}, Failed {summary.failed}, "
+                 f"Cancelled {summary.cancelled} in {summary.elapsed_s:.1f}s"
+        )
+        for test_case, dataset_summary in self.dataset_summaries.values():
+            self.add_to_data_list({
+                "name": f"{test_case.name} ({dataset_summary.iterations} rows)",
+                "api_name": test_case.api_name,
+                "method": test_case.method,
+                "url": test_case.url,
+                "status": f"{dataset_summary.passed}/{dataset_summary.iterations} passed",
+                "status_color": "green" if dataset_summary.failed == 0 else "red",
+                "response_time": f"p50 {dataset_summary.histogram.percentile_ms(50):.2f}ms",
+                "headers": test_case.headers,
+                "body": test_case.body
+            })
+            self.request_log.event(f"{test_case.name}: {dataset_summary.describe()}")
+            for iteration, row, error in dataset_summary.failures:
+                self.request_log.event(f"{test_case.name} row {iteration}: {error} with {json.dumps(row, default=str)}")
+        if summary.error:
+            self.request_log.event(f"Run stopped reading test cases: {summary.error}")
+            messagebox.showerror("Run All", f"Not every test case could be run: {summary.error}")
 
     def load_and_run_test(self, test_case):
         """Load test case configuration and run it"""
+        self.load_test_case(test_case)
+        if test_case.config.get("dataset"):
+            self.run_test_cases([test_case])
+        else:
+            self.send_request()
+
+    def load_test_case(self, test_case):
+        """Put a saved test case into the request form"""
         # Load configuration
-        self.method_menu.set(test_case["method"])
+        self.method_menu.set(test_case.method)
         self.url_entry.delete(0, "end")
-        self.url_entry.insert(0, test_case["url"])
+        self.url_entry.insert(0, test_case.url)
         self.headers_text.delete("1.0", "end")
-        self.headers_text.insert("1.0", test_case["headers"])
+        self.headers_text.insert("1.0", test_case.headers)
         self.body_text.delete("1.0", "end")
-        self.body_text.insert("1.0", test_case["body"])
-        self.auth_type.set(test_case["auth_type"])
+        self.body_text.insert("1.0", test_case.body)
+        self.auth_type.set(test_case.auth_type)
         self.auth_input.delete(0, "end")
-        self.auth_input.insert(0, test_case["auth_value"])
+        self.auth_input.insert(0, test_case.auth_value)
         
         # Set request config
-        self.keep_alive_var.set(test_case["config"]["keep_alive"])
-        self.timeout_entry.delete(0, "end")
-        self.timeout_entry.insert(0, str(test_case["config"]["timeout"]))
-        self.verify_ssl_var.set(test_case["config"]["verify_ssl"])
-        
-        # Run the test
-        self.send_request()
+        self.keep_alive_var.set(test_case.config.get("keep_alive", True))
+        self.set_execution_policy(ExecutionPolicy.from_config(test_case.config, self.policy_defaults))
+        self.verify_ssl_var.set(test_case.config.get("verify_ssl", True))
+        self.order_group_entry.delete(0, "end")
+        self.order_group_entry.insert(0, test_case.config.get("order_group", ""))
+        self.dataset_entry.delete(0, "end")
+        self.dataset_entry.insert(0, test_case.config.get("dataset", ""))
+        self.assertions_text.delete("1.0", "end")
+        assertions = test_case.config.get("assertions")
+        if assertions:
+            self.assertions_text.insert("1.0", json.dumps(assertions, indent=2))
+        self.last_result = None
 
+        # The response saved with the test case
+        self.status_label.configure(text=f"Status: {test_case.status}", text_color=("gray10", "gray90"))
+        self.response_time_label.configure(text=test_case.response_time or "Response Time: -")
+        self.resp_headers_text.delete("1.0", "end")
+        self.resp_headers_text.insert("1.0", test_case.response_headers or "")
+        # The row only keeps a preview; the full body comes from the blob store
+        self.resp_body_text.set_text(self.get_response_body(test_case) or "")
+        self.last_timings = RequestTimings.from_dict(test_case.timings) if test_case.timings else None
+        self.timing_waterfall.show(self.last_timings)
 
+        self.loaded_test_case = test_case
+        self.baseline_ignore_entry.delete(0, "end")
+        self.baseline_ignore_entry.insert(
+            0, ", ".join(test_case.config.get("baseline_ignore", self.baseline_config["ignore"]))
+        )
+        try:
+            self.active_baseline = self.make_baseline(test_case)
+            self.show_baseline_diff(None)
+        except ValueError as e:
+            self.active_baseline = None
+            self.show_baseline_diff(None, str(e))
 
+    def destroy(self):
+        self.cancel_request()
+        if self.suite_runner is not None:
+            self.suite_runner.cancel()
+        if self.workflow_runner is not None:
+            self.workflow_runner.cancel()
+        if self.comparison is not None:
+            self.comparison.cancel()
+        if self.load_test is not None:
+            self.load_test.stop()
+        if self.mock_server is not None:
+            self.mock_server.stop()
+        if self.replay_server is not None:
+            self.replay_server.stop()
+        self.ui_queue.stop()
+        self.request_engine.shutdown()
+        self.request_log.close()
+        self.manage_cache.close()
+        super().destroy()
@@ -10,6 +10,10 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 from collections import Counter
 from config.app_config import AppConfig
+from models import JobApplication
+from services.page_prefetcher import PagePrefetcher
+from services.query_cache import get_query_cache
+from services import data_events
 
 class JobApplicationEntry(ctk.CTkFrame):
     def __init__(self, master, job_data: Dict[str, Any], on_update_status=None, on_delete=None):
@@ -165,6 +169,10 @@ class HomeView(ctk.CTkFrame):
         self.page_size = 10  # Number of items per page
         self.current_page = 1
         self.setup_database()
+        self.query_cache = get_query_cache(data_events.JOB_APPLICATIONS)
+        self.page_cache = PagePrefetcher(
+            AppConfig.DB_PATHS["job_applications"], self.fetch_page, topic=data_events.JOB_APPLICATIONS
+        )
         self.setup_ui()
         self.load_applications()
         self.pack(fill="both", expand=True)
@@ -430,38 +438,33 @@ class HomeView(ctk.CTkFrame):
 
     def update_metrics(self):
         try:
-            self.cursor.execute('SELECT COUNT(*) FROM job_applications')
-            total = self.cursor.fetchone()[0]
+            total = self.query_cache.scalar(self.conn, 'SELECT COUNT(*) FROM job_applications')
             self.metric_labels["Total Applications"].configure(text=str(total))
             
-            self.cursor.execute('''
+            active = self.query_cache.scalar(self.conn, '''
                 SELECT COUNT(*) FROM job_applications 
                 WHERE stage_status NOT IN ('Rejected', 'Completed', 'Withdrawn')
             ''')
-            active = self.cursor.fetchone()[0]
             self.metric_labels["Active Process"].configure(text=str(active))
             
-            self.cursor.execute('''
+            interviews = self.query_cache.scalar(self.conn, '''
                 SELECT COUNT(*) FROM job_applications 
                 WHERE stage_status = 'Scheduled' 
                 AND current_stage LIKE '%Interview%'
             ''')
-            interviews = self.cursor.fetchone()[0]
             self.metric_labels["Interviews Scheduled"].configure(text=str(interviews))
             
-            self.cursor.execute('''
+            offers = self.query_cache.scalar(self.conn, '''
                 SELECT COUNT(*) FROM job_applications 
                 WHERE current_stage = 'Offer' 
                 AND stage_status = 'Pending'
             ''')
-            offers = self.cursor.fetchone()[0]
             self.metric_labels["Offers Pending"].configure(text=str(offers))
             
-            self.cursor.execute('''
+            rejected = self.query_cache.scalar(self.conn, '''
                 SELECT COUNT(*) FROM job_applications 
                 WHERE stage_status = 'Rejected'
             ''')
-            rejected = self.cursor.fetchone()[0]
             self.metric_labels["Rejected"].configure(text=str(rejected))
             
         except sqlite3.Error as e:
@@ -563,9 +566,25 @@ class HomeView(ctk.CTkFrame):
         ctk.CTkLabel(frame, text=text, font=("Arial Bold", 12)).pack(anchor="w", padx=5, pady=5)
         return frame
 
-    def load_applications(self):
+    def fetch_page(self, conn, page, page_size):
+        """Fetch one page of applications: (total record count, applications)"""
+        total_records = self.query_cache.scalar(conn, 'SELECT COUNT(*) FROM job_applications')
+        
+        # Fetch page data with all fields including notes
+        applications = self.query_cache.fetchall(conn, '''
+            SELECT id, company, position, location, salary, apply_date, 
+                   job_link, current_stage, stage_status, notes
+            FROM job_applications 
+            ORDER BY apply_date DESC, id DESC
+            LIMIT ? OFFSET ?
+        ''', (page_size, (page - 1) * page_size), model=JobApplication)
+        return total_records, applications
+
+    def load_applications(self, refresh_metrics=True):
         try:
-            self.update_metrics()
+            # Paging doesn't change the data, so the metrics can stay as they are
+            if refresh_metrics:
+                self.update_metrics()
             
             # Clear existing entries
             for widget in self.entries_container.winfo_children():
@@ -574,20 +593,8 @@ class HomeView(ctk.CTkFrame):
             # Calculate pagination
             offset = (self.current_page - 1) * self.page_size
             
-            # Get total records count
-            self.cursor.execute('SELECT COUNT(*) FROM job_applications')
-            total_records = self.cursor.fetchone()[0]
-            
-            # Fetch page data with all fields including notes
-            self.cursor.execute('''
-                SELECT id, company, position, location, salary, apply_date, 
-                       job_link, current_stage, stage_status, notes
-                FROM job_applications 
-                ORDER BY apply_date DESC, id DESC
-                LIMIT ? OFFSET ?
-            ''', (self.page_size, offset))
-            
-            applications = self.cursor.fetchall()
+            # Served from memory when the page was prefetched
+            total_records, applications = self.page_cache.load(self.current_page, self.page_size, self.conn)
 
             if not applications:
                 no_data_label = ctk.CTkLabel(
@@ -601,27 +608,27 @@ class HomeView(ctk.CTkFrame):
             # Create entries with proper notes display
             for i, app in enumerate(applications, offset + 1):
                 # Ensure note is not None or empty
-                note_text = app[9] if app[9] and app[9].strip() else "No notes"
+                note_text = app.notes if app.notes and app.notes.strip() else "No notes"
                 
                 job_data = {
-                    "id": app[0],
+                    "id": app.id,
                     "number": f"#{i}",
-                    "company": app[1] if app[1] else "Unknown Company",
-                    "position": app[2] if app[2] else "Unknown Position",
-                    "location": app[3] if app[3] else "Not specified",
-                    "salary": app[4] if app[4] else "Not specified",
-                    "apply_date": app[5] if app[5] else datetime.now().strftime("%Y-%m-%d"),
-                    "job_link": app[6],
-                    "current_stage": app[7] if app[7] else "CV",
-                    "current_status": app[8] if app[8] else "Sent",
+                    "company": app.company if app.company else "Unknown Company",
+                    "position": app.position if app.position else "Unknown Position",
+                    "location": app.location if app.location else "Not specified",
+                    "salary": app.salary if app.salary else "Not specified",
+                    "apply_date": app.apply_date if app.apply_date else datetime.now().strftime("%Y-%m-%d"),
+                    "job_link": app.job_link,
+                    "current_stage": app.current_stage if app.current_stage else "CV",
+                    "current_status": app.stage_status if app.stage_status else "Sent",
                     "note": note_text
                 }
 
                 entry = JobApplicationEntry(
                     self.entries_container, 
                     job_data,
-                    on_update_status=lambda id=app[0]: self.update_application_status(id),
-                    on_delete=lambda id=app[0]: self.delete_application(id)
+                    on_update_status=lambda id=app.id: self.update_application_status(id),
+                    on_delete=lambda id=app.id: self.delete_application(id)
                 )
                 entry.pack(fill="x", pady=0, padx=0)
                 
@@ -648,6 +655,10 @@ class HomeView(ctk.CTkFrame):
             self.prev_btn.configure(state="normal" if self.current_page > 1 else "disabled")
             self.next_btn.configure(state="normal" if self.current_page < total_pages else "disabled")
 
+            # Have the neighbouring pages ready before the user asks for them
+            neighbours = [p for p in (self.current_page + 1, self.current_page - 1) if 1 <= p <= total_pages]
+            self.page_cache.prefetch(neighbours, self.page_size)
+
         except Exception as e:
             print(f"Error loading applications: {str(e)}")
             messagebox.showerror("Error", f"Failed to load applications: {str(e)}")
@@ -657,6 +668,7 @@ class HomeView(ctk.CTkFrame):
             try:
                 self.cursor.execute('DELETE FROM job_applications WHERE id = ?', (app_id,))
                 self.conn.commit()
+                data_events.publish(data_events.JOB_APPLICATIONS)
                 self.load_applications()
                 messagebox.showinfo("Success", "Application deleted successfully!")
                 if self.charts_visible:
@@ -675,17 +687,20 @@ class HomeView(ctk.CTkFrame):
         dialog.title("Update App Status")
         dialog.geometry("300x400")  # Increased height for note field
 
-        self.cursor.execute('SELECT current_stage, stage_status, notes FROM job_applications WHERE id = ?', (app_id,))
-        app = self.cursor.fetchone()
+        app = JobApplication.query_one(
+            self.conn,
+            'SELECT current_stage, stage_status, notes FROM job_applications WHERE id = ?',
+            (app_id,)
+        )
 
         stage_frame = self.create_labeled_frame(dialog, "Current Stage")
         
-        self.stage_var = ctk.StringVar(value=app[0])
+        self.stage_var = ctk.StringVar(value=app.current_stage)
         stage_menu = ctk.CTkOptionMenu(stage_frame, values=list(JobApplicationEntry.STAGES.keys()), variable=self.stage_var, command=self.update_status_options)
         stage_menu.pack(fill="x", padx=5, pady=5)
         
-        self.status_var = ctk.StringVar(value=app[1])
-        self.status_menu = ctk.CTkOptionMenu(stage_frame, values=list(JobApplicationEntry.STAGES[app[0]].keys()), variable=self.status_var)
+        self.status_var = ctk.StringVar(value=app.stage_status)
+        self.status_menu = ctk.CTkOptionMenu(stage_frame, values=list(JobApplicationEntry.STAGES[app.current_stage].keys()), variable=self.status_var)
         self.status_menu.pack(fill="x", padx=5, pady=5)
 
         # Make the note section bigger and more prominent
@@ -694,8 +709,8 @@ class HomeView(ctk.CTkFrame):
         self.note_entry.pack(fill="x", padx=5, pady=5)
         
         # Set existing note or placeholder
-        if app[2]:
-            self.note_entry.insert("1.0", app[2])
+        if app.notes:
+            self.note_entry.insert("1.0", app.notes)
         else:
             self.note_entry.insert("1.0", "Enter your notes here...")
 
@@ -726,6 +741,7 @@ class HomeView(ctk.CTkFrame):
                 app_id
             ))
             self.conn.commit()
+            data_events.publish(data_events.JOB_APPLICATIONS)
             
             self.load_applications()
             dialog.destroy()
@@ -780,6 +796,7 @@ class HomeView(ctk.CTkFrame):
             ''', data)
             
             self.conn.commit()
+            data_events.publish(data_events.JOB_APPLICATIONS)
             self.load_applications()
             dialog.destroy()
             messagebox.showinfo("Success", "Application saved successfully!")
@@ -851,11 +868,10 @@ class HomeView(ctk.CTkFrame):
 
     def update_pie_charts(self):
         try:
-            self.cursor.execute('''
+            applications = self.query_cache.fetchall(self.conn, '''
                 SELECT current_stage, stage_status, apply_date 
                 FROM job_applications
             ''')
-            applications = self.cursor.fetchall()
 
             if not applications:
                 return
@@ -938,6 +954,7 @@ class HomeView(ctk.CTkFrame):
             try:
                 self.cursor.execute('DELETE FROM job_applications')
                 self.conn.commit()
+                data_events.publish(data_events.JOB_APPLICATIONS)
                 self.load_applications()
                 messagebox.showinfo("Success", "All applications have been deleted!")
                 if self.charts_visible:
@@ -947,12 +964,12 @@ class HomeView(ctk.CTkFrame):
 
     def next_page(self):
         self.current_page += 1
-        self.load_applications()
+        self.load_applications(refresh_metrics=False)
 
     def prev_page(self):
         if self.current_page > 1:
             self.current_page -= 1
-            self.load_applications()
+            self.load_applications(refresh_metrics=False)
 
     def change_page_size(self, new_size):
         try:
@@ -1016,4 +1033,5 @@ class HomeView(ctk.CTkFrame):
 
     def destroy(self):
         ctk.AppearanceModeTracker.remove(self._appearance_mode_callback)
+        self.page_cache.close()
         super().destroy()
\ No newline at end of file
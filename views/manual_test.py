@@ -21,6 +21,13 @@ import matplotlib
 import numpy as np  # Add this with other imports at the top
 matplotlib.use('Agg')  # Required for saving plots to memory
 from config.app_config import AppConfig
+from services.data_version import install_version_tracking, get_data_version
+from services.report_cache import ReportCache
+from services.html_report import HtmlReportWriter
+from services.page_prefetcher import PagePrefetcher
+from services.query_cache import get_query_cache
+from services import data_events
+from models import ManualTestCase
 
 class ManualTestView(ctk.CTkFrame):
     def __init__(self, parent):
@@ -48,6 +55,8 @@ class ManualTestView(ctk.CTkFrame):
         # Core variables initialization
         self.initialize_variables()
         self.setup_database()
+        self.query_cache = get_query_cache(data_events.MANUAL_TEST)
+        self.page_cache = PagePrefetcher(self.db_path, self.fetch_page, topic=data_events.MANUAL_TEST)
         self.create_widgets()
         self.after(100, self.refresh_table_view)
 
@@ -137,6 +146,9 @@ class ManualTestView(ctk.CTkFrame):
                     )
                 ''')
                 conn.commit()
+
+                # Track a change counter so reports can tell when data changed
+                install_version_tracking(conn, 'test_cases')
                 
                 # Verify table exists
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='test_cases'")
@@ -337,6 +349,24 @@ class ManualTestView(ctk.CTkFrame):
             hover_color="#404040"
         ).pack(side="left", padx=5, pady=5)
 
+        ctk.CTkButton(
+            buttons_frame,
+            text="🌐 Export to HTML",
+            command=self.generate_html_report,
+            width=120,
+            height=32,
+            hover_color="#404040"
+        ).pack(side="left", padx=5, pady=5)
+
+        # Delta mode only includes test cases added or changed since the previous report;
+        # deleted test cases leave nothing to report
+        self.delta_report_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            buttons_frame,
+            text="Delta since last report (no deletions)",
+            variable=self.delta_report_var
+        ).pack(side="left", padx=5, pady=5)
+
         # Table frame with minimal padding
         table_frame = ctk.CTkFrame(main_frame)
         table_frame.pack(fill="both", expand=True, padx=2, pady=2)  # Reduced padding
@@ -520,52 +550,48 @@ class ManualTestView(ctk.CTkFrame):
             for widget in self.table_container.winfo_children():
                 widget.destroy()
             
-            # Open single database connection for all operations
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            # Served from memory when the page was prefetched
+            total_rows, rows = self.page_cache.load(self.current_page, self.rows_per_page)
+            total_pages = (total_rows + self.rows_per_page - 1) // self.rows_per_page
             
-            try:
-                # Get total count first
-                cursor.execute('SELECT COUNT(*) FROM test_cases')
-                total_rows = cursor.fetchone()[0]
-                total_pages = (total_rows + self.rows_per_page - 1) // self.rows_per_page
-                
-                # Update page label
-                self.page_label.configure(text=f"Page {self.current_page} of {total_pages}")
-                
-                # Enable/disable pagination buttons
-                self.prev_button.configure(state="normal" if self.current_page > 1 else "disabled")
-                self.next_button.configure(state="normal" if self.current_page < total_pages else "disabled")
-                
-                # Calculate offset for pagination
-                offset = (self.current_page - 1) * self.rows_per_page
-                
-                # Get paginated data
-                cursor.execute(
-                    'SELECT * FROM test_cases ORDER BY id DESC LIMIT ? OFFSET ?',
-                    (self.rows_per_page, offset)
-                )
-                rows = cursor.fetchall()
-                
-                for i, row in enumerate(rows, 1):
-                    data = self.prepare_row_data(row)
-                    data["No."] = str(offset + i)  # Update row numbers for current page
-                    self.create_table_row(self.table_container, data, i)
-
-                # Get final count and update total count label
-                cursor.execute('SELECT COUNT(*) FROM test_cases')
-                total_count = cursor.fetchone()[0]
-                if hasattr(self, 'total_count_label'):
-                    self.total_count_label.configure(text=str(total_count))
-                    
-            finally:
-                # Ensure connection is closed in finally block
-                conn.close()
+            # Update page label
+            self.page_label.configure(text=f"Page {self.current_page} of {total_pages}")
+            
+            # Enable/disable pagination buttons
+            self.prev_button.configure(state="normal" if self.current_page > 1 else "disabled")
+            self.next_button.configure(state="normal" if self.current_page < total_pages else "disabled")
+            
+            # Calculate offset for pagination
+            offset = (self.current_page - 1) * self.rows_per_page
+            
+            for i, row in enumerate(rows, 1):
+                data = self.prepare_row_data(row)
+                data["No."] = str(offset + i)  # Update row numbers for current page
+                self.create_table_row(self.table_container, data, i)
+
+            if hasattr(self, 'total_count_label'):
+                self.total_count_label.configure(text=str(total_rows))
+
+            # Have the neighbouring pages ready before the user asks for them
+            neighbours = [p for p in (self.current_page + 1, self.current_page - 1) if 1 <= p <= total_pages]
+            self.page_cache.prefetch(neighbours, self.rows_per_page)
                     
         except Exception as e:
             print(f"Error refreshing table view: {e}")
             traceback.print_exc()
 
+    def fetch_page(self, conn, page, page_size):
+        """Fetch one page of test cases: (total row count, rows)"""
+        total_rows = self.query_cache.scalar(conn, 'SELECT COUNT(*) FROM test_cases')
+        rows = self.query_cache.fetchall(
+            conn,
+            'SELECT * FROM test_cases ORDER BY id DESC LIMIT ? OFFSET ?',
+            (page_size, (page - 1) * page_size),
+            model=ManualTestCase,
+            db_path=self.db_path
+        )
+        return total_rows, rows
+
     def next_page(self):
         """Go to next page"""
         self.current_page += 1
@@ -577,23 +603,22 @@ class ManualTestView(ctk.CTkFrame):
             self.current_page -= 1
             self.refresh_table_view()
 
-    def prepare_row_data(self, row):
+    def prepare_row_data(self, test_case):
         """Prepare row data for display with matching column keys"""
-        evidence_count = len(json.loads(row[12])) if row[12] else 0
         return {
             "Actions": "",
             "No.": "",  # Will be set by refresh_table_view
-            "TestCaseID": row[5],
-            "Feature": row[4],
-            "Description": row[6],
-            "TestSteps": row[7],
-            "Expected": row[8],
-            "Actual": row[9],
-            "Status": row[10],
-            "Environment": row[2],
-            "Browser": row[3],
-            "Evidence": f"{evidence_count} files",
-            "Date": row[13]
+            "TestCaseID": test_case.test_case_id,
+            "Feature": test_case.feature,
+            "Description": test_case.description,
+            "TestSteps": test_case.test_steps,
+            "Expected": test_case.expected_result,
+            "Actual": test_case.actual_result,
+            "Status": test_case.status,
+            "Environment": test_case.environment,
+            "Browser": test_case.browser,
+            "Evidence": f"{len(test_case.evidence_files)} files",
+            "Date": test_case.created_date
         }
 
     def save_test_case(self):
@@ -679,6 +704,7 @@ class ManualTestView(ctk.CTkFrame):
                 
             conn.commit()
             conn.close()
+            data_events.publish(data_events.MANUAL_TEST)
             messagebox.showinfo("Success", "Test case saved successfully")
             self.clear_form()
             
@@ -721,6 +747,7 @@ class ManualTestView(ctk.CTkFrame):
             cursor.execute('DELETE FROM test_cases WHERE test_case_id=?', (test_case_id,))
             conn.commit()
             conn.close()
+            data_events.publish(data_events.MANUAL_TEST)
             self.refresh_table_view()
             messagebox.showinfo("Success", "Test case deleted successfully")
         except Exception as e:
@@ -730,10 +757,10 @@ class ManualTestView(ctk.CTkFrame):
     def generate_test_case_id(self):
         try:
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
             feature_prefix = self.vars['feature'].get()[:3].upper()
-            cursor.execute('SELECT COUNT(*) FROM test_cases WHERE feature = ?', (self.vars['feature'].get(),))
-            count = cursor.fetchone()[0] + 1
+            count = self.query_cache.scalar(
+                conn, 'SELECT COUNT(*) FROM test_cases WHERE feature = ?', (self.vars['feature'].get(),)
+            ) + 1
             new_id = f"{self.TEST_CASE_PREFIX}_{feature_prefix}_{count:03d}"  # Use the constant here
             self.tc_id_entry.delete(0, 'end')
             self.tc_id_entry.insert(0, new_id)
@@ -741,13 +768,39 @@ class ManualTestView(ctk.CTkFrame):
         except Exception as e:
             print(f"Error generating test case ID: {e}")
 
-    def generate_report(self):
+    def check_report_cache(self, kind, delta):
+        """Get report cache state: (cache, data version, watermark, cached path)"""
+        report_dir = self.config.REPORT_CONFIG["output_dir"]
+        os.makedirs(report_dir, exist_ok=True)
+        cache = ReportCache(report_dir)
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            data_version = get_data_version(conn, 'test_cases')
+        finally:
+            conn.close()
+        
+        watermark = cache.get_watermark(kind) if delta else 0
+        return cache, data_version, watermark, cache.get_cached(kind, data_version, delta)
+
+    def generate_report(self, delta=None):
         """Generate enhanced PDF report using config settings"""
+        if delta is None:
+            delta = self.delta_report_var.get()
         try:
+            cache, data_version, watermark, cached = self.check_report_cache("pdf", delta)
+            if cached:
+                messagebox.showinfo("Report Unchanged", f"No test cases changed since the last report: {cached}")
+                return cached
+            
             report_dir = self.config.REPORT_CONFIG["output_dir"]
-            os.makedirs(report_dir, exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(report_dir, f"test_cases_report_{timestamp}.pdf")
+            suffix = "_delta" if delta else ""
+            filename = os.path.join(report_dir, f"test_cases_report_{timestamp}{suffix}.pdf")
+            
+            # Delta reports only cover rows written after the previous report
+            where_clause = "WHERE row_version > ?" if delta else ""
+            params = (watermark,) if delta else ()
             
             # Create PDF document
             doc = SimpleDocTemplate(filename, pagesize=A4)
@@ -769,8 +822,11 @@ class ManualTestView(ctk.CTkFrame):
             )
             
             # Add title and date
-            elements.append(Paragraph("Test Cases Execution Report", title_style))
+            title = "Test Cases Delta Report" if delta else "Test Cases Execution Report"
+            elements.append(Paragraph(title, title_style))
             elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+            if delta:
+                elements.append(Paragraph(f"Changes since data version {watermark} (now {data_version}); deleted test cases are not listed", styles['Normal']))
             elements.append(Spacer(1, 20))
             
             # Fetch statistics
@@ -785,8 +841,9 @@ class ManualTestView(ctk.CTkFrame):
                     SUM(CASE WHEN status = 'Fail' THEN 1 ELSE 0 END) as failed,
                     SUM(CASE WHEN status = 'Not Executed' THEN 1 ELSE 0 END) as not_executed
                 FROM test_cases
-            ''')
+            ''' + where_clause, params)
             total, passed, failed, not_executed = cursor.fetchone()
+            passed, failed, not_executed = passed or 0, failed or 0, not_executed or 0
             
             # Create executive summary
             elements.append(Paragraph("Executive Summary", heading_style))
@@ -816,15 +873,16 @@ class ManualTestView(ctk.CTkFrame):
             elements.append(Paragraph("Detailed Test Cases", heading_style))
             
             # Fetch detailed test cases data
-            cursor.execute('''
+            data = ManualTestCase.query(conn, '''
                 SELECT 
                     test_case_id, feature, description, test_steps,
                     expected_result, actual_result, status, environment,
                     browser, created_date, notes, evidence_paths
                 FROM test_cases
+                ''' + where_clause + '''
                 ORDER BY feature, test_case_id
-            ''')
-            data = cursor.fetchall()
+            ''', params)
+            conn.close()
             
             if data:
                 # Create vertical layout for each test case
@@ -835,32 +893,101 @@ class ManualTestView(ctk.CTkFrame):
             
             # Build PDF
             doc.build(elements)
+            cache.record("pdf", data_version, filename, delta=delta, watermark=watermark)
             messagebox.showinfo("Success", f"Report generated successfully: {filename}")
+            return filename
             
         except Exception as e:
             print(f"Error generating report: {e}")
             traceback.print_exc()
 
+    def generate_html_report(self, delta=None):
+        """Generate a self-contained HTML report with client-side pagination"""
+        if delta is None:
+            delta = self.delta_report_var.get()
+        try:
+            cache, data_version, watermark, cached = self.check_report_cache("html", delta)
+            if cached:
+                messagebox.showinfo("Report Unchanged", f"No test cases changed since the last report: {cached}")
+                return cached
+            
+            report_dir = self.config.REPORT_CONFIG["output_dir"]
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            suffix = "_delta" if delta else ""
+            filename = os.path.join(report_dir, f"test_cases_report_{timestamp}{suffix}.html")
+            
+            # Delta reports only cover rows written after the previous report
+            where_clause = "WHERE row_version > ?" if delta else ""
+            params = (watermark,) if delta else ()
+            
+            columns = [
+                ("test_case_id", "Test Case ID"), ("feature", "Feature"),
+                ("description", "Description"), ("test_steps", "Test Steps"),
+                ("expected_result", "Expected Result"), ("actual_result", "Actual Result"),
+                ("status", "Status"), ("environment", "Environment"),
+                ("browser", "Browser"), ("created_date", "Date"),
+                ("notes", "Notes"), ("evidence", "Evidence")
+            ]
+            subtitle = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            if delta:
+                subtitle += f" | Changes since data version {watermark} (now {data_version}); deleted test cases are not listed"
+            
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cursor = conn.cursor()
+                cursor.row_factory = ManualTestCase.row_factory()
+                cursor.execute('''
+                    SELECT 
+                        test_case_id, feature, description, test_steps,
+                        expected_result, actual_result, status, environment,
+                        browser, created_date, notes, evidence_paths
+                    FROM test_cases
+                    ''' + where_clause + '''
+                    ORDER BY feature, test_case_id
+                ''', params)
+                
+                # Stream rows straight from the cursor into the report file
+                with HtmlReportWriter(
+                    filename,
+                    "Test Cases Delta Report" if delta else "Test Cases Execution Report",
+                    columns,
+                    subtitle=subtitle,
+                    status_colors=self.STATUS_COLORS
+                ) as writer:
+                    for test_case in cursor:
+                        record = {key: getattr(test_case, key) for key, _ in columns[:-1]}
+                        writer.write_row(record, test_case.evidence_files)
+            finally:
+                conn.close()
+            
+            cache.record("html", data_version, filename, delta=delta, watermark=watermark)
+            messagebox.showinfo("Success", f"HTML report generated successfully: {filename}")
+            return filename
+            
+        except Exception as e:
+            print(f"Error generating HTML report: {e}")
+            traceback.print_exc()
+            messagebox.showerror("Error", "Failed to generate HTML report")
+
     def create_test_case_detail(self, test_case):
         """Create a vertical layout table for a single test case with evidence"""
-        test_case_id = test_case[0]
-        evidence_files = json.loads(test_case[11]) if test_case[11] else []
+        evidence_files = test_case.evidence_files
         
         elements = []
         
         # Main test case data
         fields = [
-            ("Test Case ID:", test_case[0]),
-            ("Feature:", test_case[1]),
-            ("Description:", test_case[2]),
-            ("Test Steps:", test_case[3]),
-            ("Expected Result:", test_case[4]),
-            ("Actual Result:", test_case[5]),
-            ("Status:", test_case[6]),
-            ("Environment:", test_case[7]),
-            ("Browser:", test_case[8]),
-            ("Date:", test_case[9]),
-            ("Notes:", test_case[10])
+            ("Test Case ID:", test_case.test_case_id),
+            ("Feature:", test_case.feature),
+            ("Description:", test_case.description),
+            ("Test Steps:", test_case.test_steps),
+            ("Expected Result:", test_case.expected_result),
+            ("Actual Result:", test_case.actual_result),
+            ("Status:", test_case.status),
+            ("Environment:", test_case.environment),
+            ("Browser:", test_case.browser),
+            ("Date:", test_case.created_date),
+            ("Notes:", test_case.notes)
         ]
         
         # Create table data
@@ -910,7 +1037,7 @@ class ManualTestView(ctk.CTkFrame):
                 'Pass': colors.HexColor('#E6FFE6'),
                 'Fail': colors.HexColor('#FFE6E6'),
                 'Not Executed': colors.HexColor('#F0F0F0')
-            }.get(test_case[6], colors.white))
+            }.get(test_case.status, colors.white))
         ]
         
         table.setStyle(TableStyle(table_style))
@@ -923,13 +1050,11 @@ class ManualTestView(ctk.CTkFrame):
         try:
             # Get status counts from database
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
+            stats = self.query_cache.fetchall(conn, '''
                 SELECT status, COUNT(*) as count 
                 FROM test_cases 
                 GROUP BY status
             ''')
-            stats = cursor.fetchall()
             conn.close()
 
             if not stats:
@@ -1001,34 +1126,35 @@ class ManualTestView(ctk.CTkFrame):
     def load_test_case_by_tc_id(self, test_case_id):
         try:
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM test_cases WHERE test_case_id = ?', (test_case_id,))
-            row = cursor.fetchone()
+            test_case = self.query_cache.fetchone(
+                conn, 'SELECT * FROM test_cases WHERE test_case_id = ?', (test_case_id,),
+                model=ManualTestCase, db_path=self.db_path
+            )
             
-            if row:
+            if test_case:
                 # Update all fields in detail view
-                self.vars['hostname'].set(row[1])
-                self.vars['env'].set(row[2])
-                self.vars['browser'].set(row[3])
-                self.vars['feature'].set(row[4])
+                self.vars['hostname'].set(test_case.hostname)
+                self.vars['env'].set(test_case.environment)
+                self.vars['browser'].set(test_case.browser)
+                self.vars['feature'].set(test_case.feature)
                 self.tc_id_entry.delete(0, 'end')
-                self.tc_id_entry.insert('0', row[5])
+                self.tc_id_entry.insert('0', test_case.test_case_id)
                 
                 # Clear and set text boxes
                 self.desc_text.delete('1.0', 'end')
-                self.desc_text.insert('1.0', row[6])
+                self.desc_text.insert('1.0', test_case.description)
                 self.steps_text.delete('1.0', 'end')
-                self.steps_text.insert('1.0', row[7])
+                self.steps_text.insert('1.0', test_case.test_steps)
                 self.expected_text.delete('1.0', 'end')
-                self.expected_text.insert('1.0', row[8])
+                self.expected_text.insert('1.0', test_case.expected_result)
                 self.actual_text.delete('1.0', 'end')
-                self.actual_text.insert('1.0', row[9])
-                self.vars['status'].set(row[10])
+                self.actual_text.insert('1.0', test_case.actual_result)
+                self.vars['status'].set(test_case.status)
                 self.notes_text.delete('1.0', 'end')
-                self.notes_text.insert('1.0', row[11])
+                self.notes_text.insert('1.0', test_case.notes)
                 
                 # Handle evidence paths
-                self.evidence_list = json.loads(row[12]) if row[12] else []
+                self.evidence_list = test_case.evidence_files
             
             conn.close()
         except Exception as e:
@@ -1513,11 +1639,14 @@ class ManualTestView(ctk.CTkFrame):
                             WHEN LOWER(status) IN ('fail', 'failed', 'f') THEN 'Fail'
                             ELSE 'Not Executed'
                         END
+                    WHERE status IS NULL OR status NOT IN ('Pass', 'Fail', 'Not Executed')
                 ''')
                 conn.commit()
+                if cursor.rowcount:
+                    data_events.publish(data_events.MANUAL_TEST)
 
                 # Then get the counts with the normalized statuses
-                cursor.execute('''
+                status_counts = self.query_cache.fetchall(conn, '''
                     SELECT 
                         status,
                         COUNT(*) as count
@@ -1530,7 +1659,6 @@ class ManualTestView(ctk.CTkFrame):
                             ELSE 3
                         END
                 ''')
-                status_counts = cursor.fetchall()
 
                 # Initialize all possible status counts to 0
                 status_dict = {'Pass': 0, 'Fail': 0, 'Not Executed': 0}
@@ -1552,7 +1680,7 @@ class ManualTestView(ctk.CTkFrame):
                 print(f"Final counts - Pass: {passed}, Fail: {failed}, Not Executed: {not_executed}, Total: {total}")
 
                 # Update feature query to use normalized status
-                cursor.execute('''
+                feature_stats = self.query_cache.fetchall(conn, '''
                     SELECT 
                         feature,
                         SUM(CASE WHEN status = 'Pass' THEN 1 ELSE 0 END) as passed,
@@ -1561,7 +1689,6 @@ class ManualTestView(ctk.CTkFrame):
                     FROM test_cases 
                     GROUP BY feature
                 ''')
-                feature_stats = cursor.fetchall()
 
                 # Debug print
                 print(f"Total: {total}, Passed: {passed}, Failed: {failed}, Not Executed: {not_executed}")
@@ -1812,16 +1939,25 @@ class ManualTestView(ctk.CTkFrame):
             traceback.print_exc()
             messagebox.showerror("Error", "Failed to show statistics dashboard")
 
-    def generate_excel_report(self):
+    def generate_excel_report(self, delta=None):
         """Generate Excel report with all test case details"""
+        if delta is None:
+            delta = self.delta_report_var.get()
         try:
-            # Create directory if it doesn't exist
-            report_dir = r"D:\ResultsTestCaseManagement"
-            os.makedirs(report_dir, exist_ok=True)
+            cache, data_version, watermark, cached = self.check_report_cache("excel", delta)
+            if cached:
+                messagebox.showinfo("Report Unchanged", f"No test cases changed since the last report: {cached}")
+                return cached
             
             # Generate filename with timestamp
+            report_dir = self.config.REPORT_CONFIG["output_dir"]
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = os.path.join(report_dir, f"test_cases_report_{timestamp}.xlsx")
+            suffix = "_delta" if delta else ""
+            filename = os.path.join(report_dir, f"test_cases_report_{timestamp}{suffix}.xlsx")
+            
+            # Delta reports only cover rows written after the previous report
+            where_clause = "WHERE row_version > ?" if delta else ""
+            params = (watermark,) if delta else ()
             
             # Get data from database
             conn = sqlite3.connect(self.db_path)
@@ -1832,8 +1968,9 @@ class ManualTestView(ctk.CTkFrame):
                     expected_result, actual_result, status, environment,
                     browser, created_date, notes
                 FROM test_cases
+                ''' + where_clause + '''
                 ORDER BY feature, test_case_id
-            ''')
+            ''', params)
             data = cursor.fetchall()
             conn.close()
             
@@ -1878,7 +2015,9 @@ class ManualTestView(ctk.CTkFrame):
                     ) + 1
                     worksheet.set_column(idx, idx, min(max_len, 50))
                     
+            cache.record("excel", data_version, filename, delta=delta, watermark=watermark)
             messagebox.showinfo("Success", f"Excel report generated successfully: {filename}")
+            return filename
                 
         except Exception as e:
             print(f"Error generating Excel report: {e}")
@@ -1915,4 +2054,8 @@ class ManualTestView(ctk.CTkFrame):
 
     def calculate_percentage(self, value, total):
         """Calculate percentage with safety check for zero division"""
-        return (value/total * 100) if total > 0 else 0
\ No newline at end of file
+        return (value/total * 100) if total > 0 else 0
+
+    def destroy(self):
+        self.page_cache.close()
+        super().destroy()
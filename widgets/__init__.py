@@ -1,5 +1,9 @@
+from .chunked_textbox import ChunkedTextbox
 from .custom_button import CustomButton
+from .timing_waterfall import TimingWaterfall
 
 __all__ = [
-    'CustomButton'
+    'ChunkedTextbox',
+    'CustomButton',
+    'TimingWaterfall'
 ]
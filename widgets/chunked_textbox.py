@@ -0,0 +1,54 @@
+import customtkinter as ctk
+from typing import Optional, Any
+
+class ChunkedTextbox(ctk.CTkTextbox):
+    """Textbox that shows long texts a chunk at a time.
+
+    set_text() inserts only the first chunk; further chunks are appended
+    whenever the view is scrolled close to the end, so very large texts show
+    up at once instead of blocking Tk while the whole text is laid out.
+    """
+
+    def __init__(self, master: Optional[Any] = None, chunk_chars: int = 64 * 1024, **kwargs) -> None:
+        super().__init__(master, **kwargs)
+        self.chunk_chars = chunk_chars
+        self._full_text = ""
+        self._shown = 0
+        self._loading = False
+        self._textbox.configure(yscrollcommand=self._on_yscroll)
+
+    def set_text(self, text: Optional[str]) -> None:
+        """Replace the content, showing the first chunk right away"""
+        self._full_text = text or ""
+        self._shown = 0
+        self.delete("1.0", "end")
+        self._load_more()
+
+    def full_text(self) -> str:
+        """Get the whole text, including the chunks not shown yet"""
+        if self._shown < len(self._full_text):
+            return self.get("1.0", "end-1c") + self._full_text[self._shown:]
+        return self.get("1.0", "end-1c")
+
+    @property
+    def has_more(self) -> bool:
+        return self._shown < len(self._full_text)
+
+    def _load_more(self) -> None:
+        self._loading = False
+        if not self.has_more:
+            return
+        end = min(len(self._full_text), self._shown + self.chunk_chars)
+        if end < len(self._full_text):
+            # Stop at a line break so lines aren't split across chunks
+            newline = self._full_text.rfind("\n", self._shown, end)
+            if newline > self._shown:
+                end = newline + 1
+        self.insert("end", self._full_text[self._shown:end])
+        self._shown = end
+
+    def _on_yscroll(self, first: str, last: str) -> None:
+        self._y_scrollbar.set(first, last)
+        if self.has_more and not self._loading and float(last) > 0.9:
+            self._loading = True
+            self.after_idle(self._load_more)
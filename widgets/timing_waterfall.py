@@ -0,0 +1,61 @@
+import customtkinter as ctk
+from typing import Optional, Any
+
+class TimingWaterfall(ctk.CTkCanvas):
+    """Draws the phases of a request as a waterfall of horizontal bars."""
+
+    COLORS = {
+        "Redirects": "#9E9E9E",
+        "Prepare": "#B0BEC5",
+        "DNS": "#26A69A",
+        "TCP Connect": "#FFA726",
+        "TLS Handshake": "#AB47BC",
+        "Send": "#42A5F5",
+        "Waiting (TTFB)": "#66BB6A",
+        "Download": "#29B6F6",
+    }
+    ROW_HEIGHT = 20
+    LABEL_WIDTH = 110
+    VALUE_WIDTH = 80
+
+    def __init__(self, master: Optional[Any] = None, **kwargs) -> None:
+        kwargs.setdefault("height", self.ROW_HEIGHT * 4)
+        kwargs.setdefault("highlightthickness", 0)
+        kwargs.setdefault("bg", "white" if ctk.get_appearance_mode() == "Light" else "#2B2B2B")
+        super().__init__(master, **kwargs)
+        self.timings = None
+        self.bind("<Configure>", lambda event: self.redraw())
+
+    def show(self, timings) -> None:
+        """Draw a RequestTimings, or clear the chart for None"""
+        self.timings = timings
+        phases = timings.phases() if timings else []
+        self.configure(height=max(1, len(phases) + 1) * self.ROW_HEIGHT + 10)
+        self.redraw()
+
+    def redraw(self) -> None:
+        self.delete("all")
+        text_color = "black" if ctk.get_appearance_mode() == "Light" else "white"
+        if not self.timings:
+            self.create_text(10, self.ROW_HEIGHT / 2 + 5, anchor="w", fill=text_color, text="No timing data")
+            return
+
+        width = max(self.winfo_width(), self.LABEL_WIDTH + self.VALUE_WIDTH + 50)
+        bar_width = width - self.LABEL_WIDTH - self.VALUE_WIDTH - 10
+        total = max(self.timings.total_ms, 0.001)
+        phases = self.timings.phases()
+        for row, (label, start, duration) in enumerate(phases):
+            y = 5 + row * self.ROW_HEIGHT
+            x0 = self.LABEL_WIDTH + start / total * bar_width
+            # Keep very short phases visible
+            x1 = max(x0 + 2, self.LABEL_WIDTH + (start + duration) / total * bar_width)
+            self.create_text(5, y + self.ROW_HEIGHT / 2, anchor="w", fill=text_color, text=label)
+            self.create_rectangle(x0, y + 3, x1, y + self.ROW_HEIGHT - 3,
+                                  fill=self.COLORS.get(label, "#90A4AE"), outline="")
+            self.create_text(width - 5, y + self.ROW_HEIGHT / 2, anchor="e", fill=text_color,
+                             text=f"{duration:.2f}ms")
+
+        y = 5 + len(phases) * self.ROW_HEIGHT
+        connection = "reused connection" if self.timings.reused_connection else "new connection"
+        self.create_text(5, y + self.ROW_HEIGHT / 2, anchor="w", fill=text_color,
+                         text=f"Total {self.timings.total_ms:.2f}ms, {connection}")